@@ -0,0 +1,181 @@
+import asyncio
+import logging
+import time
+from collections import deque
+from typing import Any, Callable, Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+# Runs a list of requests and returns one result per request, in order
+BatchFn = Callable[[List[Any]], List[Any]]
+
+# Upper bounds of the batch-size histogram buckets
+BATCH_SIZE_BUCKETS = (1, 2, 4, 8, 16, 32, 64, 128)
+
+
+def _percentile(sorted_values: List[float], fraction: float) -> float:
+    if not sorted_values:
+        return 0.0
+    index = min(len(sorted_values) - 1, int(round(fraction * (len(sorted_values) - 1))))
+    return sorted_values[index]
+
+
+class _Failure:
+    """Marks the result slot of a request that raised when run on its own."""
+
+    def __init__(self, error: Exception):
+        self.error = error
+
+
+class RecommendationBatcher:
+    """
+    Micro-batching scheduler for single-query recommendation requests.
+
+    Requests are queued on the event loop; a worker task takes the first waiting
+    request, keeps collecting for up to max_wait_ms (or until max_batch_size requests
+    are gathered), and runs the whole group through run_batch in a worker thread so
+    model inference never blocks the event loop. Each caller gets its own results back.
+    If a batch fails, its requests are re-run one at a time, so a bad request only
+    fails its own caller.
+    """
+
+    def __init__(self, run_batch: BatchFn, max_wait_ms: float = 5.0, max_batch_size: int = 32,
+                 stats_window: int = 2048):
+        self.run_batch = run_batch
+        self.max_wait_ms = max_wait_ms
+        self.max_batch_size = max(1, max_batch_size)
+        self._queue: Optional[asyncio.Queue] = None
+        self._worker: Optional[asyncio.Task] = None
+
+        # Metrics
+        self.batches = 0
+        self.requests = 0
+        self.errors = 0
+        self.batch_size_counts = {bucket: 0 for bucket in BATCH_SIZE_BUCKETS}
+        self.batch_size_overflow = 0
+        self._recent_queue_waits = deque(maxlen=stats_window)
+        self._recent_batch_sizes = deque(maxlen=stats_window)
+        self.queue_wait_total = 0.0
+        self.queue_wait_max = 0.0
+
+    async def start(self):
+        if self._worker is None:
+            self._queue = asyncio.Queue()
+            self._worker = asyncio.create_task(self._run())
+            logger.info(f"Started recommendation batcher (window {self.max_wait_ms} ms, max batch {self.max_batch_size})")
+
+    async def stop(self):
+        if self._worker is not None:
+            self._worker.cancel()
+            try:
+                await self._worker
+            except asyncio.CancelledError:
+                pass
+            self._worker = None
+
+    async def submit(self, request: Any) -> Any:
+        """Queue one request and wait for its result."""
+        if self._worker is None:
+            raise RuntimeError("RecommendationBatcher.start() has not been called")
+        future = asyncio.get_running_loop().create_future()
+        await self._queue.put((request, future, time.perf_counter()))
+        return await future
+
+    async def _collect(self) -> list:
+        """Wait for one request, then gather more until the window closes or the batch is full."""
+        batch = [await self._queue.get()]
+        deadline = time.perf_counter() + self.max_wait_ms / 1000.0
+        while len(batch) < self.max_batch_size:
+            remaining = deadline - time.perf_counter()
+            if remaining <= 0:
+                # Still take anything already queued without waiting
+                if self._queue.empty():
+                    break
+                batch.append(self._queue.get_nowait())
+                continue
+            try:
+                batch.append(await asyncio.wait_for(self._queue.get(), timeout=remaining))
+            except asyncio.TimeoutError:
+                break
+        return batch
+
+    async def _run(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            batch = await self._collect()
+            # Drop requests whose callers have already gone away
+            batch = [item for item in batch if not item[1].done()]
+            if not batch:
+                continue
+
+            dispatched_at = time.perf_counter()
+            self._record_batch(len(batch), [dispatched_at - item[2] for item in batch])
+
+            requests = [item[0] for item in batch]
+            try:
+                results = await loop.run_in_executor(None, self.run_batch, requests)
+            except Exception as e:
+                self.errors += 1
+                if len(batch) == 1:
+                    logger.error(f"Error running recommendation request: {e}")
+                    results = [_Failure(e)]
+                else:
+                    logger.error(f"Error running recommendation batch of {len(batch)}, retrying one at a time: {e}")
+                    results = await loop.run_in_executor(None, self._run_each, requests)
+
+            for (_, future, _), result in zip(batch, results):
+                if future.done():
+                    continue
+                if isinstance(result, _Failure):
+                    future.set_exception(result.error)
+                else:
+                    future.set_result(result)
+
+    def _run_each(self, requests: List[Any]) -> List[Any]:
+        """Run requests individually; a failed request's slot holds a _Failure with its exception."""
+        results = []
+        for request in requests:
+            try:
+                results.append(self.run_batch([request])[0])
+            except Exception as e:
+                results.append(_Failure(e))
+        return results
+
+    def _record_batch(self, size: int, queue_waits: List[float]):
+        self.batches += 1
+        self.requests += size
+        for bucket in BATCH_SIZE_BUCKETS:
+            if size <= bucket:
+                self.batch_size_counts[bucket] += 1
+                break
+        else:
+            self.batch_size_overflow += 1
+        self._recent_batch_sizes.append(size)
+        for wait in queue_waits:
+            self._recent_queue_waits.append(wait)
+            self.queue_wait_total += wait
+            self.queue_wait_max = max(self.queue_wait_max, wait)
+
+    def stats(self) -> Dict[str, Any]:
+        """Batch-size and queue-wait metrics for tuning the window against tail latency."""
+        waits = sorted(self._recent_queue_waits)
+        sizes = list(self._recent_batch_sizes)
+        histogram = {f"le_{bucket}": count for bucket, count in self.batch_size_counts.items()}
+        histogram[f"gt_{BATCH_SIZE_BUCKETS[-1]}"] = self.batch_size_overflow
+        return {
+            'max_wait_ms': self.max_wait_ms,
+            'max_batch_size': self.max_batch_size,
+            'queue_depth': self._queue.qsize() if self._queue is not None else 0,
+            'batches': self.batches,
+            'requests': self.requests,
+            'errors': self.errors,
+            'mean_batch_size': round(self.requests / self.batches, 3) if self.batches else 0.0,
+            'recent_mean_batch_size': round(sum(sizes) / len(sizes), 3) if sizes else 0.0,
+            'batch_size_histogram': histogram,
+            'queue_wait_ms': {
+                'mean': round(1000 * self.queue_wait_total / self.requests, 3) if self.requests else 0.0,
+                'max': round(1000 * self.queue_wait_max, 3),
+                'p50': round(1000 * _percentile(waits, 0.50), 3),
+                'p99': round(1000 * _percentile(waits, 0.99), 3)
+            }
+        }
@@ -0,0 +1,228 @@
+#!/usr/bin/env python3
+"""
+Micro-benchmark the recommendation engine on synthetic speaker corpora.
+
+    python benchmark_engine.py --scales 1000 10000 100000 --output bench.json
+    python benchmark_engine.py --scales 1000 10000 --compare bench.json
+
+Each scale runs in a fresh process on a deterministic synthetic corpus with the
+offline 'hash' embedding backend, so nothing is downloaded and memory figures
+belong to that scale alone. It times the engine's build phases
+(_create_speaker_documents, _index_speakers, ...), recommend_speakers latency per
+fusion mode and keyword search, and records resident memory. Results are written
+as JSON (timings in ms, memory in MiB) with the git commit; --compare prints the
+ratio of every metric to an earlier results file.
+"""
+
+import argparse
+import json
+import logging
+import os
+import platform
+import random
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import get_context
+from typing import Any, Dict, List
+
+import numpy as np
+
+from speaker_recommendation_engine import SpeakerRecommendationEngine
+from synthetic_corpus import TOPICS, write_synthetic_data_file
+
+# Engine methods timed individually during construction, in call order
+BUILD_PHASES = ('_load_data', '_initialize_embedding_model', '_initialize_vector_database',
+                '_create_speaker_documents', '_index_speakers', '_precompute_speaker_payloads')
+QUERY_TEMPLATES = [
+    "I'm a {} contractor, find me contacts that have experience in that field",
+    "{}",
+    "experts in {} and {}",
+    "who is speaking about {} for special operations",
+]
+
+
+def _timed(name: str):
+    method = getattr(SpeakerRecommendationEngine, name)
+
+    def timed_method(self):
+        started = time.perf_counter()
+        method(self)
+        self.phase_ms[name] = (time.perf_counter() - started) * 1000
+    return timed_method
+
+
+class TimedEngine(SpeakerRecommendationEngine):
+    """SpeakerRecommendationEngine recording the duration of each build phase."""
+
+    def __init__(self, *args, **kwargs):
+        self.phase_ms: Dict[str, float] = {}
+        super().__init__(*args, **kwargs)
+
+
+for _phase in BUILD_PHASES:
+    setattr(TimedEngine, _phase, _timed(_phase))
+
+
+def benchmark_queries(count: int, seed: int) -> List[str]:
+    rng = random.Random(seed)
+    return [rng.choice(QUERY_TEMPLATES).format(*rng.sample(TOPICS, 2)) for _ in range(count)]
+
+
+def rss_mib() -> float:
+    """Current resident set size, or 0 where /proc is unavailable."""
+    try:
+        with open('/proc/self/statm') as f:
+            return int(f.read().split()[1]) * os.sysconf('SC_PAGE_SIZE') / 2 ** 20
+    except (OSError, ValueError):
+        return 0.0
+
+
+def peak_rss_mib() -> float:
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is KiB on Linux and bytes on macOS
+    return peak / 2 ** 20 if sys.platform == 'darwin' else peak / 2 ** 10
+
+
+def latency_summary(seconds: List[float]) -> Dict[str, float]:
+    milliseconds = np.array(seconds) * 1000
+    return {
+        'mean': round(float(milliseconds.mean()), 4),
+        'p50': round(float(np.percentile(milliseconds, 50)), 4),
+        'p99': round(float(np.percentile(milliseconds, 99)), 4),
+    }
+
+
+def time_calls(fn, arguments: list) -> List[float]:
+    timings = []
+    for argument in arguments:
+        started = time.perf_counter()
+        fn(argument)
+        timings.append(time.perf_counter() - started)
+    return timings
+
+
+def run_scale(count: int, seed: int, vector_backend: str, query_count: int, top_k: int) -> Dict[str, Any]:
+    """Build an engine over count synthetic speakers and measure it; runs in a worker process."""
+    logging.getLogger().setLevel(logging.WARNING)
+    with tempfile.TemporaryDirectory() as temp_dir:
+        data_file = os.path.join(temp_dir, 'speakers.json')
+        write_synthetic_data_file(data_file, count, seed)
+
+        rss_before = rss_mib()
+        started = time.perf_counter()
+        engine = TimedEngine(
+            data_file,
+            vector_backend=vector_backend,
+            embedding_backend='hash',
+            # Disable the query LRU so every timed call encodes its query
+            query_cache_size=0,
+            collection_name=f"benchmark_{count}_{os.getpid()}"
+        )
+        build_ms = (time.perf_counter() - started) * 1000
+        rss_after_build = rss_mib()
+
+        queries = benchmark_queries(query_count, seed)
+        for query in queries[:10]:
+            engine.recommend_speakers(query, top_k)
+        recommend = {
+            fusion: latency_summary(time_calls(lambda query: engine.recommend_speakers(query, top_k, fusion), queries))
+            for fusion in engine.FUSION_MODES
+        }
+        keywords = [topic.split()[0] for topic in TOPICS] + ['drone', 'special operations', 'smith']
+        keyword_search = latency_summary(time_calls(engine.search_speakers_by_keyword, keywords * 5))
+
+        phases = {name.lstrip('_'): round(ms, 3) for name, ms in engine.phase_ms.items()}
+        phases['other_indexes'] = round(build_ms - sum(engine.phase_ms.values()), 3)
+        return {
+            'speakers': engine.speaker_count,
+            'build_ms': round(build_ms, 3),
+            'build_phases_ms': phases,
+            'recommend_ms': recommend,
+            'keyword_search_ms': keyword_search,
+            'memory_mib': {
+                'rss_before_build': round(rss_before, 1),
+                'rss_after_build': round(rss_after_build, 1),
+                'engine': round(rss_after_build - rss_before, 1),
+                'peak_rss': round(peak_rss_mib(), 1),
+            },
+        }
+
+
+def git_commit() -> str:
+    try:
+        return subprocess.run(['git', 'rev-parse', 'HEAD'], capture_output=True, text=True, check=True,
+                              cwd=os.path.dirname(os.path.abspath(__file__))).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return 'unknown'
+
+
+def flatten(results: Dict[str, Any], prefix: str = '') -> Dict[str, float]:
+    flat = {}
+    for key, value in results.items():
+        if isinstance(value, dict):
+            flat.update(flatten(value, f"{prefix}{key}."))
+        elif isinstance(value, (int, float)):
+            flat[f"{prefix}{key}"] = value
+    return flat
+
+
+def compare(baseline: Dict[str, Any], current: Dict[str, Any]):
+    print(f"\nCompared with {baseline.get('commit', 'unknown')[:12]} (ratio = current / baseline)")
+    for scale, results in current['results'].items():
+        if scale not in baseline['results']:
+            continue
+        before = flatten(baseline['results'][scale])
+        print(f"\n{scale} speakers")
+        for metric, value in flatten(results).items():
+            if metric in before and before[metric]:
+                print(f"  {metric:<42} {before[metric]:>12.3f} {value:>12.3f} {value / before[metric]:>7.2f}x")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--scales', type=int, nargs='+', default=[1000, 10000, 100000])
+    parser.add_argument('--vector-backend', default='numpy', choices=['numpy', 'chroma'])
+    parser.add_argument('--queries', type=int, default=200, help='Timed recommend_speakers calls per fusion mode')
+    parser.add_argument('--top-k', type=int, default=10)
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--output', default=None, help='Write results as JSON to this file')
+    parser.add_argument('--compare', default=None, help='Earlier results file to compare against')
+    args = parser.parse_args()
+
+    report = {
+        'benchmark': 'engine',
+        'commit': git_commit(),
+        'created_at': time.time(),
+        'python': platform.python_version(),
+        'numpy': np.__version__,
+        'platform': platform.platform(),
+        'settings': {key: value for key, value in vars(args).items() if key not in ('output', 'compare')},
+        'results': {},
+    }
+    for count in args.scales:
+        # A fresh process per scale keeps memory measurements independent
+        with ProcessPoolExecutor(max_workers=1, mp_context=get_context('spawn')) as pool:
+            results = pool.submit(run_scale, count, args.seed, args.vector_backend, args.queries, args.top_k).result()
+        report['results'][str(count)] = results
+        rrf = results['recommend_ms']['rrf']
+        print(f"{count:>7} speakers: build {results['build_ms']:.0f} ms "
+              f"(index {results['build_phases_ms']['index_speakers']:.0f} ms), "
+              f"recommend p50 {rrf['p50']:.2f} / p99 {rrf['p99']:.2f} ms, "
+              f"keyword p50 {results['keyword_search_ms']['p50']:.2f} ms, "
+              f"engine memory {results['memory_mib']['engine']:.0f} MiB")
+
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(report, f, indent=2)
+        print(f"Wrote {args.output}")
+    if args.compare:
+        with open(args.compare) as f:
+            compare(json.load(f), report)
+
+
+if __name__ == "__main__":
+    main()
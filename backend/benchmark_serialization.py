@@ -0,0 +1,144 @@
+#!/usr/bin/env python3
+"""
+Compare the old and new ways of serializing /recommend responses.
+
+    python benchmark_serialization.py --top-k 5 20 100
+    python benchmark_serialization.py --embedding-backend torch
+
+"before" is the code path /recommend ran before the speaker fragments existed:
+the engine's former per-hit formatting (contact_info and session_details rebuilt
+for every hit), build_speaker_response / build_recommendation_response, and
+FastAPI's response_model handling, which validates the returned model against
+RecommendationResponse and renders it with json. "after" splices the engine's
+pre-serialized speaker fragments with the per-query fields. Both compute the
+explanation and highlights from the text index, as /recommend did before and
+after the change. Ranking is done once up front and is not timed; both paths
+format the same ranked speakers.
+
+The offline 'hash' embedder is the default so nothing is downloaded; the
+embedder only affects ranking, not the timed serialization.
+"""
+
+import argparse
+import json
+import os
+import time
+
+from fastapi.responses import JSONResponse
+from pydantic import TypeAdapter
+
+from embedding_backends import EMBEDDING_BACKENDS
+from response_payloads import orjson
+from server import RecommendationResponse, SpeakerResponse
+from text_index import HIGHLIGHT_FIELDS
+from speaker_recommendation_engine import SpeakerRecommendationEngine
+
+DEFAULT_DATA_FILE = os.path.join(os.path.dirname(__file__), "..", "data", "sof_week_speakers_complete.json")
+DEFAULT_QUERY = "I'm a drone contractor, find me contacts that have experience in that field"
+
+
+# What FastAPI validates and dumps a route's return value with when response_model=RecommendationResponse
+RESPONSE_ADAPTER = TypeAdapter(RecommendationResponse)
+
+
+def format_recommendation_before(engine: SpeakerRecommendationEngine, query_terms: set, speaker_idx: int,
+                                 similarity_score: float, bm25_score: float, fused_score: float) -> dict:
+    """The engine's former _format_recommendation, rebuilding the speaker-only fields per hit."""
+    speaker_data = engine.speakers_data['speakers'][speaker_idx]
+    matches = engine.text_index.field_matches(query_terms, speaker_idx)
+    explanation = engine._generate_relevance_explanation(list(matches), similarity_score)
+    # Limited to the serialized fields like the engine's, so both paths return the same JSON
+    highlights = {field: spans for field, spans in matches.items() if field in HIGHLIGHT_FIELDS}
+    return {
+        'speaker': speaker_data,
+        'relevance_score': round(similarity_score, 3),
+        'vector_score': round(similarity_score, 4),
+        'bm25_score': round(bm25_score, 4),
+        'fused_score': round(fused_score, 4),
+        'explanation': explanation,
+        'highlights': highlights,
+        'contact_info': engine._extract_contact_info(speaker_data),
+        'session_details': {
+            'title': speaker_data.get('session_title', ''),
+            'time': speaker_data.get('speaking_time', ''),
+            'location': speaker_data.get('location', ''),
+            'description': speaker_data.get('session_description', '')
+        }
+    }
+
+
+def build_speaker_response_before(rec: dict) -> SpeakerResponse:
+    """The server's former build_speaker_response."""
+    speaker_data = rec['speaker']
+    return SpeakerResponse(
+        name=speaker_data.get('name', ''),
+        title=speaker_data.get('title', ''),
+        company=speaker_data.get('company', ''),
+        relevance_score=rec['relevance_score'],
+        vector_score=rec['vector_score'],
+        bm25_score=rec['bm25_score'],
+        fused_score=rec['fused_score'],
+        explanation=rec['explanation'],
+        contact_info=rec['contact_info'],
+        session_details=rec['session_details'],
+        image_url=speaker_data.get('image_url'),
+        highlights=rec['highlights']
+    )
+
+
+def serialize_before(engine: SpeakerRecommendationEngine, query: str, ranked: list) -> bytes:
+    query_terms = engine.text_index.query_terms(query)
+    recommendations = [format_recommendation_before(engine, query_terms, *candidate) for candidate in ranked]
+    speaker_responses = [build_speaker_response_before(rec) for rec in recommendations]
+    response = RecommendationResponse(query=query, recommendations=speaker_responses,
+                                      total_found=len(speaker_responses), index_version=engine.index_version)
+    # FastAPI re-validates the returned model, dumps it in JSON mode and renders it with JSONResponse
+    validated = RESPONSE_ADAPTER.validate_python(response, from_attributes=True)
+    return JSONResponse(content=RESPONSE_ADAPTER.dump_python(validated, mode='json')).body
+
+
+def serialize_after(engine: SpeakerRecommendationEngine, query: str, ranked: list) -> bytes:
+    return engine.payloads.response_json(query, list(engine.format_recommendations(query, ranked)))
+
+
+def time_per_call(fn, repeats: int) -> float:
+    """Median seconds per call over repeats runs."""
+    timings = []
+    for _ in range(repeats):
+        started = time.perf_counter()
+        fn()
+        timings.append(time.perf_counter() - started)
+    timings.sort()
+    return timings[len(timings) // 2]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--data-file', default=DEFAULT_DATA_FILE)
+    parser.add_argument('--query', default=DEFAULT_QUERY)
+    parser.add_argument('--top-k', type=int, nargs='+', default=[5, 20, 100])
+    parser.add_argument('--repeats', type=int, default=200, help='Timed runs per top_k and path')
+    parser.add_argument('--embedding-backend', default='hash', choices=EMBEDDING_BACKENDS,
+                        help="Embedder used for ranking (default: the offline 'hash' embedder)")
+    parser.add_argument('--onnx-model-dir', help='Exported model directory for --embedding-backend onnx')
+    args = parser.parse_args()
+
+    engine = SpeakerRecommendationEngine(args.data_file, vector_backend='numpy',
+                                         embedding_backend=args.embedding_backend, onnx_model_dir=args.onnx_model_dir)
+    print(f"JSON encoder: {'orjson' if orjson is not None else 'json (install orjson for the fast path)'}")
+    print(f"{'top_k':>6} {'before (us)':>12} {'after (us)':>11} {'speedup':>8} {'bytes':>8}")
+    for top_k in args.top_k:
+        ranked = engine.rank_speakers_batch([args.query], [top_k])[0]
+        before = serialize_before(engine, args.query, ranked)
+        after = serialize_after(engine, args.query, ranked)
+        if json.loads(before) != json.loads(after):
+            raise SystemExit(f"Serialized responses differ for top_k={top_k}")
+
+        before_seconds = time_per_call(lambda: serialize_before(engine, args.query, ranked), args.repeats)
+        after_seconds = time_per_call(lambda: serialize_after(engine, args.query, ranked), args.repeats)
+        print(f"{len(ranked):>6} {before_seconds * 1e6:>12.1f} {after_seconds * 1e6:>11.1f} "
+              f"{before_seconds / after_seconds:>7.1f}x {len(after):>8}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,55 @@
+#!/usr/bin/env python3
+"""
+Build a versioned index bundle for the recommendation server.
+
+    python build_index.py --output-dir ../data/index_bundle
+
+Embeds the speaker data once and writes <output-dir>/<index_version>/ with the
+embeddings (.npy), document texts, metadata and embedding fingerprint, then
+points <output-dir>/CURRENT at it. Start the server with
+SPEAKER_INDEX_BUNDLE_DIR=<output-dir> and SPEAKER_VECTOR_BACKEND=numpy so every
+worker memory-maps the same embeddings instead of encoding its own copy.
+"""
+
+import argparse
+import os
+
+from index_bundle import write_index_bundle
+from speaker_recommendation_engine import SpeakerRecommendationEngine
+
+DEFAULT_DATA_FILE = os.path.join(os.path.dirname(__file__), "..", "data", "sof_week_speakers_complete.json")
+DEFAULT_OUTPUT_DIR = os.path.join(os.path.dirname(__file__), "..", "data", "index_bundle")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--data-file', default=DEFAULT_DATA_FILE)
+    parser.add_argument('--output-dir', default=DEFAULT_OUTPUT_DIR)
+    parser.add_argument('--embedding-backend', default='torch', choices=['torch', 'onnx'])
+    parser.add_argument('--onnx-model-dir', default=None, help='Required for the onnx backend')
+    parser.add_argument('--embedding-cache-dir', default=None,
+                        help='Reuse (and extend) the persistent document embedding cache')
+    args = parser.parse_args()
+
+    engine = SpeakerRecommendationEngine(
+        args.data_file,
+        embedding_cache_dir=args.embedding_cache_dir,
+        vector_backend='numpy',
+        embedding_backend=args.embedding_backend,
+        onnx_model_dir=args.onnx_model_dir,
+        # Never seed a new bundle from the one it replaces
+        index_bundle_dir=None
+    )
+    path = write_index_bundle(
+        args.output_dir,
+        engine.index_version,
+        engine.embedding_fingerprint,
+        engine.speaker_embeddings,
+        engine.speaker_documents,
+        engine.speaker_metadata
+    )
+    print(f"Index bundle {engine.index_version}: {path}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,195 @@
+import hashlib
+import logging
+import os
+import re
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+try:
+    from sentence_transformers import SentenceTransformer
+except ImportError:  # Only required by the torch backend
+    SentenceTransformer = None
+
+try:
+    import onnxruntime
+    from tokenizers import Tokenizer
+except ImportError:  # Only required by the onnx backend
+    onnxruntime = None
+    Tokenizer = None
+
+logger = logging.getLogger(__name__)
+
+EMBEDDING_BACKENDS = ('torch', 'onnx', 'hash')
+
+# File names written by export_onnx.py, preferred in this order
+ONNX_MODEL_FILES = ('model_quantized.onnx', 'model.onnx')
+
+
+def resolve_onnx_model_file(model_dir: str) -> str:
+    """Return the ONNX model to load from model_dir, preferring the int8-quantized export."""
+    for file_name in ONNX_MODEL_FILES:
+        path = os.path.join(model_dir, file_name)
+        if os.path.exists(path):
+            return path
+    raise FileNotFoundError(f"No ONNX model ({', '.join(ONNX_MODEL_FILES)}) found in {model_dir}")
+
+
+class OnnxEmbeddingModel:
+    """
+    Sentence embedding model running an exported transformer on ONNX Runtime (CPU).
+
+    Reproduces the SentenceTransformer pipeline for all-MiniLM-L6-v2: WordPiece
+    tokenization from tokenizer.json, mean pooling over the attention mask and L2
+    normalization, so embeddings are interchangeable with the PyTorch backend.
+    """
+
+    def __init__(self, model_dir: str, model_file: Optional[str] = None, max_seq_length: int = 256,
+                 batch_size: int = 32, intra_op_threads: Optional[int] = None):
+        if onnxruntime is None or Tokenizer is None:
+            raise ImportError("The onnx embedding backend requires the onnxruntime and tokenizers packages")
+
+        self.model_file = model_file or resolve_onnx_model_file(model_dir)
+        self.batch_size = batch_size
+
+        self.tokenizer = Tokenizer.from_file(os.path.join(model_dir, 'tokenizer.json'))
+        self.tokenizer.enable_truncation(max_length=max_seq_length)
+        self.tokenizer.enable_padding(pad_id=0, pad_token='[PAD]')
+
+        options = onnxruntime.SessionOptions()
+        options.graph_optimization_level = onnxruntime.GraphOptimizationLevel.ORT_ENABLE_ALL
+        if intra_op_threads:
+            options.intra_op_num_threads = intra_op_threads
+        self.session = onnxruntime.InferenceSession(
+            self.model_file, sess_options=options, providers=['CPUExecutionProvider']
+        )
+        self.input_names = {model_input.name for model_input in self.session.get_inputs()}
+        logger.info(f"Loaded ONNX embedding model from {self.model_file}")
+
+    def encode(self, sentences: List[str], **kwargs) -> np.ndarray:
+        """Embed sentences; returns a float32 array of unit-length rows."""
+        if isinstance(sentences, str):
+            sentences = [sentences]
+        batches = [self._encode_batch(sentences[start:start + self.batch_size])
+                   for start in range(0, len(sentences), self.batch_size)]
+        if not batches:
+            return np.zeros((0, 0), dtype=np.float32)
+        return np.concatenate(batches)
+
+    def _encode_batch(self, sentences: List[str]) -> np.ndarray:
+        encodings = self.tokenizer.encode_batch(sentences)
+        input_ids = np.array([encoding.ids for encoding in encodings], dtype=np.int64)
+        attention_mask = np.array([encoding.attention_mask for encoding in encodings], dtype=np.int64)
+
+        feeds = {'input_ids': input_ids, 'attention_mask': attention_mask}
+        if 'token_type_ids' in self.input_names:
+            feeds['token_type_ids'] = np.array([encoding.type_ids for encoding in encodings], dtype=np.int64)
+        token_embeddings = self.session.run(None, feeds)[0]
+
+        # Mean pooling over real (non-padding) tokens, then L2 normalization
+        mask = attention_mask[:, :, np.newaxis].astype(np.float32)
+        summed = (token_embeddings * mask).sum(axis=1)
+        counts = np.clip(mask.sum(axis=1), 1e-9, None)
+        embeddings = summed / counts
+        norms = np.clip(np.linalg.norm(embeddings, axis=1, keepdims=True), 1e-12, None)
+        return (embeddings / norms).astype(np.float32)
+
+
+class HashingEmbeddingModel:
+    """
+    Deterministic offline stand-in for a sentence embedding model.
+
+    Each word and word bigram is hashed (blake2b, so results match across processes)
+    to a signed position in a fixed-size vector; rows are L2-normalized. Texts sharing
+    words get similar vectors, which is enough to exercise indexing and search in
+    benchmarks and offline runs without downloading a model. Not for production use.
+    """
+
+    TOKEN_PATTERN = re.compile(r'\w+')
+
+    def __init__(self, dimension: int = 384):
+        self.dimension = dimension
+        self._features: Dict[str, Tuple[int, float]] = {}
+
+    def _feature(self, token: str) -> Tuple[int, float]:
+        feature = self._features.get(token)
+        if feature is None:
+            digest = int.from_bytes(hashlib.blake2b(token.encode('utf-8'), digest_size=8).digest(), 'little')
+            feature = (digest % self.dimension, 1.0 if digest >> 63 else -1.0)
+            self._features[token] = feature
+        return feature
+
+    def encode(self, sentences: List[str], **kwargs) -> np.ndarray:
+        """Embed sentences; returns a float32 array of unit-length rows."""
+        if isinstance(sentences, str):
+            sentences = [sentences]
+        embeddings = np.zeros((len(sentences), self.dimension), dtype=np.float32)
+        for row, sentence in enumerate(sentences):
+            words = self.TOKEN_PATTERN.findall(sentence.lower())
+            tokens = words + [f"{first} {second}" for first, second in zip(words, words[1:])]
+            if not tokens:
+                continue
+            positions, signs = zip(*(self._feature(token) for token in tokens))
+            np.add.at(embeddings[row], list(positions), signs)
+        norms = np.linalg.norm(embeddings, axis=1, keepdims=True)
+        norms[norms == 0] = 1.0
+        return embeddings / norms
+
+
+# (path, size, mtime) -> digest, so reloads do not rehash an unchanged model file
+_file_digests: Dict[Tuple[str, int, int], str] = {}
+
+
+def file_digest(path: str) -> str:
+    """Short sha256 of a file's contents, cached by path, size and mtime."""
+    stat = os.stat(path)
+    key = (os.path.abspath(path), stat.st_size, stat.st_mtime_ns)
+    if key not in _file_digests:
+        digest = hashlib.sha256()
+        with open(path, 'rb') as f:
+            for chunk in iter(lambda: f.read(1 << 20), b''):
+                digest.update(chunk)
+        _file_digests[key] = digest.hexdigest()[:16]
+    return _file_digests[key]
+
+
+def embedding_fingerprint(backend: str, model_name: str, onnx_model_dir: Optional[str] = None) -> str:
+    """
+    Identify the embedding function for cache keys and index versions.
+
+    Quantized ONNX embeddings differ slightly from PyTorch ones, so each backend and
+    model file gets its own fingerprint and never shares cached vectors with another.
+    ONNX fingerprints include a hash of the model file, so two exports with the same
+    file name are told apart.
+    """
+    if backend == 'onnx':
+        if not onnx_model_dir:
+            raise ValueError("The onnx embedding backend requires onnx_model_dir")
+        model_file = resolve_onnx_model_file(onnx_model_dir)
+        return f"{model_name}:onnx:{os.path.basename(model_file)}:{file_digest(model_file)}"
+    if backend == 'hash':
+        return f"hash:{HashingEmbeddingModel().dimension}"
+    return model_name
+
+
+def load_embedding_model(backend: str, model_name: str, onnx_model_dir: Optional[str] = None):
+    """
+    Load an embedding model exposing encode(List[str]) -> np.ndarray.
+
+    Args:
+        backend: 'torch' (SentenceTransformer), 'onnx' (ONNX Runtime, see export_onnx.py) or
+            'hash' (HashingEmbeddingModel, offline benchmarks only)
+        model_name: SentenceTransformer model name
+        onnx_model_dir: Directory with the exported model and tokenizer.json (onnx backend only)
+    """
+    if backend == 'torch':
+        if SentenceTransformer is None:
+            raise ImportError("The torch embedding backend requires the sentence-transformers package")
+        return SentenceTransformer(model_name)
+    if backend == 'onnx':
+        if not onnx_model_dir:
+            raise ValueError("The onnx embedding backend requires onnx_model_dir")
+        return OnnxEmbeddingModel(onnx_model_dir)
+    if backend == 'hash':
+        return HashingEmbeddingModel()
+    raise ValueError(f"Unknown embedding backend '{backend}', expected one of: {', '.join(EMBEDDING_BACKENDS)}")
@@ -0,0 +1,187 @@
+import hashlib
+import logging
+import os
+import re
+import tempfile
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+
+def document_hash(model_name: str, text: str) -> str:
+    """Content address of a document embedding: sha256 over model name and text."""
+    digest = hashlib.sha256()
+    digest.update(model_name.encode('utf-8'))
+    digest.update(b'\0')
+    digest.update(text.encode('utf-8'))
+    return digest.hexdigest()
+
+
+class EmbeddingCache:
+    """
+    Persistent, content-addressed cache of document embeddings.
+
+    Entries are keyed by document_hash(model_name, text), so a changed document or a
+    different model never reuses a stale vector. The cache lives in a single .npz file
+    per model inside cache_dir and is rewritten atomically when new entries are added.
+    """
+
+    def __init__(self, cache_dir: str, model_name: str):
+        self.cache_dir = cache_dir
+        self.model_name = model_name
+        safe_model_name = re.sub(r'[^\w.-]', '_', model_name)
+        self.cache_file = os.path.join(cache_dir, f"embeddings_{safe_model_name}.npz")
+        self._vectors: Dict[str, np.ndarray] = {}
+        self._dirty = False
+        self.hits = 0
+        self.misses = 0
+        self._load()
+
+    def _load(self):
+        """Load existing entries from disk, ignoring a missing or unreadable cache file."""
+        if not os.path.exists(self.cache_file):
+            return
+        try:
+            with np.load(self.cache_file, allow_pickle=False) as data:
+                keys = data['keys']
+                vectors = data['vectors']
+            self._vectors = {str(key): vectors[i] for i, key in enumerate(keys)}
+            logger.info(f"Loaded {len(self._vectors)} cached embeddings from {self.cache_file}")
+        except Exception as e:
+            logger.warning(f"Ignoring unreadable embedding cache {self.cache_file}: {e}")
+            self._vectors = {}
+
+    def get(self, key: str) -> Optional[np.ndarray]:
+        return self._vectors.get(key)
+
+    def put(self, key: str, vector: np.ndarray):
+        self._vectors[key] = np.asarray(vector, dtype=np.float32)
+        self._dirty = True
+
+    def encode(self, embedding_model, documents: List[str]) -> np.ndarray:
+        """
+        Return embeddings for documents, encoding only those not already cached.
+
+        Args:
+            embedding_model: Model exposing encode(List[str]) -> np.ndarray
+            documents: Document texts to embed
+
+        Returns:
+            float32 array of shape (len(documents), dim) in document order
+        """
+        keys = [document_hash(self.model_name, doc) for doc in documents]
+        missing = [i for i, key in enumerate(keys) if key not in self._vectors]
+
+        # Encode each distinct missing document once
+        missing_keys = list(dict.fromkeys(keys[i] for i in missing))
+        if missing_keys:
+            first_index = {}
+            for i in missing:
+                first_index.setdefault(keys[i], i)
+            new_vectors = embedding_model.encode([documents[first_index[key]] for key in missing_keys])
+            for key, vector in zip(missing_keys, new_vectors):
+                self.put(key, vector)
+
+        self.misses += len(missing)
+        self.hits += len(documents) - len(missing)
+        logger.info(f"Embedding cache: {len(documents) - len(missing)} hits, {len(missing)} misses")
+
+        if not documents:
+            return np.zeros((0, 0), dtype=np.float32)
+        return np.stack([self._vectors[key] for key in keys])
+
+    def save(self):
+        """Atomically persist the cache if it has new entries."""
+        if not self._dirty:
+            return
+        os.makedirs(self.cache_dir, exist_ok=True)
+        keys = list(self._vectors.keys())
+        vectors = np.stack([self._vectors[key] for key in keys]) if keys else np.zeros((0, 0), dtype=np.float32)
+
+        fd, tmp_path = tempfile.mkstemp(dir=self.cache_dir, suffix='.npz.tmp')
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                np.savez(f, keys=np.array(keys), vectors=vectors)
+            os.replace(tmp_path, self.cache_file)
+        except Exception:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+        self._dirty = False
+        logger.info(f"Saved {len(keys)} embeddings to {self.cache_file}")
+
+
+def normalize_query(query: str) -> str:
+    """
+    Cache key for a query: lowercased with whitespace collapsed.
+
+    all-MiniLM-L6-v2 uses an uncased tokenizer, so this does not change the embedding.
+    """
+    return re.sub(r'\s+', ' ', query).strip().lower()
+
+
+class QueryEmbeddingCache:
+    """
+    Bounded, thread-safe LRU of normalized query text -> embedding vector.
+
+    Entries older than ttl_seconds (when set) are treated as misses and dropped.
+    """
+
+    def __init__(self, max_size: int = 1024, ttl_seconds: Optional[float] = None):
+        self.max_size = max_size
+        self.ttl_seconds = ttl_seconds
+        self._entries: "OrderedDict[str, tuple]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+
+    def get(self, key: str) -> Optional[np.ndarray]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            vector, stored_at = entry
+            if self.ttl_seconds is not None and time.monotonic() - stored_at > self.ttl_seconds:
+                del self._entries[key]
+                self.expirations += 1
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return vector
+
+    def put(self, key: str, vector: np.ndarray):
+        if self.max_size <= 0:
+            return
+        with self._lock:
+            self._entries[key] = (np.asarray(vector, dtype=np.float32), time.monotonic())
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'size': len(self._entries),
+                'max_size': self.max_size,
+                'ttl_seconds': self.ttl_seconds,
+                'hits': self.hits,
+                'misses': self.misses,
+                'evictions': self.evictions,
+                'expirations': self.expirations,
+                'hit_rate': round(self.hits / lookups, 4) if lookups else 0.0
+            }
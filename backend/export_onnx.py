@@ -0,0 +1,160 @@
+#!/usr/bin/env python3
+"""
+Export all-MiniLM-L6-v2 to ONNX for the onnx embedding backend, optionally
+int8-quantize it, and check it against the PyTorch SentenceTransformer.
+
+    python export_onnx.py --output-dir ../models/minilm-onnx --quantize
+
+The check embeds the speaker corpus and a set of sample queries with both
+backends, fails if any pair of embeddings falls below the cosine tolerance,
+and prints a single-query and batch latency comparison.
+"""
+
+import argparse
+import json
+import os
+import sys
+import time
+
+import numpy as np
+
+from embedding_backends import OnnxEmbeddingModel, SentenceTransformer
+
+MODEL_NAME = 'all-MiniLM-L6-v2'
+DEFAULT_DATA_FILE = os.path.join(os.path.dirname(__file__), "..", "data", "sof_week_speakers_complete.json")
+
+SAMPLE_QUERIES = [
+    "I'm a drone contractor, find me contacts that have experience in that field",
+    "drones",
+    "cyber",
+    "AI",
+    "special operations logistics and acquisition",
+    "veteran career transition",
+]
+
+
+def export(output_dir: str, quantize: bool, opset: int):
+    """Write model.onnx (and model_quantized.onnx) plus tokenizer.json to output_dir."""
+    import torch
+
+    os.makedirs(output_dir, exist_ok=True)
+    sentence_model = SentenceTransformer(MODEL_NAME)
+    transformer = sentence_model[0].auto_model.eval()
+    tokenizer = sentence_model.tokenizer
+
+    dummy = tokenizer(["export sample"], return_tensors='pt')
+    input_names = ['input_ids', 'attention_mask', 'token_type_ids']
+    model_path = os.path.join(output_dir, 'model.onnx')
+    dynamic_axes = {name: {0: 'batch', 1: 'sequence'} for name in input_names}
+    dynamic_axes['last_hidden_state'] = {0: 'batch', 1: 'sequence'}
+
+    with torch.no_grad():
+        torch.onnx.export(
+            transformer,
+            tuple(dummy[name] for name in input_names),
+            model_path,
+            input_names=input_names,
+            output_names=['last_hidden_state'],
+            dynamic_axes=dynamic_axes,
+            opset_version=opset
+        )
+    tokenizer.save_pretrained(output_dir)
+    print(f"Exported {model_path}")
+
+    if quantize:
+        from onnxruntime.quantization import QuantType, quantize_dynamic
+        quantized_path = os.path.join(output_dir, 'model_quantized.onnx')
+        quantize_dynamic(model_path, quantized_path, weight_type=QuantType.QInt8)
+        print(f"Quantized {quantized_path}")
+
+
+def load_texts(data_file: str) -> list:
+    """Speaker fields and bios from the data file plus sample queries."""
+    with open(data_file, 'r', encoding='utf-8') as f:
+        speakers = json.load(f)['speakers']
+    texts = list(SAMPLE_QUERIES)
+    for speaker in speakers:
+        parts = [speaker.get(field, '') for field in ('name', 'title', 'company', 'session_title', 'detailed_bio')]
+        texts.append(" | ".join(part for part in parts if part))
+    return texts
+
+
+def time_single_queries(model, queries: list, repeats: int) -> list:
+    timings = []
+    for _ in range(repeats):
+        for query in queries:
+            started = time.perf_counter()
+            model.encode([query])
+            timings.append(time.perf_counter() - started)
+    return timings
+
+
+def top_speakers(embeddings: np.ndarray, k: int = 5) -> np.ndarray:
+    """Indices of the k best speaker texts for each sample query (queries come first in load_texts)."""
+    query_count = len(SAMPLE_QUERIES)
+    scores = embeddings[:query_count] @ embeddings[query_count:].T
+    return np.argsort(-scores, axis=1)[:, :k]
+
+
+def verify(output_dir: str, model_file: str, data_file: str, tolerance: float, repeats: int) -> bool:
+    """Compare ONNX and PyTorch embeddings and latency; returns False if outside tolerance."""
+    texts = load_texts(data_file)
+    torch_model = SentenceTransformer(MODEL_NAME)
+    onnx_model = OnnxEmbeddingModel(output_dir, model_file=model_file)
+    print(f"Checking {os.path.basename(onnx_model.model_file)} on {len(texts)} texts (tolerance {tolerance})")
+
+    torch_embeddings = np.asarray(torch_model.encode(texts), dtype=np.float32)
+    onnx_embeddings = onnx_model.encode(texts)
+    cosine = np.sum(torch_embeddings * onnx_embeddings, axis=1) / (
+        np.linalg.norm(torch_embeddings, axis=1) * np.linalg.norm(onnx_embeddings, axis=1)
+    )
+    print(f"  cosine(torch, onnx): min {cosine.min():.5f}  mean {cosine.mean():.5f}")
+
+    # Rankings matter more than raw vectors: compare top-5 speakers for each sample query
+    torch_top = top_speakers(torch_embeddings)
+    onnx_top = top_speakers(onnx_embeddings)
+    overlap = np.mean([len(set(a) & set(b)) / 5 for a, b in zip(torch_top, onnx_top)])
+    print(f"  top-5 overlap on sample queries: {overlap:.0%}")
+
+    print("  latency (single query encode):")
+    for name, model in (('torch', torch_model), ('onnx', onnx_model)):
+        model.encode(SAMPLE_QUERIES)  # warm up
+        timings = sorted(time_single_queries(model, SAMPLE_QUERIES, repeats))
+        p50 = 1000 * timings[len(timings) // 2]
+        p95 = 1000 * timings[int(0.95 * (len(timings) - 1))]
+        started = time.perf_counter()
+        model.encode(texts)
+        batch_seconds = time.perf_counter() - started
+        print(f"    {name:5s} p50 {p50:7.2f} ms  p95 {p95:7.2f} ms  corpus batch {batch_seconds:6.2f} s")
+
+    passed = bool(cosine.min() >= tolerance)
+    print("  PASS" if passed else "  FAIL: embeddings outside tolerance")
+    return passed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--output-dir', required=True, help='Directory for model.onnx and tokenizer.json')
+    parser.add_argument('--quantize', action='store_true', help='Also write an int8 model_quantized.onnx')
+    parser.add_argument('--opset', type=int, default=14)
+    parser.add_argument('--verify-only', action='store_true', help='Skip the export and only run the checks')
+    parser.add_argument('--data-file', default=DEFAULT_DATA_FILE)
+    parser.add_argument('--repeats', type=int, default=20, help='Timing repetitions per sample query')
+    parser.add_argument('--tolerance', type=float, default=None,
+                        help='Minimum cosine between backends (default 0.9999 fp32, 0.98 int8)')
+    args = parser.parse_args()
+
+    if not args.verify_only:
+        export(args.output_dir, args.quantize, args.opset)
+
+    passed = True
+    for file_name, default_tolerance in (('model.onnx', 0.9999), ('model_quantized.onnx', 0.98)):
+        model_file = os.path.join(args.output_dir, file_name)
+        if os.path.exists(model_file):
+            tolerance = args.tolerance if args.tolerance is not None else default_tolerance
+            passed = verify(args.output_dir, model_file, args.data_file, tolerance, args.repeats) and passed
+    sys.exit(0 if passed else 1)
+
+
+if __name__ == "__main__":
+    main()
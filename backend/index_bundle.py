@@ -0,0 +1,119 @@
+import json
+import logging
+import os
+import shutil
+import tempfile
+import time
+from typing import Any, Dict, List
+
+import numpy as np
+
+from vector_index import normalize_rows
+
+logger = logging.getLogger(__name__)
+
+BUNDLE_FORMAT_VERSION = 1
+# File in the bundle root naming the version directory to load
+CURRENT_FILE = 'CURRENT'
+MANIFEST_FILE = 'manifest.json'
+EMBEDDINGS_FILE = 'embeddings.npy'
+DOCUMENTS_FILE = 'documents.json'
+METADATA_FILE = 'metadata.json'
+
+
+def _write_json(path: str, value: Any):
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(value, f, ensure_ascii=False)
+
+
+def write_index_bundle(output_dir: str, index_version: str, embedding_fingerprint: str, embeddings: np.ndarray,
+                       documents: List[str], metadatas: List[Dict[str, str]]) -> str:
+    """
+    Write a versioned index bundle and point output_dir/CURRENT at it.
+
+    The bundle lives in output_dir/<index_version>/ and holds unit-normalized float32
+    embeddings (.npy), the document texts, the per-document metadata (including the
+    document hashes) and a manifest with the embedding fingerprint. The version
+    directory is written under a temporary name and renamed into place, and CURRENT
+    is replaced atomically, so a server never sees a half-written bundle.
+
+    Returns:
+        Path of the version directory
+    """
+    os.makedirs(output_dir, exist_ok=True)
+    bundle_path = os.path.join(output_dir, index_version)
+    if os.path.exists(os.path.join(bundle_path, MANIFEST_FILE)):
+        # The version is a content hash, so an existing bundle already has these contents
+        logger.info(f"Index bundle {index_version} already exists in {output_dir}")
+    else:
+        staging = tempfile.mkdtemp(prefix=f".{index_version}-", dir=output_dir)
+        try:
+            # Readable by server workers running as other users
+            os.chmod(staging, 0o755)
+            embeddings = normalize_rows(embeddings) if len(embeddings) else np.zeros((0, 0), dtype=np.float32)
+            np.save(os.path.join(staging, EMBEDDINGS_FILE), embeddings)
+            _write_json(os.path.join(staging, DOCUMENTS_FILE), documents)
+            _write_json(os.path.join(staging, METADATA_FILE), metadatas)
+            # Manifest last: its presence marks the bundle as complete
+            _write_json(os.path.join(staging, MANIFEST_FILE), {
+                'format_version': BUNDLE_FORMAT_VERSION,
+                'index_version': index_version,
+                'embedding_fingerprint': embedding_fingerprint,
+                'speaker_count': len(documents),
+                'dimension': int(embeddings.shape[1]) if embeddings.ndim == 2 else 0,
+                'created_at': time.time()
+            })
+            os.replace(staging, bundle_path)
+        except Exception:
+            shutil.rmtree(staging, ignore_errors=True)
+            raise
+        logger.info(f"Wrote index bundle {index_version} ({len(documents)} speakers) to {bundle_path}")
+
+    fd, temp_path = tempfile.mkstemp(prefix='.CURRENT-', dir=output_dir)
+    with os.fdopen(fd, 'w') as f:
+        f.write(index_version + '\n')
+    os.chmod(temp_path, 0o644)
+    os.replace(temp_path, os.path.join(output_dir, CURRENT_FILE))
+    return bundle_path
+
+
+class IndexBundle:
+    """
+    A prebuilt index bundle with its embeddings memory-mapped read-only.
+
+    Every process that loads the same bundle maps the same file, so the vectors are
+    held once in the OS page cache however many server workers are running.
+    """
+
+    def __init__(self, path: str):
+        """
+        Args:
+            path: A bundle version directory, or a bundle root whose CURRENT file names one
+        """
+        current_file = os.path.join(path, CURRENT_FILE)
+        if not os.path.exists(os.path.join(path, MANIFEST_FILE)) and os.path.exists(current_file):
+            with open(current_file) as f:
+                path = os.path.join(path, f.read().strip())
+        self.path = path
+
+        with open(os.path.join(path, MANIFEST_FILE), encoding='utf-8') as f:
+            self.manifest = json.load(f)
+        if self.manifest.get('format_version') != BUNDLE_FORMAT_VERSION:
+            raise ValueError(f"Unsupported index bundle format {self.manifest.get('format_version')} in {path}")
+        with open(os.path.join(path, METADATA_FILE), encoding='utf-8') as f:
+            self.metadatas: List[Dict[str, str]] = json.load(f)
+        self.embeddings = np.load(os.path.join(path, EMBEDDINGS_FILE), mmap_mode='r')
+
+        self.index_version: str = self.manifest['index_version']
+        self.embedding_fingerprint: str = self.manifest['embedding_fingerprint']
+        self.document_hashes = [metadata['document_hash'] for metadata in self.metadatas]
+        logger.info(f"Loaded index bundle {self.index_version} from {path} "
+                    f"({len(self.document_hashes)} speakers, embeddings memory-mapped)")
+
+    def documents(self) -> List[str]:
+        with open(os.path.join(self.path, DOCUMENTS_FILE), encoding='utf-8') as f:
+            return json.load(f)
+
+    def embeddings_by_hash(self) -> Dict[str, np.ndarray]:
+        """Row views of the mapped embeddings keyed by document hash."""
+        return {key: self.embeddings[i] for i, key in enumerate(self.document_hashes)}
@@ -0,0 +1,67 @@
+import logging
+import math
+from collections import Counter
+from typing import Dict, List, Tuple
+
+import numpy as np
+
+from text_index import tokenize
+
+logger = logging.getLogger(__name__)
+
+
+class BM25Index:
+    """
+    Okapi BM25 over the speaker documents used for embedding.
+
+    Postings are stored as per-term arrays of (document index, term frequency) so a
+    query is scored for the whole corpus with a few vectorized updates.
+    """
+
+    def __init__(self, documents: List[str], k1: float = 1.5, b: float = 0.75):
+        self.k1 = k1
+        self.b = b
+        self.document_count = len(documents)
+
+        doc_terms = [Counter(token for token, _, _ in tokenize(document)) for document in documents]
+        self.doc_lengths = np.array([sum(terms.values()) for terms in doc_terms], dtype=np.float32)
+        average_length = float(self.doc_lengths.mean()) if self.document_count else 0.0
+        # Per-document length normalization term of the BM25 denominator
+        self._length_norm = k1 * (1 - b + b * self.doc_lengths / average_length) if average_length else self.doc_lengths
+
+        postings: Dict[str, List[Tuple[int, int]]] = {}
+        for doc_index, terms in enumerate(doc_terms):
+            for term, frequency in terms.items():
+                postings.setdefault(term, []).append((doc_index, frequency))
+
+        self.postings: Dict[str, Tuple[np.ndarray, np.ndarray]] = {}
+        self.idf: Dict[str, float] = {}
+        for term, entries in postings.items():
+            doc_ids = np.array([doc_index for doc_index, _ in entries], dtype=np.int64)
+            frequencies = np.array([frequency for _, frequency in entries], dtype=np.float32)
+            self.postings[term] = (doc_ids, frequencies)
+            document_frequency = len(entries)
+            self.idf[term] = math.log(1 + (self.document_count - document_frequency + 0.5) / (document_frequency + 0.5))
+
+        logger.info(f"Built BM25 index: {len(self.postings)} terms over {self.document_count} documents")
+
+    def scores(self, query: str) -> np.ndarray:
+        """BM25 score of every document for query (zero where no query term occurs)."""
+        scores = np.zeros(self.document_count, dtype=np.float32)
+        for term, query_frequency in Counter(token for token, _, _ in tokenize(query)).items():
+            if term not in self.postings:
+                continue
+            doc_ids, frequencies = self.postings[term]
+            weight = self.idf[term] * query_frequency
+            scores[doc_ids] += weight * frequencies * (self.k1 + 1) / (frequencies + self._length_norm[doc_ids])
+        return scores
+
+    def top(self, scores: np.ndarray, top_k: int) -> List[Tuple[int, float]]:
+        """Best-scoring documents with a positive score, best first (ties by index)."""
+        if top_k <= 0:
+            return []
+        candidates = np.flatnonzero(scores > 0)
+        if len(candidates) > top_k:
+            candidates = candidates[np.argpartition(-scores[candidates], top_k - 1)[:top_k]]
+        order = candidates[np.lexsort((candidates, -scores[candidates]))]
+        return [(int(i), float(scores[i])) for i in order]
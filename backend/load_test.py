@@ -0,0 +1,300 @@
+#!/usr/bin/env python3
+"""
+End-to-end HTTP load test for the recommendation server.
+
+    # Start a local server with the offline 'hash' embedder on 10k synthetic speakers
+    python load_test.py --start-server --data-scale 10000 --concurrency 32 --duration 30
+
+    # Open-loop: Poisson arrivals at 200 requests/s against a running server
+    python load_test.py --url http://localhost:8000 --rate 200 --mix recommend=8,stream=1,batch=1
+
+Closed-loop mode (--concurrency) keeps N clients sending back to back and finds
+the throughput ceiling. Open-loop mode (--rate) launches requests on a Poisson
+schedule whether or not earlier ones have finished, and measures latency from
+the scheduled send time, so queueing is not hidden by slow responses. Queries
+are drawn from a pool with Zipf-distributed popularity, so popular queries
+repeat as they do in real traffic. Reports throughput, error rates and latency
+percentiles per endpoint (and time to first result for streaming).
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import random
+import subprocess
+import sys
+import tempfile
+import time
+from collections import Counter, defaultdict
+from typing import Any, Dict, List, Optional
+
+import httpx
+import numpy as np
+
+from synthetic_corpus import TOPICS, write_synthetic_data_file
+
+QUERY_TEMPLATES = [
+    "I'm a {} contractor, find me contacts that have experience in that field",
+    "{}",
+    "experts in {} and {}",
+    "who is speaking about {} for special operations",
+    "{} {}",
+]
+ENDPOINTS = ('recommend', 'stream', 'batch')
+
+
+class QueryMix:
+    """Queries drawn from a fixed pool with Zipf-distributed popularity."""
+
+    def __init__(self, unique_queries: int, zipf_exponent: float, seed: int):
+        self.rng = random.Random(seed)
+        self.pool = [self.rng.choice(QUERY_TEMPLATES).format(*self.rng.sample(TOPICS, 2)) + f" {i}"
+                     for i in range(unique_queries)]
+        weights = 1.0 / np.arange(1, unique_queries + 1) ** zipf_exponent
+        self.cumulative = list(np.cumsum(weights / weights.sum()))
+        self.seen = set()
+        self.drawn = 0
+        self.repeats = 0
+
+    def next(self) -> str:
+        index = min(np.searchsorted(self.cumulative, self.rng.random()), len(self.pool) - 1)
+        self.drawn += 1
+        if index in self.seen:
+            self.repeats += 1
+        self.seen.add(index)
+        return self.pool[index]
+
+
+class Results:
+    def __init__(self):
+        self.latencies: Dict[str, List[float]] = defaultdict(list)
+        self.first_result: List[float] = []
+        self.statuses: Dict[str, Counter] = defaultdict(Counter)
+        self.errors: Dict[str, Counter] = defaultdict(Counter)
+
+    def summary(self, elapsed: float) -> Dict[str, Any]:
+        report = {}
+        for endpoint in sorted(set(self.statuses) | set(self.errors)):
+            latencies = np.array(self.latencies[endpoint]) * 1000
+            total = sum(self.statuses[endpoint].values()) + sum(self.errors[endpoint].values())
+            ok = self.statuses[endpoint].get(200, 0)
+            entry = {
+                'requests': total,
+                'throughput_rps': round(total / elapsed, 2),
+                'error_rate': round(1 - ok / total, 4) if total else 0.0,
+                'statuses': {str(status): count for status, count in sorted(self.statuses[endpoint].items())},
+                'client_errors': dict(self.errors[endpoint]),
+            }
+            if len(latencies):
+                entry['latency_ms'] = {
+                    name: round(float(np.percentile(latencies, q)), 3)
+                    for name, q in (('p50', 50), ('p90', 90), ('p99', 99), ('p999', 99.9))
+                }
+                entry['latency_ms']['max'] = round(float(latencies.max()), 3)
+                entry['latency_ms']['mean'] = round(float(latencies.mean()), 3)
+            if endpoint == 'stream' and self.first_result:
+                first = np.array(self.first_result) * 1000
+                entry['first_result_ms'] = {name: round(float(np.percentile(first, q)), 3)
+                                            for name, q in (('p50', 50), ('p99', 99))}
+            report[endpoint] = entry
+        return report
+
+
+async def send(client: httpx.AsyncClient, endpoint: str, mix: QueryMix, args, results: Results,
+               scheduled: float, record: bool):
+    """Send one request; latency counts from scheduled, the time it was meant to go out."""
+    try:
+        if endpoint == 'batch':
+            body = {'requests': [{'query': mix.next(), 'top_k': args.top_k} for _ in range(args.batch_size)]}
+            response = await client.post('/recommend/batch', json=body)
+            status = response.status_code
+        elif endpoint == 'stream':
+            async with client.stream('POST', '/recommend/stream', json={'query': mix.next(), 'top_k': args.top_k}) as response:
+                status = response.status_code
+                first = None
+                async for line in response.aiter_lines():
+                    if first is None and line:
+                        first = time.perf_counter() - scheduled
+                if record and first is not None:
+                    results.first_result.append(first)
+        else:
+            response = await client.post('/recommend', json={'query': mix.next(), 'top_k': args.top_k})
+            status = response.status_code
+    except httpx.HTTPError as e:
+        if record:
+            results.errors[endpoint][type(e).__name__] += 1
+        return
+    if record:
+        results.statuses[endpoint][status] += 1
+        if status == 200:
+            results.latencies[endpoint].append(time.perf_counter() - scheduled)
+
+
+def choose_endpoint(rng: random.Random, weights: Dict[str, float]) -> str:
+    return rng.choices(list(weights), weights=list(weights.values()))[0]
+
+
+async def run_closed_loop(client, mix, weights, args, results, measure_from: float, end: float):
+    rng = random.Random(args.seed + 1)
+
+    async def worker():
+        while time.perf_counter() < end:
+            scheduled = time.perf_counter()
+            await send(client, choose_endpoint(rng, weights), mix, args, results, scheduled, scheduled >= measure_from)
+
+    await asyncio.gather(*(worker() for _ in range(args.concurrency)))
+
+
+async def run_open_loop(client, mix, weights, args, results, measure_from: float, end: float):
+    rng = random.Random(args.seed + 1)
+    in_flight = set()
+    dropped = 0
+    scheduled = time.perf_counter()
+    while scheduled < end:
+        scheduled += rng.expovariate(args.rate)
+        delay = scheduled - time.perf_counter()
+        if delay > 0:
+            await asyncio.sleep(delay)
+        if len(in_flight) >= args.max_in_flight:
+            # The client itself is saturated; count it rather than silently slowing the schedule
+            dropped += 1
+            continue
+        task = asyncio.create_task(
+            send(client, choose_endpoint(rng, weights), mix, args, results, scheduled, scheduled >= measure_from)
+        )
+        in_flight.add(task)
+        task.add_done_callback(in_flight.discard)
+    if in_flight:
+        await asyncio.gather(*in_flight)
+    return dropped
+
+
+async def wait_until_ready(client: httpx.AsyncClient, timeout: float):
+    deadline = time.perf_counter() + timeout
+    while time.perf_counter() < deadline:
+        try:
+            if (await client.get('/readyz')).status_code == 200:
+                return
+        except httpx.HTTPError:
+            pass
+        await asyncio.sleep(0.5)
+    raise TimeoutError(f"Server not ready after {timeout:.0f}s")
+
+
+def start_server(args, temp_dir: str) -> subprocess.Popen:
+    """Start uvicorn on this machine with the offline 'hash' embedder."""
+    env = dict(os.environ)
+    env.setdefault('SPEAKER_EMBEDDING_BACKEND', 'hash')
+    env.setdefault('SPEAKER_EMBEDDING_CACHE_DIR', '')
+    if args.data_scale:
+        data_file = os.path.join(temp_dir, 'speakers.json')
+        write_synthetic_data_file(data_file, args.data_scale, args.seed)
+        env['SPEAKER_DATA_FILE'] = data_file
+    command = [sys.executable, '-m', 'uvicorn', 'server:app', '--host', '127.0.0.1', '--port', str(args.port),
+               '--workers', str(args.workers), '--log-level', 'warning']
+    return subprocess.Popen(command, cwd=os.path.dirname(os.path.abspath(__file__)), env=env)
+
+
+def parse_mix(text: str) -> Dict[str, float]:
+    weights = {}
+    for part in text.split(','):
+        name, _, weight = part.partition('=')
+        if name not in ENDPOINTS:
+            raise argparse.ArgumentTypeError(f"Unknown endpoint '{name}', expected one of: {', '.join(ENDPOINTS)}")
+        weights[name] = float(weight or 1)
+    return weights
+
+
+async def main_async(args) -> Dict[str, Any]:
+    weights = parse_mix(args.mix)
+    mix = QueryMix(args.unique_queries, args.zipf, args.seed)
+    results = Results()
+    limits = httpx.Limits(max_connections=max(args.concurrency, args.max_in_flight))
+    async with httpx.AsyncClient(base_url=args.url, timeout=args.timeout, limits=limits) as client:
+        await wait_until_ready(client, args.ready_timeout)
+        started = time.perf_counter()
+        measure_from = started + args.warmup
+        end = measure_from + args.duration
+        dropped = 0
+        if args.rate:
+            dropped = await run_open_loop(client, mix, weights, args, results, measure_from, end)
+        else:
+            await run_closed_loop(client, mix, weights, args, results, measure_from, end)
+        elapsed = time.perf_counter() - measure_from
+
+    summary = results.summary(elapsed)
+    total = sum(entry['requests'] for entry in summary.values())
+    return {
+        'mode': f"open-loop {args.rate} rps" if args.rate else f"closed-loop x{args.concurrency}",
+        'duration_s': round(elapsed, 2),
+        'throughput_rps': round(total / elapsed, 2),
+        'query_repeat_rate': round(mix.repeats / mix.drawn, 4) if mix.drawn else 0.0,
+        'dropped_by_client': dropped,
+        'endpoints': summary,
+    }
+
+
+def print_report(report: Dict[str, Any]):
+    print(f"{report['mode']}: {report['throughput_rps']} req/s over {report['duration_s']} s, "
+          f"query repeat rate {report['query_repeat_rate']:.1%}, dropped by client {report['dropped_by_client']}")
+    for endpoint, entry in report['endpoints'].items():
+        latency = entry.get('latency_ms', {})
+        line = (f"  {endpoint:<10} {entry['requests']:>7} req  {entry['throughput_rps']:>8} req/s  "
+                f"errors {entry['error_rate']:.2%}")
+        if latency:
+            line += (f"  p50 {latency['p50']:.1f}  p90 {latency['p90']:.1f}  p99 {latency['p99']:.1f}  "
+                     f"max {latency['max']:.1f} ms")
+        if 'first_result_ms' in entry:
+            line += f"  first result p50 {entry['first_result_ms']['p50']:.1f} ms"
+        print(line)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--url', default=None, help='Server to test (default: the one started by --start-server)')
+    parser.add_argument('--start-server', action='store_true', help='Start a local uvicorn with the hash embedder')
+    parser.add_argument('--port', type=int, default=8765, help='Port for --start-server')
+    parser.add_argument('--workers', type=int, default=1, help='uvicorn workers for --start-server')
+    parser.add_argument('--data-scale', type=int, default=0,
+                        help='Serve this many synthetic speakers with --start-server (default: the real data file)')
+    parser.add_argument('--concurrency', type=int, default=16, help='Closed-loop clients')
+    parser.add_argument('--rate', type=float, default=0.0, help='Open-loop arrival rate in requests/s')
+    parser.add_argument('--max-in-flight', type=int, default=1000, help='Open-loop cap on outstanding requests')
+    parser.add_argument('--duration', type=float, default=30.0, help='Measured seconds')
+    parser.add_argument('--warmup', type=float, default=5.0, help='Unmeasured seconds before the measurement')
+    parser.add_argument('--mix', default='recommend=1', help='Endpoint weights, e.g. recommend=8,stream=1,batch=1')
+    parser.add_argument('--batch-size', type=int, default=8, help='Queries per /recommend/batch request')
+    parser.add_argument('--top-k', type=int, default=5)
+    parser.add_argument('--unique-queries', type=int, default=500, help='Size of the query pool')
+    parser.add_argument('--zipf', type=float, default=1.1, help='Zipf exponent of query popularity')
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--timeout', type=float, default=30.0, help='Per-request timeout in seconds')
+    parser.add_argument('--ready-timeout', type=float, default=300.0, help='Seconds to wait for /readyz')
+    parser.add_argument('--output', default=None, help='Write the report as JSON to this file')
+    args = parser.parse_args()
+
+    if not args.url and not args.start_server:
+        parser.error('Give --url or --start-server')
+
+    server: Optional[subprocess.Popen] = None
+    with tempfile.TemporaryDirectory() as temp_dir:
+        if args.start_server:
+            server = start_server(args, temp_dir)
+            args.url = args.url or f"http://127.0.0.1:{args.port}"
+        try:
+            report = asyncio.run(main_async(args))
+        finally:
+            if server is not None:
+                server.terminate()
+                server.wait(timeout=30)
+
+    print_report(report)
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(report, f, indent=2)
+        print(f"Wrote {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,96 @@
+import logging
+import re
+from collections import Counter, defaultdict
+from typing import Dict, List, Set, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Ranks and honorifics the scrapers leave in front of names, longest first
+NAME_PREFIXES = sorted([
+    'mr', 'mrs', 'ms', 'miss', 'dr', 'prof', 'professor', 'the honorable', 'honorable', 'hon',
+    'general', 'lieutenant general', 'major general', 'brigadier general', 'admiral', 'vice admiral',
+    'rear admiral', 'colonel', 'lieutenant colonel', 'major', 'captain', 'commander', 'lieutenant',
+    'command sergeant major', 'sergeant major', 'master chief', 'chief', 'sergeant', 'mayor',
+    'secretary', 'senator', 'representative', 'ambassador', 'ret', 'retired',
+], key=len, reverse=True)
+_PREFIX_PATTERN = re.compile(r'^(?:' + '|'.join(re.escape(prefix) for prefix in NAME_PREFIXES) + r')\s+')
+
+
+def normalize_name(name: str) -> str:
+    """
+    Canonical lookup key for a person's name.
+
+    Removes &nbsp; remnants, parenthesized notes such as "(Ret.)", punctuation and
+    leading ranks or honorifics, then lowercases and collapses whitespace:
+    "Lieutenant General (Ret.) Giovanni Tuck" -> "giovanni tuck".
+    """
+    text = (name or '').replace('&nbsp;', ' ').replace('\xa0', ' ')
+    text = re.sub(r'\([^)]*\)', ' ', text)
+    text = re.sub(r'[^\w\s]', ' ', text.lower())
+    text = re.sub(r'\s+', ' ', text).strip()
+    while True:
+        stripped = _PREFIX_PATTERN.sub('', text)
+        if stripped == text:
+            break
+        text = stripped
+    return text
+
+
+def trigrams(text: str) -> Set[str]:
+    padded = f"  {text} "
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+class SpeakerNameIndex:
+    """
+    Hash index of normalized names plus a trigram index for fuzzy name lookup.
+
+    Exact lookups are a single dict access. Fuzzy lookups count trigrams shared with
+    each candidate through the inverted trigram index and rank by Dice coefficient.
+    """
+
+    def __init__(self, names: List[str]):
+        self.exact: Dict[str, List[int]] = defaultdict(list)
+        self.trigram_postings: Dict[str, List[int]] = defaultdict(list)
+        self.trigram_counts: List[int] = []
+        for speaker_index, name in enumerate(names):
+            key = normalize_name(name)
+            self.exact[key].append(speaker_index)
+            grams = trigrams(key) if key else set()
+            self.trigram_counts.append(len(grams))
+            for gram in grams:
+                self.trigram_postings[gram].append(speaker_index)
+        self.exact = dict(self.exact)
+        self.trigram_postings = dict(self.trigram_postings)
+        logger.info(f"Built name index over {len(names)} speakers ({len(self.trigram_postings)} trigrams)")
+
+    def get(self, name: str) -> List[int]:
+        """Speakers whose normalized name equals the normalized query."""
+        return self.exact.get(normalize_name(name), [])
+
+    def search(self, name: str, limit: int = 5, min_score: float = 0.3) -> List[Tuple[int, float]]:
+        """
+        Rank speakers by name similarity to the query.
+
+        Returns:
+            Up to limit (speaker_index, score) pairs, best first; exact normalized
+            matches score 1.0, fuzzy ones their trigram Dice coefficient
+        """
+        key = normalize_name(name)
+        if not key:
+            return []
+
+        scores = {speaker_index: 1.0 for speaker_index in self.exact.get(key, [])}
+        query_grams = trigrams(key)
+        shared = Counter()
+        for gram in query_grams:
+            shared.update(self.trigram_postings.get(gram, ()))
+        for speaker_index, count in shared.items():
+            if speaker_index in scores:
+                continue
+            score = 2.0 * count / (len(query_grams) + self.trigram_counts[speaker_index])
+            if score >= min_score:
+                scores[speaker_index] = score
+
+        ranked = sorted(scores.items(), key=lambda item: (-item[1], item[0]))
+        return ranked[:limit]
@@ -0,0 +1,77 @@
+import json
+import logging
+from typing import Any, Dict, List
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+logger = logging.getLogger(__name__)
+
+# Per-query fields of a recommendation, in the order they are appended to the static fragment
+SCORE_FIELDS = ('relevance_score', 'vector_score', 'bm25_score', 'fused_score')
+
+
+def dumps(value: Any) -> bytes:
+    """Compact JSON bytes, using orjson when it is installed."""
+    if orjson is not None:
+        return orjson.dumps(value)
+    return json.dumps(value, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+
+
+class SpeakerPayloads:
+    """
+    Pre-serialized JSON fragments for the speaker-only part of each recommendation.
+
+    fragments[i] holds name, title, company, contact_info, session_details and
+    image_url of speaker i as an unterminated JSON object, built once at load time.
+    A recommendation is serialized by appending only the scores, explanation and
+    highlights of the query, so nothing speaker-specific is rebuilt or re-validated
+    per request. The output matches the SpeakerResponse schema.
+    """
+
+    def __init__(self, speakers: List[Dict[str, Any]], contact_infos: List[Dict[str, str]],
+                 session_details: List[Dict[str, str]], index_version: str):
+        self.index_version = index_version
+        self._index_version_json = dumps(index_version)
+        self.fragments = []
+        for speaker, contact_info, details in zip(speakers, contact_infos, session_details):
+            static = dumps({
+                'name': speaker.get('name', ''),
+                'title': speaker.get('title', ''),
+                'company': speaker.get('company', ''),
+                'contact_info': contact_info,
+                'session_details': details,
+                'image_url': speaker.get('image_url'),
+            })
+            # Drop the closing brace so per-query fields can be appended
+            self.fragments.append(static[:-1])
+        logger.info(f"Pre-serialized response fragments for {len(self.fragments)} speakers "
+                    f"({sum(len(fragment) for fragment in self.fragments) / 1024:.0f} KiB, "
+                    f"{'orjson' if orjson is not None else 'json'})")
+
+    def speaker_json(self, recommendation: Dict[str, Any]) -> bytes:
+        """One SpeakerResponse object for a recommendation dict from the engine."""
+        dynamic = dumps({
+            **{field: recommendation[field] for field in SCORE_FIELDS},
+            'explanation': recommendation['explanation'],
+            'highlights': recommendation['highlights'],
+        })
+        return self.fragments[recommendation['speaker_index']] + b',' + dynamic[1:]
+
+    def response_json(self, query: str, recommendations: List[Dict[str, Any]]) -> bytes:
+        """A full RecommendationResponse object."""
+        return b''.join((
+            b'{"query":', dumps(query),
+            b',"recommendations":[', b','.join(self.speaker_json(rec) for rec in recommendations),
+            b'],"total_found":', str(len(recommendations)).encode('ascii'),
+            b',"index_version":', self._index_version_json, b'}'
+        ))
+
+    def batch_response_json(self, queries: List[str], batch_recommendations: List[List[Dict[str, Any]]]) -> bytes:
+        """A full BatchRecommendationResponse object."""
+        return b'{"results":[' + b','.join(
+            self.response_json(query, recommendations)
+            for query, recommendations in zip(queries, batch_recommendations)
+        ) + b']}'
@@ -1,9 +1,21 @@
-from fastapi import FastAPI
+import asyncio
+import hmac
+import logging
+import time
+from fastapi import FastAPI, Header, HTTPException, Query, Request
+from fastapi.concurrency import run_in_threadpool
 from fastapi.middleware.cors import CORSMiddleware
-from pydantic import BaseModel
-from speaker_recommendation_engine import SpeakerRecommendationEngine
+from fastapi.responses import JSONResponse, Response, StreamingResponse
+from pydantic import BaseModel, Field
+from typing import Literal, Optional
+from speaker_recommendation_engine import STAGE_SECONDS, SpeakerRecommendationEngine
+from batching import RecommendationBatcher
+from response_payloads import dumps
+from metrics import CONTENT_TYPE, REGISTRY, Counter, Gauge, Histogram
 import os
 
+logger = logging.getLogger(__name__)
+
 app = FastAPI()
 
 app.add_middleware(
@@ -14,53 +26,428 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+class SpeakerFilters(BaseModel):
+    day: Optional[str] = None
+    location: Optional[str] = None
+    company: Optional[str] = None
+    has_bio: Optional[bool] = None
+
+# Largest top_k a recommendation request may ask for; out-of-range values get a 422
+MAX_TOP_K = int(os.environ.get("SPEAKER_MAX_TOP_K", "100"))
+
 class RecommendationRequest(BaseModel):
     query: str
-    top_k: int = 5
+    top_k: int = Field(5, ge=1, le=MAX_TOP_K)
+    # How vector and BM25 results are merged; None uses the server default
+    fusion: Optional[Literal["vector", "rrf", "weighted"]] = None
+    # Applied inside the search, so top_k is filled from matching speakers
+    filters: Optional[SpeakerFilters] = None
 
 class SpeakerResponse(BaseModel):
     name: str
     title: str
     company: str
     relevance_score: float
+    vector_score: float
+    bm25_score: float
+    fused_score: float
     explanation: str
     contact_info: dict
     session_details: dict
     image_url: str = None
+    highlights: dict = {}
 
 class RecommendationResponse(BaseModel):
     query: str
     recommendations: list[SpeakerResponse]
     total_found: int
+    index_version: str
+
+class NameCandidate(BaseModel):
+    name: str
+    title: str
+    company: str
+    score: float
+    image_url: str = None
+
+class NameSearchResponse(BaseModel):
+    query: str
+    candidates: list[NameCandidate]
+
+class BatchRecommendationRequest(BaseModel):
+    requests: list[RecommendationRequest]
+
+class BatchRecommendationResponse(BaseModel):
+    results: list[RecommendationResponse]
+
+MAX_BATCH_SIZE = int(os.environ.get("SPEAKER_MAX_BATCH_SIZE", "256"))
+# Seconds clients are told to wait before retrying while the engine is still loading
+RETRY_AFTER_SECONDS = os.environ.get("SPEAKER_RETRY_AFTER_SECONDS", "5")
+DATA_FILE = os.environ.get("SPEAKER_DATA_FILE") or os.path.join(
+    os.path.dirname(__file__), "..", "data", "sof_week_speakers_complete.json"
+)
+# Seconds between checks of the data file's mtime for hot reload; 0 disables the watcher
+RELOAD_POLL_SECONDS = float(os.environ.get("SPEAKER_RELOAD_POLL_SECONDS", "0"))
+# POST /admin/reload requires this value in the X-Admin-Token header; without it the endpoint is disabled
+ADMIN_TOKEN = os.environ.get("SPEAKER_ADMIN_TOKEN")
+
+# Prometheus metrics exported at /metrics; pipeline stage latencies come from the engine
+REQUEST_SECONDS = Histogram('speaker_request_seconds', 'Handler latency until the response starts', ['endpoint'])
+REQUESTS_TOTAL = Counter('speaker_requests_total', 'Requests handled', ['endpoint', 'status'])
+REQUEST_ERRORS_TOTAL = Counter('speaker_request_errors_total', 'Requests answered with a 4xx or 5xx status', ['endpoint', 'status'])
+TOP_K_BUCKETS = (5, 10, 20, 50, 100)
+TOP_K_TOTAL = Counter('speaker_recommend_top_k_total', 'Recommendation queries by requested top_k', ['top_k'])
+ENGINE_READY = Gauge('speaker_engine_ready', 'Whether the engine is loaded and serving')
+INDEX_SIZE = Gauge('speaker_index_size', 'Speakers in the active index')
+INDEX_INFO = Gauge('speaker_index_info', 'Active index version', ['index_version'])
+MODEL_LOAD_SECONDS = Gauge('speaker_model_load_seconds', 'Time taken to load the embedding model')
+ENGINE_LOAD_SECONDS = Gauge('speaker_engine_load_seconds', 'Time taken to build the engine at startup')
+QUERY_CACHE_ENTRIES = Gauge('speaker_query_cache_entries', 'Query embeddings held in the LRU')
+QUERY_CACHE_LOOKUPS = Gauge('speaker_query_cache_lookups', 'Query embedding LRU lookups since the index was built', ['result'])
+BATCHER_QUEUE_DEPTH = Gauge('speaker_batcher_queue_depth', 'Recommendation requests waiting for a batch')
 
 engine = None
+engine_error = None
+engine_load_seconds = None
+batcher = None
+engine_loader = None
+# Reloads build a new engine beside the active one and swap the global reference when done
+engine_generation = 0
+data_file_mtime = None
+reload_lock = asyncio.Lock()
+reload_watcher = None
+last_reload = None
+
+def build_engine(**overrides) -> SpeakerRecommendationEngine:
+    """Construct the recommendation engine from environment configuration."""
+    cache_dir = os.environ.get(
+        "SPEAKER_EMBEDDING_CACHE_DIR",
+        os.path.join(os.path.dirname(__file__), "..", "data", "embedding_cache")
+    )
+    return SpeakerRecommendationEngine(
+        DATA_FILE,
+        embedding_cache_dir=cache_dir or None,
+        vector_db_path=os.environ.get("SPEAKER_VECTOR_DB_PATH") or None,
+        vector_backend=os.environ.get("SPEAKER_VECTOR_BACKEND", "chroma"),
+        query_cache_size=int(os.environ.get("SPEAKER_QUERY_CACHE_SIZE", "1024")),
+        query_cache_ttl=float(os.environ["SPEAKER_QUERY_CACHE_TTL"]) if os.environ.get("SPEAKER_QUERY_CACHE_TTL") else None,
+        embedding_backend=os.environ.get("SPEAKER_EMBEDDING_BACKEND", "torch"),
+        onnx_model_dir=os.environ.get("SPEAKER_ONNX_MODEL_DIR") or None,
+        default_fusion=os.environ.get("SPEAKER_DEFAULT_FUSION", "rrf"),
+        fusion_vector_weight=float(os.environ.get("SPEAKER_FUSION_VECTOR_WEIGHT", "0.7")),
+        index_bundle_dir=os.environ.get("SPEAKER_INDEX_BUNDLE_DIR") or None,
+        **overrides
+    )
+
+def rebuild_engine(current: SpeakerRecommendationEngine, generation: int) -> SpeakerRecommendationEngine:
+    """Build a new engine over the data file, reusing the loaded model and unchanged embeddings."""
+    # Alternate between two Chroma collections so the one serving traffic is never modified
+    collection_name = SpeakerRecommendationEngine.COLLECTION_NAME
+    if generation % 2:
+        collection_name += "_alt"
+    rebuilt = build_engine(
+        embedding_model=current.embedding_model,
+        collection_name=collection_name,
+        known_embeddings=current.document_embeddings()
+    )
+    # The model was loaded once by the first engine; keep reporting that load time
+    rebuilt.model_load_seconds = current.model_load_seconds
+    return rebuilt
+
+def get_data_file_mtime() -> Optional[float]:
+    try:
+        return os.stat(DATA_FILE).st_mtime
+    except OSError:
+        return None
+
+async def load_engine():
+    """Build the engine in a worker thread so the server accepts connections meanwhile."""
+    global engine, engine_error, engine_load_seconds, data_file_mtime
+    started = time.perf_counter()
+    data_file_mtime = get_data_file_mtime()
+    try:
+        engine = await run_in_threadpool(build_engine)
+        engine_error = None
+        engine_load_seconds = time.perf_counter() - started
+        logger.info(f"Engine ready in {engine_load_seconds:.1f}s (index version {engine.index_version})")
+    except Exception as e:
+        engine_error = str(e)
+        logger.error(f"Engine failed to load: {e}")
+
+async def reload_engine(reason: str) -> dict:
+    """
+    Rebuild the engine from the data file in the background and swap it in.
+    
+    Requests already running keep the engine reference they started with, so they
+    finish on the old index. If the rebuild fails the old engine keeps serving.
+    If there is no engine because the initial load failed, this retries the full load.
+    """
+    global engine, engine_generation, data_file_mtime, last_reload
+    async with reload_lock:
+        current = engine
+        if current is None:
+            started = time.perf_counter()
+            await load_engine()
+            if engine is None:
+                last_reload = {"status": "failed", "reason": reason, "error": engine_error, "at": time.time()}
+                raise RuntimeError(engine_error)
+            last_reload = {
+                "status": "loaded",
+                "reason": reason,
+                "index_version": engine.index_version,
+                "previous_index_version": None,
+                "seconds": round(time.perf_counter() - started, 3),
+                "at": time.time()
+            }
+            return last_reload
+        # Taken before the rebuild so edits made while it runs trigger another reload
+        data_file_mtime = get_data_file_mtime()
+        started = time.perf_counter()
+        try:
+            new_engine = await run_in_threadpool(rebuild_engine, current, engine_generation + 1)
+        except Exception as e:
+            logger.error(f"Reload ({reason}) failed, still serving index version {current.index_version}: {e}")
+            last_reload = {"status": "failed", "reason": reason, "error": str(e), "at": time.time()}
+            raise
+        
+        swapped = new_engine.index_version != current.index_version
+        if swapped:
+            engine = new_engine
+            engine_generation += 1
+        last_reload = {
+            "status": "swapped" if swapped else "unchanged",
+            "reason": reason,
+            "index_version": engine.index_version,
+            "previous_index_version": current.index_version,
+            "seconds": round(time.perf_counter() - started, 3),
+            "at": time.time()
+        }
+        logger.info(f"Reload ({reason}): {last_reload['status']}, index version {engine.index_version}")
+        return last_reload
+
+async def watch_data_file():
+    """Reload whenever the data file's mtime changes."""
+    while True:
+        await asyncio.sleep(RELOAD_POLL_SECONDS)
+        # Skip while the initial load is running; after a failed load a file change retries it
+        if (engine is None and engine_error is None) or reload_lock.locked():
+            continue
+        mtime = get_data_file_mtime()
+        if mtime is not None and mtime != data_file_mtime:
+            try:
+                await reload_engine("data file changed")
+            except Exception:
+                # Logged by reload_engine; the next change to the file retries
+                pass
+
+def engine_batch_args(requests: list) -> tuple:
+    """Per-query argument lists for the engine's batch methods."""
+    return (
+        [item.query for item in requests],
+        [item.top_k for item in requests],
+        [item.fusion for item in requests],
+        [item.filters.model_dump(exclude_none=True) if item.filters else None for item in requests]
+    )
+
+def run_recommendation_batch(requests: list) -> list:
+    """
+    Run RecommendationRequest items through one batched engine call.
+    
+    Each result is paired with the engine that produced it, so a reload during the
+    request cannot mix rankings from one index with payloads from another.
+    """
+    active = engine
+    return [(active, recommendations) for recommendations in active.recommend_speakers_batch(*engine_batch_args(requests))]
+
+def record_top_k(top_k: int):
+    bucket = next((f"le_{bound}" for bound in TOP_K_BUCKETS if top_k <= bound), f"gt_{TOP_K_BUCKETS[-1]}")
+    TOP_K_TOTAL.inc(top_k=bucket)
+
+def require_engine() -> SpeakerRecommendationEngine:
+    """Return the loaded engine or fail fast with 503 while it is still loading."""
+    if engine is None:
+        detail = f"Engine failed to load: {engine_error}" if engine_error else "Engine is loading"
+        raise HTTPException(status_code=503, detail=detail, headers={"Retry-After": RETRY_AFTER_SECONDS})
+    return engine
+
+@app.middleware("http")
+async def record_request_metrics(request: Request, call_next):
+    started = time.perf_counter()
+    try:
+        response = await call_next(request)
+    except Exception:
+        # The client gets a 500 from the server error handler; count it like any other error
+        observe_request(request, started, 500)
+        raise
+    observe_request(request, started, response.status_code)
+    return response
+
+def observe_request(request: Request, started: float, status_code: int):
+    # Label by route template so path parameters cannot blow up cardinality
+    route = request.scope.get("route")
+    endpoint = getattr(route, "path", "unmatched")
+    REQUEST_SECONDS.observe(time.perf_counter() - started, endpoint=endpoint)
+    REQUESTS_TOTAL.inc(endpoint=endpoint, status=str(status_code))
+    if status_code >= 400:
+        REQUEST_ERRORS_TOTAL.inc(endpoint=endpoint, status=str(status_code))
 
 @app.on_event("startup")
 async def startup():
-    global engine
-    data_file = os.path.join(os.path.dirname(__file__), "..", "data", "sof_week_speakers_complete.json")
-    engine = SpeakerRecommendationEngine(data_file)
+    global batcher, engine_loader, reload_watcher
+    
+    # Group concurrent /recommend calls into batched encode + search runs off the event loop
+    batcher = RecommendationBatcher(
+        run_recommendation_batch,
+        max_wait_ms=float(os.environ.get("SPEAKER_BATCH_WINDOW_MS", "5")),
+        max_batch_size=int(os.environ.get("SPEAKER_BATCH_MAX_SIZE", "32"))
+    )
+    await batcher.start()
+    
+    # Load the model and index in the background; /readyz reports when it is done
+    engine_loader = asyncio.create_task(load_engine())
+    
+    if RELOAD_POLL_SECONDS > 0:
+        reload_watcher = asyncio.create_task(watch_data_file())
+
+@app.on_event("shutdown")
+async def shutdown():
+    for task in (engine_loader, reload_watcher):
+        if task is not None and not task.done():
+            task.cancel()
+    if batcher is not None:
+        await batcher.stop()
+
+def json_response(body: bytes, index_version: str) -> Response:
+    """Send JSON assembled from the engine's pre-serialized speaker fragments as-is."""
+    return Response(content=body, media_type="application/json", headers={"X-Index-Version": index_version})
 
 @app.post("/recommend", response_model=RecommendationResponse)
 async def recommend(request: RecommendationRequest):
-    recommendations = engine.recommend_speakers(request.query, request.top_k)
+    require_engine()
+    record_top_k(request.top_k)
+    active, recommendations = await batcher.submit(request)
+    with STAGE_SECONDS.time(stage='serialize'):
+        body = active.payloads.response_json(request.query, recommendations)
+    return json_response(body, active.index_version)
+
+def stream_recommendations(active: SpeakerRecommendationEngine, query: str, ranked: list, format: str):
+    """
+    Format and serialize ranked speakers one at a time.
     
-    speaker_responses = []
-    for rec in recommendations:
-        speaker_data = rec['speaker']
-        speaker_responses.append(SpeakerResponse(
-            name=speaker_data.get('name', ''),
-            title=speaker_data.get('title', ''),
-            company=speaker_data.get('company', ''),
-            relevance_score=rec['relevance_score'],
-            explanation=rec['explanation'],
-            contact_info=rec['contact_info'],
-            session_details=rec['session_details'],
-            image_url=speaker_data.get('image_url')
-        ))
+    NDJSON sends one SpeakerResponse object per line. SSE sends each one as a
+    "recommendation" event and finishes with a "done" event carrying total_found.
+    """
+    total = 0
+    for rec in active.format_recommendations(query, ranked):
+        payload = active.payloads.speaker_json(rec)
+        total += 1
+        if format == "sse":
+            yield b"event: recommendation\ndata: " + payload + b"\n\n"
+        else:
+            yield payload + b"\n"
+    if format == "sse":
+        done = {'query': query, 'total_found': total, 'index_version': active.index_version}
+        yield b"event: done\ndata: " + dumps(done) + b"\n\n"
+
+@app.post("/recommend/stream")
+async def recommend_stream(request: RecommendationRequest, format: Literal["ndjson", "sse"] = "ndjson"):
+    """Streaming variant of /recommend: each result is sent as soon as it is formatted."""
+    active = require_engine()
+    record_top_k(request.top_k)
+    # Ranking is cheap next to building full responses; it finishes before the first byte
+    # so errors still surface as a normal HTTP status.
+    ranked = (await run_in_threadpool(active.rank_speakers_batch, *engine_batch_args([request])))[0]
+    media_type = "text/event-stream" if format == "sse" else "application/x-ndjson"
+    return StreamingResponse(
+        stream_recommendations(active, request.query, ranked, format),
+        media_type=media_type,
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no", "X-Index-Version": active.index_version}
+    )
+
+@app.post("/recommend/batch", response_model=BatchRecommendationResponse)
+async def recommend_batch(request: BatchRecommendationRequest):
+    active = require_engine()
+    if len(request.requests) > MAX_BATCH_SIZE:
+        raise HTTPException(status_code=413, detail=f"Batch size exceeds the limit of {MAX_BATCH_SIZE} queries")
     
-    return RecommendationResponse(
-        query=request.query,
-        recommendations=speaker_responses,
-        total_found=len(speaker_responses)
+    for item in request.requests:
+        record_top_k(item.top_k)
+    batch_recommendations = await run_in_threadpool(
+        active.recommend_speakers_batch, *engine_batch_args(request.requests)
     )
+    
+    with STAGE_SECONDS.time(stage='serialize'):
+        body = active.payloads.batch_response_json([item.query for item in request.requests], batch_recommendations)
+    return json_response(body, active.index_version)
+
+@app.get("/speakers/by-name", response_model=NameSearchResponse)
+async def speakers_by_name(name: str, limit: int = Query(5, ge=1, le=50)):
+    matches = require_engine().find_speakers_by_name(name, limit)
+    return NameSearchResponse(query=name, candidates=[
+        NameCandidate(
+            name=match['speaker'].get('name', ''),
+            title=match['speaker'].get('title', ''),
+            company=match['speaker'].get('company', ''),
+            score=match['score'],
+            image_url=match['speaker'].get('image_url')
+        )
+        for match in matches
+    ])
+
+@app.get("/stats")
+async def stats():
+    stats = require_engine().get_cache_stats()
+    stats['batcher'] = batcher.stats()
+    return stats
+
+@app.post("/admin/reload")
+async def admin_reload(x_admin_token: Optional[str] = Header(None)):
+    if not ADMIN_TOKEN:
+        raise HTTPException(status_code=404, detail="Not Found")
+    if not x_admin_token or not hmac.compare_digest(x_admin_token, ADMIN_TOKEN):
+        raise HTTPException(status_code=401, detail="Invalid admin token")
+    if engine is None and engine_error is None:
+        require_engine()  # 503 while the initial load is still running
+    try:
+        return await reload_engine("admin request")
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Reload failed: {e}")
+
+@app.get("/metrics")
+async def metrics():
+    # Gauges are sampled from the active engine at scrape time
+    active = engine
+    ENGINE_READY.set(1 if active is not None else 0)
+    if active is not None:
+        INDEX_SIZE.set(active.speaker_count)
+        INDEX_INFO.clear()
+        INDEX_INFO.set(1, index_version=active.index_version)
+        MODEL_LOAD_SECONDS.set(active.model_load_seconds)
+        ENGINE_LOAD_SECONDS.set(engine_load_seconds)
+        query_cache = active.query_cache.stats()
+        QUERY_CACHE_ENTRIES.set(query_cache['size'])
+        QUERY_CACHE_LOOKUPS.set(query_cache['hits'], result='hit')
+        QUERY_CACHE_LOOKUPS.set(query_cache['misses'], result='miss')
+    if batcher is not None:
+        BATCHER_QUEUE_DEPTH.set(batcher.stats()['queue_depth'])
+    return Response(content=REGISTRY.render(), media_type=CONTENT_TYPE)
+
+@app.get("/healthz")
+async def healthz():
+    return {"status": "alive"}
+
+@app.get("/readyz")
+async def readyz():
+    if engine is None:
+        status = "failed" if engine_error else "loading"
+        body = {"status": status}
+        if engine_error:
+            body["error"] = engine_error
+        return JSONResponse(status_code=503, content=body, headers={"Retry-After": RETRY_AFTER_SECONDS})
+    return {
+        "status": "ready",
+        "index_version": engine.index_version,
+        "speaker_count": engine.speaker_count,
+        "load_seconds": round(engine_load_seconds, 3),
+        "last_reload": last_reload
+    }
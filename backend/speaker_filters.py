@@ -0,0 +1,98 @@
+import logging
+import re
+from collections import defaultdict
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+
+from text_index import tokenize
+
+logger = logging.getLogger(__name__)
+
+WEEKDAYS = ('monday', 'tuesday', 'wednesday', 'thursday', 'friday', 'saturday', 'sunday')
+_WEEKDAY_PATTERN = re.compile(r'\b(mon|tue|tues|wed|thu|thur|thurs|fri|sat|sun)(?:day|nesday|rsday|urday)?\b', re.IGNORECASE)
+
+FILTER_FIELDS = ('day', 'location', 'company', 'has_bio')
+
+
+def parse_day(text: str) -> str:
+    """Weekday named in a speaking time such as "Tuesday, May 6 10:35 AM", or '' if none."""
+    match = _WEEKDAY_PATTERN.search(text or '')
+    if not match:
+        return ''
+    prefix = match.group(1).lower()[:3]
+    return next(day for day in WEEKDAYS if day.startswith(prefix))
+
+
+def speaker_filter_fields(speaker: Dict[str, Any]) -> Dict[str, Any]:
+    """Filterable fields parsed from one speaker record at index time."""
+    location = speaker.get('location', '') or ''
+    return {
+        'day': parse_day(speaker.get('speaking_time', '')),
+        'venue': location.split(':', 1)[0].strip(),
+        'location': location,
+        'company': speaker.get('company', '') or '',
+        'has_bio': bool(speaker.get('detailed_bio') and speaker['detailed_bio'].strip()),
+    }
+
+
+class SpeakerFilterIndex:
+    """
+    Precomputed boolean masks over speakers for metadata filters.
+
+    Day and has_bio get one mask per value; location and company get one mask per
+    word, so "Convention Center" matches any location containing both words. A
+    request's filters are ANDed together with a few vectorized operations.
+    """
+
+    def __init__(self, speakers: List[Dict[str, Any]]):
+        self.size = len(speakers)
+        self.fields = [speaker_filter_fields(speaker) for speaker in speakers]
+
+        day_indices = defaultdict(list)
+        word_indices = {'location': defaultdict(set), 'company': defaultdict(set)}
+        for speaker_index, fields in enumerate(self.fields):
+            day_indices[fields['day']].append(speaker_index)
+            for field, words in word_indices.items():
+                for token, _, _ in tokenize(fields[field]):
+                    words[token].add(speaker_index)
+
+        self.day_masks = {day: self._mask(indices) for day, indices in day_indices.items() if day}
+        self.word_masks = {
+            field: {token: self._mask(indices) for token, indices in words.items()}
+            for field, words in word_indices.items()
+        }
+        self.has_bio_mask = np.array([fields['has_bio'] for fields in self.fields], dtype=bool)
+        logger.info(f"Built filter masks over {self.size} speakers ({len(self.day_masks)} days)")
+
+    def _mask(self, indices) -> np.ndarray:
+        mask = np.zeros(self.size, dtype=bool)
+        mask[list(indices)] = True
+        return mask
+
+    def mask(self, filters: Optional[Dict[str, Any]]) -> Optional[np.ndarray]:
+        """
+        Boolean mask of speakers passing all filters, or None when no filter is set.
+
+        Args:
+            filters: Any of day (weekday name or abbreviation), location, company
+                (all words must appear) and has_bio (bool)
+        """
+        filters = {key: value for key, value in (filters or {}).items() if value is not None and value != ''}
+        unknown = set(filters) - set(FILTER_FIELDS)
+        if unknown:
+            raise ValueError(f"Unknown filter(s): {', '.join(sorted(unknown))}")
+        if not filters:
+            return None
+
+        mask = np.ones(self.size, dtype=bool)
+        if 'day' in filters:
+            day = parse_day(filters['day'])
+            mask &= self.day_masks.get(day, np.zeros(self.size, dtype=bool))
+        for field in ('location', 'company'):
+            if field in filters:
+                for token, _, _ in tokenize(filters[field]):
+                    mask &= self.word_masks[field].get(token, np.zeros(self.size, dtype=bool))
+        if 'has_bio' in filters:
+            mask &= self.has_bio_mask if filters['has_bio'] else ~self.has_bio_mask
+        return mask
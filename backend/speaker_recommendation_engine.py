@@ -1,35 +1,112 @@
+import hashlib
 import json
 import logging
-from typing import List, Dict, Any, Optional
+import time
+from collections import defaultdict
+from typing import List, Dict, Any, Iterator, Optional
 import numpy as np
 import pandas as pd
-from sentence_transformers import SentenceTransformer
-import chromadb
-from chromadb.config import Settings
+from embedding_backends import embedding_fingerprint, load_embedding_model
+from embedding_cache import EmbeddingCache, QueryEmbeddingCache, document_hash, normalize_query
+from vector_index import create_vector_index
+from text_index import HIGHLIGHT_FIELDS, INDEXED_FIELDS, SpeakerTextIndex
+from lexical_index import BM25Index
+from name_index import SpeakerNameIndex
+from speaker_filters import SpeakerFilterIndex
+from response_payloads import SpeakerPayloads
+from index_bundle import IndexBundle
+from metrics import Histogram
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# Latency of each pipeline stage per engine call (batched calls are observed once)
+STAGE_SECONDS = Histogram(
+    'speaker_pipeline_stage_seconds',
+    'Time spent in each stage of the recommendation pipeline',
+    ['stage']
+)
+
 class SpeakerRecommendationEngine:
     """
     A recommendation engine for SOF Week speakers using vector embeddings and similarity search.
     Built with free/open-source tools: Sentence Transformers + ChromaDB
     """
     
-    def __init__(self, json_file_path: str):
+    MODEL_NAME = 'all-MiniLM-L6-v2'
+    COLLECTION_NAME = 'sof_week_speakers'
+    FUSION_MODES = ('vector', 'rrf', 'weighted')
+    # Reciprocal rank fusion constant; dampens the weight of top ranks
+    RRF_K = 60
+    # Candidates drawn from each retriever per requested result before fusion
+    CANDIDATE_MULTIPLIER = 4
+    
+    def __init__(self, json_file_path: str, embedding_cache_dir: Optional[str] = None,
+                 vector_db_path: Optional[str] = None, vector_backend: str = 'chroma',
+                 query_cache_size: int = 1024, query_cache_ttl: Optional[float] = None,
+                 embedding_backend: str = 'torch', onnx_model_dir: Optional[str] = None,
+                 default_fusion: str = 'rrf', fusion_vector_weight: float = 0.7,
+                 embedding_model: Optional[Any] = None, collection_name: Optional[str] = None,
+                 known_embeddings: Optional[Dict[str, np.ndarray]] = None,
+                 index_bundle_dir: Optional[str] = None):
         """
         Initialize the recommendation engine.
         
         Args:
             json_file_path: Path to the JSON file containing speaker data
+            embedding_cache_dir: Optional directory for the persistent document embedding cache
+            vector_db_path: Optional directory for a persistent ChromaDB index; in-memory if omitted
+            vector_backend: Search backend, 'chroma' or 'numpy' (exact in-memory cosine search)
+            query_cache_size: Maximum number of query embeddings kept in the LRU (0 disables it)
+            query_cache_ttl: Optional lifetime of cached query embeddings in seconds
+            embedding_backend: 'torch' (SentenceTransformer), 'onnx' (ONNX Runtime on CPU) or
+                'hash' (deterministic offline stand-in for benchmarks)
+            onnx_model_dir: Directory produced by export_onnx.py, required for the onnx backend
+            default_fusion: How vector and BM25 results are merged when a request does not say:
+                'vector' (vector only), 'rrf' (reciprocal rank fusion) or 'weighted'
+            fusion_vector_weight: Weight of the cosine score in 'weighted' fusion (BM25 gets the rest)
+            embedding_model: Already loaded embedding model to reuse instead of loading one
+            collection_name: ChromaDB collection to index into (defaults to COLLECTION_NAME)
+            known_embeddings: Embeddings from a previous build keyed by document hash (see
+                document_embeddings); only documents not found here are encoded
+            index_bundle_dir: Optional bundle written by build_index.py; its memory-mapped
+                embeddings are used as-is when they match the speaker documents
         """
+        if default_fusion not in self.FUSION_MODES:
+            raise ValueError(f"Unknown fusion mode '{default_fusion}', expected one of: {', '.join(self.FUSION_MODES)}")
         self.json_file_path = json_file_path
+        self.vector_db_path = vector_db_path
+        self.vector_backend = vector_backend
+        self.model_name = self.MODEL_NAME
+        self.embedding_backend = embedding_backend
+        self.onnx_model_dir = onnx_model_dir
+        # Cache keys and index versions are tied to the exact embedding function in use
+        self.embedding_fingerprint = embedding_fingerprint(embedding_backend, self.model_name, onnx_model_dir)
         self.speakers_data = None
-        self.embedding_model = None
-        self.vector_db = None
+        self.embedding_model = embedding_model
+        self.model_load_seconds = 0.0
+        self.collection_name = collection_name or self.COLLECTION_NAME
+        self.known_embeddings = known_embeddings or {}
+        self.index_bundle = self._load_index_bundle(index_bundle_dir) if index_bundle_dir else None
+        if self.index_bundle is not None:
+            self.known_embeddings = {**self.index_bundle.embeddings_by_hash(), **self.known_embeddings}
+        self.embedding_cache = EmbeddingCache(embedding_cache_dir, self.embedding_fingerprint) if embedding_cache_dir else None
+        self.query_cache = QueryEmbeddingCache(query_cache_size, query_cache_ttl)
+        self.vector_index = None
         self.speaker_documents = []
         self.speaker_metadata = []
+        self.speaker_embeddings = None
+        self.text_index = None
+        self.bm25_index = None
+        self.name_index = None
+        self.filter_index = None
+        self.contact_infos = []
+        self.session_details = []
+        self.payloads = None
+        self.default_fusion = default_fusion
+        self.fusion_vector_weight = fusion_vector_weight
+        self.index_version = None
         
         # Initialize components
         self._load_data()
@@ -37,7 +114,24 @@ class SpeakerRecommendationEngine:
         self._initialize_vector_database()
         self._create_speaker_documents()
         self._index_speakers()
+        self.text_index = SpeakerTextIndex(self.speakers_data['speakers'])
+        self.bm25_index = BM25Index(self.speaker_documents)
+        self.name_index = SpeakerNameIndex([speaker.get('name', '') for speaker in self.speakers_data['speakers']])
+        self._precompute_speaker_payloads()
         
+    def _load_index_bundle(self, bundle_dir: str) -> Optional[IndexBundle]:
+        """Open a prebuilt index bundle, ignoring one that is missing or built with another model."""
+        try:
+            bundle = IndexBundle(bundle_dir)
+        except Exception as e:
+            logger.warning(f"Not using index bundle {bundle_dir}: {e}")
+            return None
+        if bundle.embedding_fingerprint != self.embedding_fingerprint:
+            logger.warning(f"Not using index bundle {bundle.index_version}: built for "
+                           f"{bundle.embedding_fingerprint}, engine uses {self.embedding_fingerprint}")
+            return None
+        return bundle
+    
     def _load_data(self):
         """Load speaker data from JSON file."""
         try:
@@ -49,27 +143,29 @@ class SpeakerRecommendationEngine:
             raise
     
     def _initialize_embedding_model(self):
-        """Initialize the Sentence Transformers embedding model."""
+        """Initialize the embedding model on the configured backend."""
+        if self.embedding_model is not None:
+            logger.info(f"Reusing loaded embedding model: {self.model_name} ({self.embedding_backend})")
+            return
         try:
             # Use a lightweight, fast model that's free and open source
-            self.embedding_model = SentenceTransformer('all-MiniLM-L6-v2')
-            logger.info("Initialized embedding model: all-MiniLM-L6-v2")
+            started = time.perf_counter()
+            self.embedding_model = load_embedding_model(self.embedding_backend, self.model_name, self.onnx_model_dir)
+            self.model_load_seconds = time.perf_counter() - started
+            logger.info(f"Initialized embedding model: {self.model_name} ({self.embedding_backend})")
         except Exception as e:
             logger.error(f"Error initializing embedding model: {e}")
             raise
     
     def _initialize_vector_database(self):
-        """Initialize ChromaDB for vector storage."""
+        """Initialize the configured vector index backend."""
         try:
-            # Use in-memory ChromaDB for simplicity in prototype
-            self.vector_db = chromadb.Client()
-            
-            # Create collection for speakers
-            self.speaker_collection = self.vector_db.create_collection(
-                name="sof_week_speakers",
-                metadata={"description": "SOF Week 2025 Speaker Database"}
+            self.vector_index = create_vector_index(
+                self.vector_backend,
+                collection_name=self.collection_name,
+                vector_db_path=self.vector_db_path
             )
-            logger.info("Initialized ChromaDB vector database")
+            logger.info(f"Initialized {self.vector_backend} vector database")
         except Exception as e:
             logger.error(f"Error initializing vector database: {e}")
             raise
@@ -78,6 +174,8 @@ class SpeakerRecommendationEngine:
         """Create coherent text documents for each speaker suitable for embedding."""
         self.speaker_documents = []
         self.speaker_metadata = []
+        # Filterable fields (day, venue, company, has-bio) are parsed once here
+        self.filter_index = SpeakerFilterIndex(self.speakers_data['speakers'])
         
         for i, speaker in enumerate(self.speakers_data['speakers']):
             # Construct a comprehensive document for each speaker
@@ -112,122 +210,319 @@ class SpeakerRecommendationEngine:
             self.speaker_documents.append(document_text)
             self.speaker_metadata.append({
                 'speaker_index': str(i),
+                'document_hash': document_hash(self.embedding_fingerprint, document_text),
                 'has_detailed_bio': str(bool(speaker.get('detailed_bio') and speaker['detailed_bio'].strip())),
                 'speaker_name': speaker.get('name', ''),
                 'speaker_title': speaker.get('title', ''),
-                'speaker_company': speaker.get('company', '')
+                'speaker_company': speaker.get('company', ''),
+                'speaking_day': self.filter_index.fields[i]['day'],
+                'venue': self.filter_index.fields[i]['venue']
             })
         
-        logger.info(f"Created {len(self.speaker_documents)} speaker documents")
+        # Version the index by its content so replicas built from the same data agree
+        version_hash = hashlib.sha256(self.embedding_fingerprint.encode('utf-8'))
+        for metadata in self.speaker_metadata:
+            version_hash.update(metadata['document_hash'].encode('utf-8'))
+        self.index_version = version_hash.hexdigest()[:12]
+        
+        logger.info(f"Created {len(self.speaker_documents)} speaker documents (index version {self.index_version})")
+    
+    def _precompute_speaker_payloads(self):
+        """Build the speaker-only parts of recommendations once, as dicts and as JSON fragments."""
+        speakers = self.speakers_data['speakers']
+        self.contact_infos = [self._extract_contact_info(speaker) for speaker in speakers]
+        self.session_details = [
+            {
+                'title': speaker.get('session_title', ''),
+                'time': speaker.get('speaking_time', ''),
+                'location': speaker.get('location', ''),
+                'description': speaker.get('session_description', '')
+            }
+            for speaker in speakers
+        ]
+        self.payloads = SpeakerPayloads(speakers, self.contact_infos, self.session_details, self.index_version)
     
     def _index_speakers(self):
-        """Index all speaker documents in the vector database."""
+        """
+        Bring the vector index in line with the current speaker documents.
+        
+        Backends that persist their contents only embed new or changed documents;
+        embeddings for the rest come from the index or the embedding cache.
+        """
         try:
-            # Generate embeddings for all speaker documents
-            embeddings = self.embedding_model.encode(self.speaker_documents)
-            
-            # Add documents to ChromaDB
-            self.speaker_collection.add(
-                embeddings=embeddings.tolist(),
-                documents=self.speaker_documents,
-                metadatas=self.speaker_metadata,
-                ids=[f"speaker_{i}" for i in range(len(self.speaker_documents))]
+            ids = self._speaker_ids()
+            self.speaker_embeddings = self.vector_index.sync(
+                ids, self.speaker_documents, self.speaker_metadata, self._encode_documents
             )
-            
             logger.info(f"Indexed {len(self.speaker_documents)} speakers in vector database")
         except Exception as e:
             logger.error(f"Error indexing speakers: {e}")
             raise
     
-    def recommend_speakers(self, query: str, top_k: int = 5) -> List[Dict[str, Any]]:
+    def _speaker_ids(self) -> List[str]:
+        """
+        Stable vector index id per speaker, derived from its document hash.
+        
+        Ids do not depend on list position, so adding or removing a speaker leaves
+        every other speaker's id unchanged. Identical documents get a numbered suffix.
+        """
+        seen = defaultdict(int)
+        ids = []
+        for metadata in self.speaker_metadata:
+            digest = metadata['document_hash'][:32]
+            ids.append(f"speaker_{digest}" if not seen[digest] else f"speaker_{digest}_{seen[digest]}")
+            seen[digest] += 1
+        return ids
+    
+    def _encode_documents(self, documents: List[str]) -> np.ndarray:
+        """Embed documents, reusing known embeddings and then the persistent cache when configured."""
+        if not documents:
+            return np.zeros((0, 0), dtype=np.float32)
+        
+        if self.index_bundle is not None and len(documents) == len(self.speaker_documents) and \
+                self.index_bundle.document_hashes == [metadata['document_hash'] for metadata in self.speaker_metadata]:
+            # The bundle matches the data file: serve its mapped embeddings without copying
+            logger.info(f"Using embeddings from index bundle {self.index_bundle.index_version}")
+            return self.index_bundle.embeddings
+        
+        if self.known_embeddings:
+            keys = [document_hash(self.embedding_fingerprint, document) for document in documents]
+            missing = [i for i, key in enumerate(keys) if key not in self.known_embeddings]
+            if len(missing) < len(documents):
+                logger.info(f"Reusing {len(documents) - len(missing)} known embeddings (previous index or bundle), "
+                            f"encoding {len(missing)}")
+                dimension = len(next(iter(self.known_embeddings.values())))
+                embeddings = np.zeros((len(documents), dimension), dtype=np.float32)
+                for i, key in enumerate(keys):
+                    if key in self.known_embeddings:
+                        embeddings[i] = self.known_embeddings[key]
+                if missing:
+                    embeddings[missing] = self._encode_new_documents([documents[i] for i in missing])
+                return embeddings
+        return self._encode_new_documents(documents)
+    
+    def _encode_new_documents(self, documents: List[str]) -> np.ndarray:
+        """Embed documents, going through the persistent embedding cache when configured."""
+        if self.embedding_cache is None:
+            return np.asarray(self.embedding_model.encode(documents), dtype=np.float32)
+        
+        embeddings = self.embedding_cache.encode(self.embedding_model, documents)
+        try:
+            self.embedding_cache.save()
+        except Exception as e:
+            # A read-only cache directory should not prevent the engine from starting
+            logger.warning(f"Could not save embedding cache: {e}")
+        return embeddings
+    
+    def document_embeddings(self) -> Dict[str, np.ndarray]:
+        """Embeddings of the indexed documents keyed by document hash, for seeding a rebuild."""
+        return {
+            metadata['document_hash']: self.speaker_embeddings[i]
+            for i, metadata in enumerate(self.speaker_metadata)
+        }
+    
+    def recommend_speakers(self, query: str, top_k: int = 5, fusion: Optional[str] = None,
+                           filters: Optional[Dict[str, Any]] = None) -> List[Dict[str, Any]]:
         """
         Recommend speakers based on a natural language query.
         
         Args:
             query: Natural language query (e.g., "I'm a drone contractor, find me contacts that have experience in that field")
             top_k: Number of top recommendations to return
+            fusion: 'vector', 'rrf' or 'weighted'; defaults to the engine's default_fusion
+            filters: Optional day, location, company and has_bio filters applied inside the search
             
         Returns:
             List of recommended speakers with relevance scores and explanations
         """
-        try:
-            # Generate embedding for the query
-            query_embedding = self.embedding_model.encode([query])
+        return self.recommend_speakers_batch([query], [top_k], [fusion], [filters])[0]
+    
+    def recommend_speakers_batch(self, queries: List[str], top_ks: List[int],
+                                 fusions: Optional[List[Optional[str]]] = None,
+                                 filters: Optional[List[Optional[Dict[str, Any]]]] = None) -> List[List[Dict[str, Any]]]:
+        """
+        Recommend speakers for several queries with one encode call and one vector search.
+        
+        Args:
+            queries: Natural language queries
+            top_ks: Number of recommendations to return for each query
+            fusions: Optional fusion mode per query (None uses the engine default)
+            filters: Optional filter dict per query (see SpeakerFilterIndex.mask)
             
-            # Search for similar speakers
-            results = self.speaker_collection.query(
-                query_embeddings=query_embedding.tolist(),
-                n_results=top_k,
-                include=['documents', 'metadatas', 'distances']
-            )
+        Returns:
+            One list of recommendations per query, in the order the queries were given
+        """
+        ranked_batch = self.rank_speakers_batch(queries, top_ks, fusions, filters)
+        try:
+            with STAGE_SECONDS.time(stage='format'):
+                results = [list(self.format_recommendations(query, ranked)) for query, ranked in zip(queries, ranked_batch)]
+            if len(queries) == 1:
+                logger.info(f"Generated {len(results[0])} recommendations for query: '{queries[0]}'")
+            elif queries:
+                logger.info(f"Generated recommendations for a batch of {len(queries)} queries")
+            return results
             
-            # Process and format results
-            recommendations = []
-            for i in range(len(results['ids'][0])):
-                speaker_idx = int(results['metadatas'][0][i]['speaker_index'])
-                speaker_data = self.speakers_data['speakers'][speaker_idx]
-                distance = results['distances'][0][i]
-                document = results['documents'][0][i]
-                
-                # Convert distance to similarity score (0-1, higher is better)
-                # ChromaDB returns distances, so we need to handle them properly
-                if distance < 0:
-                    # If distance is negative, it's likely a similarity score already
-                    similarity_score = abs(distance)
-                else:
-                    # Convert distance to similarity (assuming max distance is around 2.0)
-                    similarity_score = max(0, 1 - (distance / 2.0))
-                
-                # Calculate relevance explanation
-                explanation = self._generate_relevance_explanation(query, speaker_data, similarity_score)
-                
-                recommendation = {
-                    'speaker': speaker_data,
-                    'relevance_score': round(similarity_score, 3),
-                    'explanation': explanation,
-                    'contact_info': self._extract_contact_info(speaker_data),
-                    'session_details': {
-                        'title': speaker_data.get('session_title', ''),
-                        'time': speaker_data.get('speaking_time', ''),
-                        'location': speaker_data.get('location', ''),
-                        'description': speaker_data.get('session_description', '')
-                    }
-                }
-                
-                recommendations.append(recommendation)
+        except Exception as e:
+            logger.error(f"Error generating recommendations: {e}")
+            raise
+    
+    def rank_speakers_batch(self, queries: List[str], top_ks: List[int],
+                            fusions: Optional[List[Optional[str]]] = None,
+                            filters: Optional[List[Optional[Dict[str, Any]]]] = None) -> List[List[tuple]]:
+        """
+        Rank speakers for several queries without formatting the results.
+        
+        Takes the same arguments as recommend_speakers_batch. Pair with
+        format_recommendations to build results one at a time, e.g. for streaming.
+        
+        Returns:
+            One list of (speaker_index, vector_score, bm25_score, fused_score) tuples per query, best first
+        """
+        fusions = [fusion or self.default_fusion for fusion in (fusions or [None] * len(queries))]
+        filters = filters or [None] * len(queries)
+        if not len(queries) == len(top_ks) == len(fusions) == len(filters):
+            raise ValueError("queries, top_ks, fusions and filters must have the same length")
+        for fusion in fusions:
+            if fusion not in self.FUSION_MODES:
+                raise ValueError(f"Unknown fusion mode '{fusion}', expected one of: {', '.join(self.FUSION_MODES)}")
+        if not queries:
+            return []
+        
+        # Precomputed filter masks are pushed into both retrievers
+        masks = [self.filter_index.mask(query_filters) for query_filters in filters]
+        
+        try:
+            # Generate embeddings for all queries at once (repeated queries come from the LRU)
+            with STAGE_SECONDS.time(stage='query_encode'):
+                query_embeddings = self._encode_queries(queries)
             
-            # Sort by relevance score (highest first)
-            recommendations.sort(key=lambda x: x['relevance_score'], reverse=True)
+            # Search for similar speakers; backends return exact cosine similarities.
+            # Hybrid modes draw a deeper candidate list to fuse with the BM25 results.
+            candidate_ks = [
+                top_k if fusion == 'vector' else top_k * self.CANDIDATE_MULTIPLIER
+                for top_k, fusion in zip(top_ks, fusions)
+            ]
+            with STAGE_SECONDS.time(stage='vector_search'):
+                all_hits = self.vector_index.query(query_embeddings, max(candidate_ks), masks)
             
-            logger.info(f"Generated {len(recommendations)} recommendations for query: '{query}'")
-            return recommendations
+            # BM25 scoring and fusion
+            with STAGE_SECONDS.time(stage='rank'):
+                return [
+                    self._rank_candidates(
+                        query, query_embeddings[q:q + 1], all_hits[q][:candidate_ks[q]], fusion, top_k, candidate_ks[q], masks[q]
+                    )
+                    for q, (query, top_k, fusion) in enumerate(zip(queries, top_ks, fusions))
+                ]
             
         except Exception as e:
-            logger.error(f"Error generating recommendations: {e}")
+            logger.error(f"Error ranking speakers: {e}")
             raise
     
-    def _generate_relevance_explanation(self, query: str, speaker_data: Dict, similarity_score: float) -> str:
-        """Generate a human-readable explanation of why a speaker is relevant."""
-        query_lower = query.lower()
-        speaker_text = f"{speaker_data.get('name', '')} {speaker_data.get('title', '')} {speaker_data.get('company', '')} {speaker_data.get('session_title', '')} {speaker_data.get('detailed_bio', '')}".lower()
+    def format_recommendations(self, query: str, ranked: List[tuple]) -> Iterator[Dict[str, Any]]:
+        """Lazily build recommendation dicts for ranked candidates of query, best first."""
+        query_terms = self.text_index.query_terms(query)
+        for candidate in ranked:
+            yield self._format_recommendation(query_terms, *candidate)
+    
+    def _rank_candidates(self, query: str, query_embedding: np.ndarray, vector_hits: List[tuple],
+                         fusion: str, top_k: int, candidate_k: int, mask: Optional[np.ndarray] = None) -> List[tuple]:
+        """
+        Merge vector and BM25 results for one query.
         
-        # Identify key matching areas
-        matches = []
+        Returns:
+            Up to top_k (speaker_index, vector_score, bm25_score, fused_score) tuples, best first
+        """
+        bm25_scores = self.bm25_index.scores(query)
+        if mask is not None:
+            bm25_scores[~mask] = 0.0
+        if fusion == 'vector':
+            return [(i, score, float(bm25_scores[i]), score) for i, score in vector_hits[:top_k]]
+        
+        lexical_hits = self.bm25_index.top(bm25_scores, candidate_k)
+        vector_scores = dict(vector_hits)
+        lexical_only = [i for i, _ in lexical_hits if i not in vector_scores]
+        if lexical_only:
+            # Exact cosine for candidates the vector search did not return
+            similarities = self.vector_index.similarity(query_embedding, lexical_only)[0]
+            vector_scores.update(zip(lexical_only, (float(similarity) for similarity in similarities)))
+        candidates = list(dict.fromkeys([i for i, _ in vector_hits] + [i for i, _ in lexical_hits]))
+        
+        if fusion == 'rrf':
+            fused = dict.fromkeys(candidates, 0.0)
+            for hits in (vector_hits, lexical_hits):
+                for rank, (i, _) in enumerate(hits, start=1):
+                    fused[i] += 1.0 / (self.RRF_K + rank)
+        else:
+            # Weighted: cosine blended with BM25 scaled to [0, 1] by the best candidate
+            max_bm25 = max((float(bm25_scores[i]) for i in candidates), default=0.0)
+            fused = {
+                i: self.fusion_vector_weight * vector_scores[i]
+                + (1 - self.fusion_vector_weight) * (float(bm25_scores[i]) / max_bm25 if max_bm25 > 0 else 0.0)
+                for i in candidates
+            }
         
-        if speaker_data.get('name') and any(word in speaker_data['name'].lower() for word in query_lower.split()):
-            matches.append("name")
+        ranked = sorted(candidates, key=lambda i: (-fused[i], i))[:top_k]
+        return [(i, vector_scores[i], float(bm25_scores[i]), fused[i]) for i in ranked]
+    
+    def _format_recommendation(self, query_terms: set, speaker_idx: int, similarity_score: float,
+                               bm25_score: float, fused_score: float) -> Dict[str, Any]:
+        """Build the recommendation dict for one search hit."""
+        speaker_data = self.speakers_data['speakers'][speaker_idx]
         
-        if speaker_data.get('title') and any(word in speaker_data['title'].lower() for word in query_lower.split()):
-            matches.append("professional title")
+        # Look up where the query terms occur and explain the match
+        matches = self.text_index.field_matches(query_terms, speaker_idx)
+        explanation = self._generate_relevance_explanation(list(matches), similarity_score)
+        # Bio matches still count toward the explanation, but the response has no bio to highlight
+        highlights = {field: spans for field, spans in matches.items() if field in HIGHLIGHT_FIELDS}
         
-        if speaker_data.get('company') and any(word in speaker_data['company'].lower() for word in query_lower.split()):
-            matches.append("company")
+        return {
+            'speaker': speaker_data,
+            'speaker_index': speaker_idx,
+            'relevance_score': round(similarity_score, 3),
+            'vector_score': round(similarity_score, 4),
+            'bm25_score': round(bm25_score, 4),
+            'fused_score': round(fused_score, 4),
+            'explanation': explanation,
+            'highlights': highlights,
+            'contact_info': self.contact_infos[speaker_idx],
+            'session_details': self.session_details[speaker_idx]
+        }
+    
+    def _encode_queries(self, queries: List[str]) -> np.ndarray:
+        """Embed queries, serving repeats from the query LRU and encoding the rest in one call."""
+        keys = [normalize_query(query) for query in queries]
+        vectors = [self.query_cache.get(key) for key in keys]
         
-        if speaker_data.get('session_title') and any(word in speaker_data['session_title'].lower() for word in query_lower.split()):
-            matches.append("session topic")
+        missing_keys = list(dict.fromkeys(key for key, vector in zip(keys, vectors) if vector is None))
+        if missing_keys:
+            encoded = np.asarray(self.embedding_model.encode(missing_keys), dtype=np.float32)
+            encoded_by_key = dict(zip(missing_keys, encoded))
+            for key, vector in encoded_by_key.items():
+                self.query_cache.put(key, vector)
+            vectors = [encoded_by_key[key] if vector is None else vector for key, vector in zip(keys, vectors)]
         
-        if speaker_data.get('detailed_bio') and any(word in speaker_data['detailed_bio'].lower() for word in query_lower.split()):
-            matches.append("professional background")
+        return np.stack(vectors)
+    
+    def get_cache_stats(self) -> Dict[str, Any]:
+        """Counters for the query embedding LRU and the document embedding cache."""
+        stats = {'query_cache': self.query_cache.stats()}
+        if self.embedding_cache is not None:
+            stats['document_cache'] = {
+                'hits': self.embedding_cache.hits,
+                'misses': self.embedding_cache.misses
+            }
+        return stats
+    
+    def _generate_relevance_explanation(self, matched_fields: List[str], similarity_score: float) -> str:
+        """
+        Generate a human-readable explanation of why a speaker is relevant.
+        
+        Args:
+            matched_fields: Speaker fields containing query terms, as returned by the text index
+            similarity_score: Cosine similarity between query and speaker document
+        """
+        # Identify key matching areas
+        matches = [INDEXED_FIELDS[field] for field in matched_fields]
         
         # Generate explanation
         if matches:
@@ -268,25 +563,33 @@ class SpeakerRecommendationEngine:
         return contact_info
     
     def get_speaker_by_name(self, name: str) -> Optional[Dict[str, Any]]:
-        """Get a specific speaker by name."""
-        for speaker in self.speakers_data['speakers']:
-            if speaker['name'].lower() == name.lower():
-                return speaker
-        return None
+        """Get a specific speaker by name, ignoring case, punctuation, ranks and honorifics."""
+        matches = self.name_index.get(name)
+        return self.speakers_data['speakers'][matches[0]] if matches else None
+    
+    def find_speakers_by_name(self, name: str, limit: int = 5) -> List[Dict[str, Any]]:
+        """
+        Rank speakers by name similarity, tolerating typos and partial names.
+        
+        Returns:
+            Up to limit dicts with 'speaker' and 'score' (1.0 for an exact normalized match)
+        """
+        speakers = self.speakers_data['speakers']
+        return [
+            {'speaker': speakers[speaker_index], 'score': round(score, 3)}
+            for speaker_index, score in self.name_index.search(name, limit)
+        ]
+    
+    @property
+    def speaker_count(self) -> int:
+        """Number of speakers in the loaded data."""
+        return len(self.speakers_data['speakers'])
     
     def get_all_speakers(self) -> List[Dict[str, Any]]:
         """Get all speakers in the database."""
         return self.speakers_data['speakers']
     
     def search_speakers_by_keyword(self, keyword: str) -> List[Dict[str, Any]]:
-        """Search speakers by keyword in their data."""
-        keyword_lower = keyword.lower()
-        matches = []
-        
-        for speaker in self.speakers_data['speakers']:
-            speaker_text = f"{speaker.get('name', '')} {speaker.get('title', '')} {speaker.get('company', '')} {speaker.get('session_title', '')} {speaker.get('detailed_bio', '')}".lower()
-            
-            if keyword_lower in speaker_text:
-                matches.append(speaker)
-        
-        return matches
+        """Search speakers by keyword (word prefix or phrase) in their data."""
+        speakers = self.speakers_data['speakers']
+        return [speakers[i] for i in self.text_index.search(keyword)]
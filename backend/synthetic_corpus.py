@@ -0,0 +1,77 @@
+"""
+Deterministic synthetic speaker data in the shape of sof_week_speakers_complete.json,
+for benchmarks and load tests at scales the real 44-speaker corpus cannot reach.
+"""
+
+import json
+import random
+from typing import Any, Dict, List
+
+RANKS = ['Mr.', 'Ms.', 'Dr.', 'Colonel', 'Lieutenant Colonel', 'Major General', 'Admiral (Ret.)',
+         'Command Sergeant Major', 'The Honorable', 'Captain']
+FIRST_NAMES = ['James', 'Maria', 'Robert', 'Linda', 'Michael', 'Patricia', 'David', 'Jennifer', 'Carlos',
+               'Aisha', 'Wei', 'Olga', 'Thomas', 'Sarah', 'Daniel', 'Nadia', 'Kevin', 'Grace', 'Ahmed', 'Emily']
+LAST_NAMES = ['Smith', 'Garcia', 'Johnson', 'Nguyen', 'Brown', 'Okafor', 'Miller', 'Kowalski', 'Davis',
+              'Hernandez', 'Chen', 'Wilson', 'Patel', 'Anderson', 'Murphy', 'Rossi', 'Tanaka', 'Clark']
+TITLES = ['Director', 'Program Manager', 'Chief Technology Officer', 'Commander', 'Senior Fellow',
+          'Vice President', 'Founder and CEO', 'Deputy Director', 'Principal Engineer', 'Chief of Staff']
+COMPANIES = ['USSOCOM', 'Anduril Industries', 'Shield AI', 'Lockheed Martin', 'SOFWERX', 'Palantir',
+             'The Honor Foundation', 'Booz Allen Hamilton', 'Naval Special Warfare Command',
+             'Army Special Operations Command', 'General Atomics', 'L3Harris', 'Red Cell Partners']
+TOPICS = ['unmanned aerial systems', 'counter-UAS', 'drone swarms', 'cyber operations', 'artificial intelligence',
+          'machine learning', 'logistics', 'acquisition reform', 'veteran transition', 'irregular warfare',
+          'space capabilities', 'information operations', 'medical innovation', 'human performance',
+          'electronic warfare', 'maritime operations', 'special reconnaissance', 'autonomy', 'data analytics',
+          'small business innovation']
+FILLER = ['leads', 'teams', 'across', 'the', 'joint', 'force', 'with', 'experience', 'in', 'operations',
+          'programs', 'partners', 'mission', 'support', 'capabilities', 'deployed', 'units', 'strategy',
+          'technology', 'development', 'industry', 'government', 'research', 'field', 'commands', 'years']
+VENUES = ['Tampa Convention Center: Room {}', 'JW Marriott: Tampa Bay Ballroom {}',
+          'Marriott Water Street: Florida Salon {}']
+
+
+def _sentence(rng: random.Random, topic: str) -> str:
+    words = rng.choices(FILLER, k=rng.randint(8, 18))
+    words.insert(rng.randrange(len(words) + 1), topic)
+    return ' '.join(words).capitalize() + '.'
+
+
+def synthetic_speaker(rng: random.Random, index: int) -> Dict[str, Any]:
+    topics = rng.sample(TOPICS, 3)
+    first, last = rng.choice(FIRST_NAMES), rng.choice(LAST_NAMES)
+    company = rng.choice(COMPANIES)
+    has_bio = rng.random() < 0.7
+    start_hour = rng.randint(8, 16)
+    return {
+        'name': f"{rng.choice(RANKS)} {first} {last} {index}",
+        'title': rng.choice(TITLES),
+        'company': company,
+        'image_url': f"https://example.com/speakers/{index}.png",
+        'detailed_bio': ' '.join(_sentence(rng, rng.choice(topics)) for _ in range(rng.randint(3, 8))) +
+                        f" Contact {first.lower()}.{last.lower()}{index}@example.com." if has_bio else '',
+        'extraction_method': 'synthetic',
+        'session_title': f"{topics[0].title()} and {topics[1].title()} Panel",
+        'speaking_time': f"{start_hour % 12 or 12}:{rng.choice(['00', '30'])} "
+                         f"{'AM' if start_hour < 12 else 'PM'}-{(start_hour + 1) % 12 or 12}:00 "
+                         f"{'AM' if start_hour + 1 < 12 else 'PM'}",
+        'location': rng.choice(VENUES).format(rng.randint(100, 130)),
+        'session_description': ' '.join(_sentence(rng, topic) for topic in topics),
+    }
+
+
+def synthetic_speakers(count: int, seed: int = 0) -> List[Dict[str, Any]]:
+    """count synthetic speaker records; the same count and seed always give the same records."""
+    rng = random.Random(seed)
+    return [synthetic_speaker(rng, index) for index in range(count)]
+
+
+def write_synthetic_data_file(path: str, count: int, seed: int = 0):
+    """Write a data file loadable by SpeakerRecommendationEngine."""
+    speakers = synthetic_speakers(count, seed)
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump({
+            'description': f"Synthetic speaker corpus ({count} speakers, seed {seed})",
+            'total_speakers': count,
+            'speakers_with_detailed_bios': sum(1 for speaker in speakers if speaker['detailed_bio']),
+            'speakers': speakers
+        }, f)
@@ -0,0 +1,33 @@
+import asyncio
+
+import pytest
+
+from batching import RecommendationBatcher
+
+
+def run_batch(requests):
+    if any(request < 0 for request in requests):
+        raise ValueError("negative request")
+    return [request * 10 for request in requests]
+
+
+async def submit_together(batcher, requests):
+    await batcher.start()
+    try:
+        return await asyncio.gather(*(batcher.submit(request) for request in requests), return_exceptions=True)
+    finally:
+        await batcher.stop()
+
+
+def test_failing_request_only_fails_its_own_caller():
+    batcher = RecommendationBatcher(run_batch, max_wait_ms=50)
+    results = asyncio.run(submit_together(batcher, [1, -2, 3]))
+
+    assert results[0] == 10 and results[2] == 30
+    assert isinstance(results[1], ValueError)
+    assert batcher.batches == 1 and batcher.errors == 1
+
+
+def test_single_request_failure_is_raised():
+    results = asyncio.run(submit_together(RecommendationBatcher(run_batch, max_wait_ms=1), [-1]))
+    assert isinstance(results[0], ValueError)
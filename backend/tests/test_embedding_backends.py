@@ -0,0 +1,57 @@
+import hashlib
+import os
+
+import numpy as np
+import pytest
+
+from embedding_backends import OnnxEmbeddingModel, SentenceTransformer, embedding_fingerprint, onnxruntime
+from speaker_recommendation_engine import SpeakerRecommendationEngine
+
+# Directory written by `python export_onnx.py --output-dir ../models/minilm-onnx --quantize`
+ONNX_MODEL_DIR = os.environ.get('SPEAKER_ONNX_MODEL_DIR') or os.path.join(
+    os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))), 'models', 'minilm-onnx')
+# Minimum cosine between PyTorch and ONNX embeddings, per exported file (as in export_onnx.py)
+ONNX_TOLERANCES = {'model.onnx': 0.9999, 'model_quantized.onnx': 0.98}
+
+
+def test_onnx_fingerprint_requires_model_dir():
+    with pytest.raises(ValueError, match="onnx_model_dir"):
+        embedding_fingerprint('onnx', SpeakerRecommendationEngine.MODEL_NAME)
+
+
+def test_engine_rejects_onnx_backend_without_model_dir(tmp_path):
+    with pytest.raises(ValueError, match="onnx_model_dir"):
+        SpeakerRecommendationEngine(str(tmp_path / 'speakers.json'), embedding_backend='onnx')
+
+
+def test_onnx_fingerprint_names_model_file(tmp_path):
+    (tmp_path / 'model_quantized.onnx').write_bytes(b'')
+    digest = hashlib.sha256(b'').hexdigest()[:16]
+    assert embedding_fingerprint('onnx', 'model', str(tmp_path)) == f'model:onnx:model_quantized.onnx:{digest}'
+
+
+def test_onnx_fingerprint_tells_same_named_exports_apart(tmp_path):
+    first, second = tmp_path / 'first', tmp_path / 'second'
+    for model_dir, content in ((first, b'export one'), (second, b'export two')):
+        model_dir.mkdir()
+        (model_dir / 'model.onnx').write_bytes(content)
+    assert embedding_fingerprint('onnx', 'model', str(first)) != embedding_fingerprint('onnx', 'model', str(second))
+
+
+@pytest.mark.skipif(onnxruntime is None or SentenceTransformer is None,
+                    reason="onnxruntime and sentence_transformers are required")
+@pytest.mark.parametrize('file_name', sorted(ONNX_TOLERANCES))
+def test_onnx_embeddings_match_pytorch(file_name):
+    from export_onnx import DEFAULT_DATA_FILE, MODEL_NAME, load_texts
+
+    model_file = os.path.join(ONNX_MODEL_DIR, file_name)
+    if not os.path.exists(model_file):
+        pytest.skip(f"{model_file} not exported; run export_onnx.py or set SPEAKER_ONNX_MODEL_DIR")
+
+    texts = load_texts(DEFAULT_DATA_FILE)
+    torch_embeddings = np.asarray(SentenceTransformer(MODEL_NAME).encode(texts), dtype=np.float32)
+    onnx_embeddings = OnnxEmbeddingModel(ONNX_MODEL_DIR, model_file=model_file).encode(texts)
+    cosine = np.sum(torch_embeddings * onnx_embeddings, axis=1) / (
+        np.linalg.norm(torch_embeddings, axis=1) * np.linalg.norm(onnx_embeddings, axis=1)
+    )
+    assert cosine.min() >= ONNX_TOLERANCES[file_name]
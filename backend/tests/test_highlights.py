@@ -0,0 +1,21 @@
+import os
+
+from speaker_recommendation_engine import SpeakerRecommendationEngine
+from text_index import HIGHLIGHT_FIELDS
+
+DATA_FILE = os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))),
+                         'data', 'sof_week_speakers_complete.json')
+
+
+def test_highlights_cover_only_serialized_fields():
+    engine = SpeakerRecommendationEngine(DATA_FILE, vector_backend='numpy', embedding_backend='hash')
+    query = "drone unmanned systems experience"
+    ranked = engine.rank_speakers_batch([query], [len(engine.speakers_data['speakers'])])[0]
+    recommendations = list(engine.format_recommendations(query, ranked))
+
+    assert any('professional background' in rec['explanation'] for rec in recommendations)
+    for rec in recommendations:
+        assert set(rec['highlights']) <= set(HIGHLIGHT_FIELDS)
+        for field, spans in rec['highlights'].items():
+            text = rec['speaker'][field]
+            assert all(0 <= start < end <= len(text) for start, end in spans)
@@ -0,0 +1,50 @@
+import json
+
+import pytest
+
+from speaker_recommendation_engine import SpeakerRecommendationEngine
+from synthetic_corpus import synthetic_speakers
+from vector_index import chromadb
+
+pytestmark = pytest.mark.skipif(chromadb is None, reason="chromadb is not installed")
+
+
+@pytest.fixture
+def encoded(monkeypatch):
+    """Number of documents each engine build embeds"""
+    counts = []
+    original = SpeakerRecommendationEngine._encode_documents
+
+    def count_encoded(self, documents):
+        counts.append(len(documents))
+        return original(self, documents)
+
+    monkeypatch.setattr(SpeakerRecommendationEngine, '_encode_documents', count_encoded)
+    return counts
+
+
+def build_engine(data_file, vector_db_path):
+    return SpeakerRecommendationEngine(str(data_file), vector_db_path=str(vector_db_path), vector_backend='chroma',
+                                       embedding_backend='hash', collection_name='incremental_test')
+
+
+def test_removing_a_speaker_reencodes_only_changed_documents(tmp_path, encoded):
+    speakers = synthetic_speakers(40, seed=3)
+    data_file = tmp_path / 'speakers.json'
+    data_file.write_text(json.dumps({'speakers': speakers}), encoding='utf-8')
+    build_engine(data_file, tmp_path / 'db')
+    assert sum(encoded) == 40
+
+    # Dropping an early speaker shifts every later position, but no document changed
+    del speakers[1]
+    speakers[5] = {**speakers[5], 'title': 'Chief Scientist'}
+    data_file.write_text(json.dumps({'speakers': speakers}), encoding='utf-8')
+    encoded.clear()
+    engine = build_engine(data_file, tmp_path / 'db')
+    assert sum(encoded) == 1
+    assert engine.vector_index.collection.count() == 39
+
+    # Results still map to the right speakers after the shift
+    query = engine.speaker_documents[20]
+    hits = engine.vector_index.query(engine._encode_queries([query]), 1)
+    assert hits[0][0][0] == 20
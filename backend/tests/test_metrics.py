@@ -0,0 +1,56 @@
+import pytest
+from fastapi.testclient import TestClient
+
+import metrics
+import server
+
+
+def sample(name, **labels):
+    """Current value of one labelled sample in the /metrics exposition, or 0.0"""
+    label_text = ','.join(f'{key}="{value}"' for key, value in labels.items())
+    prefix = f"{name}{{{label_text}}} " if labels else f"{name} "
+    for line in metrics.REGISTRY.render().splitlines():
+        if line.startswith(prefix):
+            return float(line[len(prefix):])
+    return 0.0
+
+
+class FailingEngine:
+    def find_speakers_by_name(self, name, limit):
+        raise RuntimeError("index corrupted")
+
+
+def test_unhandled_errors_are_counted(monkeypatch):
+    monkeypatch.setattr(server, 'engine', FailingEngine())
+    labels = {'endpoint': '/speakers/by-name', 'status': '500'}
+    requests_before = sample('speaker_requests_total', **labels)
+    errors_before = sample('speaker_request_errors_total', **labels)
+
+    client = TestClient(server.app, raise_server_exceptions=False)
+    assert client.get('/speakers/by-name', params={'name': 'Smith'}).status_code == 500
+
+    assert sample('speaker_requests_total', **labels) == requests_before + 1
+    assert sample('speaker_request_errors_total', **labels) == errors_before + 1
+
+
+def test_rebuilt_engine_keeps_model_load_time(monkeypatch):
+    class Current:
+        embedding_model = object()
+        model_load_seconds = 4.2
+
+        def document_embeddings(self):
+            return {}
+
+    class Rebuilt:
+        model_load_seconds = 0.0
+
+    monkeypatch.setattr(server, 'build_engine', lambda **overrides: Rebuilt())
+    assert server.rebuild_engine(Current(), 1).model_load_seconds == 4.2
+
+
+def test_metric_subclasses_must_render_samples():
+    class Incomplete(metrics._Metric):
+        pass
+
+    with pytest.raises(TypeError):
+        Incomplete('incomplete_metric', 'Never registered', registry=metrics.MetricsRegistry())
@@ -0,0 +1,13 @@
+import pytest
+from fastapi.testclient import TestClient
+
+import server
+
+
+@pytest.mark.parametrize('top_k', [-1, 0, server.MAX_TOP_K + 1])
+def test_out_of_range_top_k_is_rejected(top_k):
+    client = TestClient(server.app)
+    request = {'query': 'drones', 'top_k': top_k}
+    assert client.post('/recommend', json=request).status_code == 422
+    assert client.post('/recommend/stream', json=request).status_code == 422
+    assert client.post('/recommend/batch', json={'requests': [request]}).status_code == 422
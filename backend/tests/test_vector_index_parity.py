@@ -0,0 +1,61 @@
+import uuid
+
+import numpy as np
+import pytest
+
+from embedding_backends import HashingEmbeddingModel
+from synthetic_corpus import TOPICS, synthetic_speakers
+from vector_index import ChromaVectorIndex, NumpyVectorIndex, chromadb
+
+pytestmark = pytest.mark.skipif(chromadb is None, reason="chromadb is not installed")
+
+QUERIES = TOPICS + ['cyber defense', 'drone swarm countermeasures', 'veteran careers', 'space', 'medical']
+TOP_K = 10
+
+
+def build_indexes(count):
+    model = HashingEmbeddingModel()
+    speakers = synthetic_speakers(count, seed=0)
+    documents = [
+        f"{s['name']} | {s['title']} | {s['company']} | {s['session_title']} | "
+        f"{s['session_description']} | {s['detailed_bio']}"
+        for s in speakers
+    ]
+    ids = [f"speaker_{i}" for i in range(count)]
+    metadatas = [{'speaker_index': str(i)} for i in range(count)]
+    chroma = ChromaVectorIndex(f"parity_{uuid.uuid4().hex[:8]}")
+    chroma.sync(ids, documents, metadatas, model.encode)
+    exact = NumpyVectorIndex()
+    exact.sync(ids, documents, metadatas, model.encode)
+    return chroma, exact, model.encode(QUERIES)
+
+
+def test_small_corpus_matches_exact_search():
+    chroma, exact, queries = build_indexes(300)
+    masks = [None] * len(queries)
+    masks[0] = np.arange(300) % 3 == 0
+    for chroma_hits, exact_hits in zip(chroma.query(queries, TOP_K, masks), exact.query(queries, TOP_K, masks)):
+        assert [i for i, _ in chroma_hits] == [i for i, _ in exact_hits]
+        assert [score for _, score in chroma_hits] == pytest.approx([score for _, score in exact_hits], abs=1e-5)
+
+
+def test_large_corpus_is_approximate_with_high_recall():
+    # HNSW is approximate: at this scale Chroma may miss some true neighbours, but the
+    # scores it reports must be exact and most of the exact top_k must be found
+    chroma, exact, queries = build_indexes(20000)
+    chroma_results = chroma.query(queries, TOP_K)
+    exact_results = exact.query(queries, TOP_K)
+
+    found = 0
+    for q, (chroma_hits, exact_hits) in enumerate(zip(chroma_results, exact_results)):
+        assert len(chroma_hits) == TOP_K
+        indices = [i for i, _ in chroma_hits]
+        scores = [score for _, score in chroma_hits]
+        assert scores == sorted(scores, reverse=True)
+        assert scores == pytest.approx(list(exact.similarity(queries[q:q + 1], indices)[0]), abs=1e-5)
+        # An approximate hit can never outscore the exact one at the same rank
+        assert all(c <= e + 1e-5 for c, (_, e) in zip(scores, exact_hits))
+        found += len(set(indices) & {i for i, _ in exact_hits})
+
+    recall = found / (TOP_K * len(queries))
+    assert recall >= 0.9
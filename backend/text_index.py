@@ -0,0 +1,119 @@
+import bisect
+import logging
+import re
+from collections import defaultdict
+from typing import Dict, List, Set, Tuple
+
+logger = logging.getLogger(__name__)
+
+TOKEN_PATTERN = re.compile(r'\w+')
+
+# Speaker fields covered by the index, with the label used in relevance explanations
+INDEXED_FIELDS = {
+    'name': 'name',
+    'title': 'professional title',
+    'company': 'company',
+    'session_title': 'session topic',
+    'detailed_bio': 'professional background',
+}
+
+# Indexed fields whose text a SpeakerResponse includes (session_title as session_details.title);
+# highlight spans are returned only for these
+HIGHLIGHT_FIELDS = ('name', 'title', 'company', 'session_title')
+
+# (token position, start offset, end offset) of one occurrence within a field
+Occurrence = Tuple[int, int, int]
+
+
+def tokenize(text: str) -> List[Tuple[str, int, int]]:
+    """Split text into lowercased word tokens with their character spans."""
+    return [(match.group().lower(), match.start(), match.end()) for match in TOKEN_PATTERN.finditer(text or '')]
+
+
+class SpeakerTextIndex:
+    """
+    Inverted token index over the text fields of every speaker, built once at load time.
+
+    postings[term][field][speaker_index] lists the occurrences of term in that field.
+    Query words match indexed terms by prefix ("drone" matches "drones"), found through
+    a sorted vocabulary, so lookups never rescan speaker text.
+    """
+
+    def __init__(self, speakers: List[Dict]):
+        self.postings: Dict[str, Dict[str, Dict[int, List[Occurrence]]]] = defaultdict(lambda: defaultdict(dict))
+        for speaker_index, speaker in enumerate(speakers):
+            for field in INDEXED_FIELDS:
+                for position, (term, start, end) in enumerate(tokenize(speaker.get(field, ''))):
+                    self.postings[term][field].setdefault(speaker_index, []).append((position, start, end))
+        self.postings = {term: dict(fields) for term, fields in self.postings.items()}
+        self.vocabulary = sorted(self.postings)
+        logger.info(f"Built text index: {len(self.vocabulary)} terms over {len(speakers)} speakers")
+
+    def expand(self, token: str) -> List[str]:
+        """All indexed terms starting with token."""
+        start = bisect.bisect_left(self.vocabulary, token)
+        end = bisect.bisect_left(self.vocabulary, token + '\uffff')
+        return self.vocabulary[start:end]
+
+    def query_terms(self, query: str, min_length: int = 2) -> Set[str]:
+        """Indexed terms matched by the words of query, ignoring words shorter than min_length."""
+        terms = set()
+        for token, _, _ in tokenize(query):
+            if len(token) >= min_length:
+                terms.update(self.expand(token))
+        return terms
+
+    def field_matches(self, terms: Set[str], speaker_index: int) -> Dict[str, List[List[int]]]:
+        """
+        Character spans of the given terms in each field of one speaker.
+
+        Returns:
+            {field: [[start, end], ...]} in field order, sorted by position, for fields with matches
+        """
+        spans = defaultdict(list)
+        for term in terms:
+            for field, speakers in self.postings[term].items():
+                for _, start, end in speakers.get(speaker_index, ()):
+                    spans[field].append([start, end])
+        return {field: sorted(spans[field]) for field in INDEXED_FIELDS if field in spans}
+
+    def search(self, keyword: str) -> List[int]:
+        """
+        Indices of speakers with keyword in any indexed field, in speaker order.
+
+        A multi-word keyword must appear as a phrase within one field; its last word
+        matches by prefix and the others exactly.
+        """
+        tokens = [token for token, _, _ in tokenize(keyword)]
+        if not tokens:
+            return []
+
+        # Occurrences of each keyword word: {field: {speaker: set of positions}}
+        per_token = []
+        for i, token in enumerate(tokens):
+            terms = self.expand(token) if i == len(tokens) - 1 else ([token] if token in self.postings else [])
+            positions = defaultdict(lambda: defaultdict(set))
+            for term in terms:
+                for field, speakers in self.postings[term].items():
+                    for speaker_index, occurrences in speakers.items():
+                        positions[field][speaker_index].update(position for position, _, _ in occurrences)
+            if not positions:
+                return []
+            per_token.append(positions)
+
+        matches = set()
+        for field, first_positions in per_token[0].items():
+            for speaker_index, starts in first_positions.items():
+                if speaker_index in matches:
+                    continue
+                for offset, positions in enumerate(per_token[1:], start=1):
+                    following = positions.get(field, {}).get(speaker_index)
+                    if not following:
+                        starts = set()
+                        break
+                    starts = {start for start in starts if start + offset in following}
+                    if not starts:
+                        break
+                if starts:
+                    matches.add(speaker_index)
+        return sorted(matches)
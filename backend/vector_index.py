@@ -0,0 +1,291 @@
+import logging
+from abc import ABC, abstractmethod
+from typing import Callable, Dict, List, Optional, Tuple
+
+import numpy as np
+
+try:
+    import chromadb
+except ImportError:  # Only required by the Chroma backend
+    chromadb = None
+
+logger = logging.getLogger(__name__)
+
+# (speaker_index, cosine similarity) pairs, best first, one list per query
+SearchResults = List[List[Tuple[int, float]]]
+EncodeFn = Callable[[List[str]], np.ndarray]
+# Optional boolean mask over speakers per query; False entries are excluded from the search
+QueryMasks = Optional[List[Optional[np.ndarray]]]
+
+
+def normalize_rows(vectors: np.ndarray) -> np.ndarray:
+    """Return a float32 copy of vectors scaled to unit L2 norm (zero rows stay zero)."""
+    vectors = np.asarray(vectors, dtype=np.float32)
+    if vectors.ndim == 1:
+        vectors = vectors[np.newaxis, :]
+    norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+    norms[norms == 0] = 1.0
+    return vectors / norms
+
+
+def unit_rows(vectors: np.ndarray) -> np.ndarray:
+    """
+    Return vectors unchanged if they are already unit-norm float32 rows, else a normalized copy.
+
+    Keeps memory-mapped embeddings from an index bundle shared instead of copying them.
+    """
+    vectors = np.asarray(vectors)
+    if vectors.dtype == np.float32 and vectors.ndim == 2:
+        norms = np.linalg.norm(vectors, axis=1)
+        if np.all((np.abs(norms - 1.0) < 1e-4) | (norms == 0)):
+            return vectors
+    return normalize_rows(vectors)
+
+
+def _content_metadata(metadata: Dict[str, str]) -> Dict[str, str]:
+    """Metadata without the positional speaker_index, for deciding whether a document changed."""
+    return {key: value for key, value in metadata.items() if key != "speaker_index"}
+
+
+def _rank_key(hit: Tuple[int, float]):
+    """Sort key ordering hits by descending score, then ascending speaker index."""
+    return -hit[1], hit[0]
+
+
+class VectorIndex(ABC):
+    """
+    Nearest-neighbour index over speaker document embeddings.
+
+    Entries are addressed by their position in the speaker list. Implementations
+    return exact cosine similarities so scores are comparable across backends, but
+    only the numpy backend guarantees the exact top_k; Chroma's HNSW search is
+    approximate and can miss some of the true nearest neighbours.
+    """
+
+    name = "base"
+
+    def __init__(self):
+        self.embeddings = np.zeros((0, 0), dtype=np.float32)
+
+    @abstractmethod
+    def sync(self, ids: List[str], documents: List[str], metadatas: List[Dict[str, str]],
+             encode: EncodeFn) -> np.ndarray:
+        """
+        Make the index match the given documents.
+
+        Args:
+            ids: Stable id per document, in speaker order
+            documents: Document texts, in speaker order
+            metadatas: Metadata dict per document, in speaker order
+            encode: Function embedding a list of documents; called only for documents
+                the index does not already hold
+
+        Returns:
+            Embedding matrix for all documents, in speaker order
+        """
+
+    @abstractmethod
+    def query(self, query_embeddings: np.ndarray, top_k: int, masks: QueryMasks = None) -> SearchResults:
+        """
+        Return the top_k most similar speakers for each query embedding.
+
+        When masks are given, each query only considers speakers its mask allows, so
+        filtered searches still fill top_k whenever enough speakers pass the filter.
+        """
+
+    def count(self) -> int:
+        return len(self.embeddings)
+
+    def similarity(self, query_embeddings: np.ndarray, speaker_indices: List[int]) -> np.ndarray:
+        """Exact cosine similarity between each query and the given speakers."""
+        return normalize_rows(query_embeddings) @ self.embeddings[speaker_indices].T
+
+
+class ChromaVectorIndex(VectorIndex):
+    """
+    ChromaDB-backed index, either in memory or persisted to vector_db_path.
+
+    Rankings are approximate: HNSW trades recall for speed. The collection uses the
+    cosine space with a large search_ef and each query over-fetches candidates that
+    are rescored exactly, which keeps recall high but does not guarantee the same
+    top_k as the exact numpy backend.
+    """
+
+    name = "chroma"
+    # Stay below ChromaDB's per-call batch limit when upserting large corpora
+    UPSERT_BATCH_SIZE = 5000
+    # HNSW settings, fixed when the collection is created
+    HNSW_METADATA = {"hnsw:space": "cosine", "hnsw:construction_ef": 400, "hnsw:search_ef": 1000, "hnsw:M": 32}
+    # Candidates fetched per requested result before exact rescoring
+    CANDIDATE_MULTIPLIER = 4
+
+    def __init__(self, collection_name: str, vector_db_path: Optional[str] = None):
+        super().__init__()
+        if chromadb is None:
+            raise ImportError("The chroma vector backend requires the chromadb package")
+        self.vector_db_path = vector_db_path
+        if vector_db_path:
+            # Persistent mode: reopen the index left by previous runs
+            self.client = chromadb.PersistentClient(path=vector_db_path)
+        else:
+            self.client = chromadb.Client()
+
+        # Open (or create) the collection for speakers
+        metadata = {"description": "SOF Week 2025 Speaker Database", **self.HNSW_METADATA}
+        self.collection = self.client.get_or_create_collection(name=collection_name, metadata=metadata)
+        stored_hnsw = {key: value for key, value in (self.collection.metadata or {}).items() if key.startswith("hnsw:")}
+        if stored_hnsw != self.HNSW_METADATA:
+            # HNSW settings cannot change on an existing collection, so rebuild it (re-encodes every speaker once)
+            logger.warning(f"Recreating ChromaDB collection '{collection_name}' with HNSW settings {self.HNSW_METADATA}")
+            self.client.delete_collection(name=collection_name)
+            self.collection = self.client.create_collection(name=collection_name, metadata=metadata)
+        location = vector_db_path or "memory"
+        logger.info(f"Initialized ChromaDB vector database ({location}, {self.collection.count()} stored speakers)")
+
+    def sync(self, ids, documents, metadatas, encode):
+        """
+        Diff the stored collection against the current documents.
+
+        Stored entries whose metadata (including the document hash) is unchanged are
+        reused as-is; only new or changed documents are embedded and upserted, and ids
+        that no longer exist are deleted. An entry that only moved to another position
+        (speaker_index) keeps its embedding and just has its metadata updated, so with
+        position-independent ids the work is proportional to the changes.
+        """
+        stored = self.collection.get(include=['metadatas', 'embeddings'])
+        stored_by_id = {
+            stored_id: (stored['metadatas'][j], stored['embeddings'][j])
+            for j, stored_id in enumerate(stored['ids'])
+        }
+
+        changed = [
+            i for i, doc_id in enumerate(ids)
+            if doc_id not in stored_by_id or _content_metadata(stored_by_id[doc_id][0]) != _content_metadata(metadatas[i])
+        ]
+        changed_set = set(changed)
+        moved = [
+            i for i, doc_id in enumerate(ids)
+            if i not in changed_set and stored_by_id[doc_id][0] != metadatas[i]
+        ]
+        current_ids = set(ids)
+        removed = [stored_id for stored_id in stored_by_id if stored_id not in current_ids]
+
+        new_embeddings = encode([documents[i] for i in changed]) if changed else []
+        embeddings = [
+            None if i in changed_set else np.asarray(stored_by_id[doc_id][1], dtype=np.float32)
+            for i, doc_id in enumerate(ids)
+        ]
+        for i, embedding in zip(changed, new_embeddings):
+            embeddings[i] = np.asarray(embedding, dtype=np.float32)
+        raw_embeddings = np.stack(embeddings) if embeddings else np.zeros((0, 0), dtype=np.float32)
+
+        # Upsert changed documents and drop removed ones
+        for start in range(0, len(changed), self.UPSERT_BATCH_SIZE):
+            batch = changed[start:start + self.UPSERT_BATCH_SIZE]
+            self.collection.upsert(
+                embeddings=[raw_embeddings[i].tolist() for i in batch],
+                documents=[documents[i] for i in batch],
+                metadatas=[metadatas[i] for i in batch],
+                ids=[ids[i] for i in batch]
+            )
+        for start in range(0, len(moved), self.UPSERT_BATCH_SIZE):
+            batch = moved[start:start + self.UPSERT_BATCH_SIZE]
+            self.collection.update(ids=[ids[i] for i in batch], metadatas=[metadatas[i] for i in batch])
+        if removed:
+            self.collection.delete(ids=removed)
+
+        self.embeddings = normalize_rows(raw_embeddings) if len(raw_embeddings) else raw_embeddings
+        logger.info(
+            f"Synced Chroma index: {len(changed)} upserted, {len(moved)} moved, {len(removed)} deleted, "
+            f"{len(ids) - len(changed) - len(moved)} unchanged"
+        )
+        return raw_embeddings
+
+    def query(self, query_embeddings, top_k, masks=None):
+        query_embeddings = np.asarray(query_embeddings, dtype=np.float32)
+        masks = masks or [None] * len(query_embeddings)
+        search_results = [[] for _ in range(len(query_embeddings))]
+
+        # Chroma applies one where clause per call, so queries sharing a filter are searched together
+        groups = {}
+        for q, mask in enumerate(masks):
+            key = None if mask is None else mask.tobytes()
+            groups.setdefault(key, (mask, []))[1].append(q)
+
+        for mask, query_positions in groups.values():
+            where = None
+            allowed = self.count()
+            if mask is not None:
+                allowed_indices = np.flatnonzero(mask)
+                allowed = len(allowed_indices)
+                if allowed < self.count():
+                    where = {"speaker_index": {"$in": [str(i) for i in allowed_indices]}}
+            if min(top_k, allowed) <= 0:
+                continue
+            # Over-fetch so exact rescoring can recover neighbours HNSW ranked too low
+            n_results = min(top_k * self.CANDIDATE_MULTIPLIER, allowed)
+
+            results = self.collection.query(
+                query_embeddings=query_embeddings[query_positions].tolist(),
+                n_results=n_results,
+                where=where,
+                include=['metadatas']
+            )
+            for q, metadatas in zip(query_positions, results['metadatas']):
+                speaker_indices = [int(metadata['speaker_index']) for metadata in metadatas]
+                # Rescore with exact cosine rather than deriving it from Chroma's L2 distance
+                scores = self.similarity(query_embeddings[q:q + 1], speaker_indices)[0] if speaker_indices else []
+                hits = sorted(zip(speaker_indices, (float(score) for score in scores)), key=_rank_key)
+                search_results[q] = hits[:top_k]
+        return search_results
+
+
+class NumpyVectorIndex(VectorIndex):
+    """Exact cosine search over an in-memory normalized float32 matrix."""
+
+    name = "numpy"
+
+    def sync(self, ids, documents, metadatas, encode):
+        raw_embeddings = encode(documents) if documents else np.zeros((0, 0), dtype=np.float32)
+        self.embeddings = unit_rows(raw_embeddings) if len(raw_embeddings) else raw_embeddings
+        logger.info(f"Built NumPy index over {len(documents)} speakers")
+        return raw_embeddings
+
+    def query(self, query_embeddings, top_k, masks=None):
+        n = self.count()
+        top_k = min(top_k, n)
+        if top_k <= 0:
+            return [[] for _ in range(len(query_embeddings))]
+
+        scores = normalize_rows(query_embeddings) @ self.embeddings.T
+        if masks:
+            for q, mask in enumerate(masks):
+                if mask is not None:
+                    scores[q, ~mask] = -np.inf
+        if top_k < n:
+            candidates = np.argpartition(-scores, top_k - 1, axis=1)[:, :top_k]
+        else:
+            candidates = np.tile(np.arange(n), (len(scores), 1))
+
+        search_results = []
+        for q in range(len(scores)):
+            row = candidates[q]
+            # Best score first, ties broken by speaker index to match the Chroma backend
+            order = row[np.lexsort((row, -scores[q, row]))]
+            search_results.append([(int(i), float(scores[q, i])) for i in order if scores[q, i] > -np.inf])
+        return search_results
+
+
+VECTOR_BACKENDS = {
+    ChromaVectorIndex.name: ChromaVectorIndex,
+    NumpyVectorIndex.name: NumpyVectorIndex,
+}
+
+
+def create_vector_index(backend: str, collection_name: str, vector_db_path: Optional[str] = None) -> VectorIndex:
+    """Build the configured vector index backend ('chroma' or 'numpy')."""
+    if backend == ChromaVectorIndex.name:
+        return ChromaVectorIndex(collection_name, vector_db_path=vector_db_path)
+    if backend == NumpyVectorIndex.name:
+        return NumpyVectorIndex()
+    raise ValueError(f"Unknown vector backend '{backend}', expected one of: {', '.join(VECTOR_BACKENDS)}")
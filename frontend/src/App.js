@@ -12,9 +12,11 @@ function App() {
     
     setLoading(true);
     setError('');
+    setRecommendations([]);
     
     try {
-      const response = await fetch('/recommend', {
+      // Streamed as NDJSON so each card renders as soon as the backend sends it
+      const response = await fetch('/recommend/stream', {
         method: 'POST',
         headers: {
           'Content-Type': 'application/json',
@@ -29,8 +31,26 @@ function App() {
         throw new Error('Failed to get recommendations');
       }
       
-      const data = await response.json();
-      setRecommendations(data.recommendations);
+      const reader = response.body.getReader();
+      const decoder = new TextDecoder();
+      let buffered = '';
+      const addLines = (lines) => {
+        const speakers = lines.filter((line) => line.trim()).map((line) => JSON.parse(line));
+        if (speakers.length > 0) {
+          setRecommendations((previous) => [...previous, ...speakers]);
+        }
+      };
+      
+      while (true) {
+        const { done, value } = await reader.read();
+        if (done) break;
+        buffered += decoder.decode(value, { stream: true });
+        const lines = buffered.split('\n');
+        // The last piece may be an incomplete line; keep it for the next chunk
+        buffered = lines.pop();
+        addLines(lines);
+      }
+      addLines([buffered + decoder.decode()]);
     } catch (err) {
       setError('Failed to get recommendations. Make sure the backend is running.');
     } finally {
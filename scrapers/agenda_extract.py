@@ -0,0 +1,166 @@
+#!/usr/bin/env python3
+"""
+Single-pass extraction of speaker cards and session tiles from the rendered agenda HTML.
+
+The page is parsed once with lxml. One walk over its divs then does three things:
+- assigns each speaker card its index among all cards;
+- attaches each card to the session tile that encloses it, tracked with a stack of open tiles;
+- records the first element of each session field per tile.
+
+Text is read only for the elements that are used. Speakers named in session text are
+deduplicated with a set. The output is the same as the older BeautifulSoup code,
+which called find_parent for every card and rescanned every tile for the session
+speakers.
+"""
+import re
+from lxml import etree
+
+SESSION_TILE_ID = 'agenda-v2-widget-session-tile-card'
+SPEAKER_CARD_CLASS = 'speakerCard'
+# Speaker record field -> data-cvent-id of the session tile element holding it
+SESSION_FIELD_IDS = {
+    'session_title': 'session-tile-card-session-name',
+    'speaking_time': 'session-tile-card-session-time',
+    'location': 'session-list-card-session-location',
+    'session_description': 'session-tile-card-session-description',
+}
+# Longest session description and bio kept in a speaker record, before the "..." marker
+MAX_SESSION_DESCRIPTION = 500
+MAX_BIO = 1500
+EMPTY_NAMES = ('&nbsp; &nbsp;', '', '&nbsp;')
+SPEAKER_NAME_PATTERNS = [
+    re.compile(r'((?:Mr\.|Ms\.|Dr\.|General|Admiral|Colonel|Lieutenant|The Honorable|Mayor|Command Sergeant Major)\s+[A-Z][a-z]+(?:\s+[A-Z]\.?)?\s+[A-Z][a-z]+)', re.IGNORECASE),
+    re.compile(r'(Jeff\s+Pottinger|Matt\s+Stevens)', re.IGNORECASE),
+]
+
+# Visible text nodes, as BeautifulSoup's get_text sees them (no script or style contents)
+_TEXT = etree.XPath('.//text()[not(ancestor::script or ancestor::style)]')
+_SPEAKER_NAME = etree.XPath('(.//div[@data-cvent-id="speaker-name"])[1]')
+_FIRST_DIV = etree.XPath('(.//div[@data-cvent-id=$data_id])[1]')
+_PROFILE_IMAGE = etree.XPath('(.//img[@data-cvent-id="speaker-card-user-profile-image"])[1]')
+
+
+def element_text(element):
+    """Text of element with each piece stripped, like get_text(strip=True)"""
+    if element is None:
+        return ''
+    return ''.join(piece.strip() for piece in _TEXT(element))
+
+
+def truncate(text, max_length):
+    return text[:max_length] + "..." if len(text) > max_length else text
+
+
+def first_div(element, data_id):
+    found = _FIRST_DIV(element, data_id=data_id)
+    return found[0] if found else None
+
+
+class AgendaPage:
+    """Speaker cards and session tiles of one agenda page"""
+
+    def __init__(self, html):
+        # Plain etree elements: lxml.html's element class lookup costs more than the walk itself
+        root = etree.fromstring(html or '<html></html>', etree.HTMLParser())
+        # (card element, enclosing tile or None) in document order
+        self._cards = []
+        # Per tile: session field -> first element holding it
+        self._tiles = {}
+        open_tiles = []
+        field_by_id = {data_id: field for field, data_id in SESSION_FIELD_IDS.items()}
+
+        for event, element in etree.iterwalk(root, events=('start', 'end'), tag='div'):
+            data_id = element.get('data-cvent-id')
+            if event == 'end':
+                if data_id == SESSION_TILE_ID:
+                    open_tiles.pop()
+                continue
+            if SPEAKER_CARD_CLASS in (element.get('class') or ''):
+                # The innermost open tile is the card's nearest enclosing session
+                self._cards.append((element, open_tiles[-1] if open_tiles else None))
+            if data_id == SESSION_TILE_ID:
+                self._tiles[element] = {}
+                open_tiles.append(element)
+            elif data_id in field_by_id:
+                # Every open tile's find() would return its first such element
+                for tile in open_tiles:
+                    self._tiles[tile].setdefault(field_by_id[data_id], element)
+
+        self.card_count = len(self._cards)
+        self._session_cache = {}
+
+    def session(self, tile, max_description=None):
+        """Session fields of a tile, with the description optionally truncated"""
+        key = (tile, max_description)
+        if key not in self._session_cache:
+            fields = self._tiles[tile]
+            session = {field: element_text(fields.get(field)) for field in SESSION_FIELD_IDS}
+            if max_description:
+                session['session_description'] = truncate(session['session_description'], max_description)
+            self._session_cache[key] = session
+        return self._session_cache[key]
+
+    def speaker_cards(self):
+        """(card index, speaker record without bio) for every card with a speaker name"""
+        cards = []
+        for i, (card, tile) in enumerate(self._cards):
+            names = _SPEAKER_NAME(card)
+            if not names:
+                continue
+            speaker_name = element_text(names[0])
+            if speaker_name in EMPTY_NAMES:
+                continue
+
+            image = _PROFILE_IMAGE(card)
+            speaker_info = {
+                'name': speaker_name,
+                'title': element_text(first_div(card, 'speaker-card-speaker-info-speaker-title')),
+                'company': element_text(first_div(card, 'speaker-card-speaker-info-speaker-company')),
+                'image_url': (image[0].get('src') or '') if image else '',
+                'detailed_bio': '',
+                'extraction_method': 'speaker_card_with_fixed_bio'
+            }
+            if tile is not None:
+                speaker_info.update(self.session(tile, max_description=MAX_SESSION_DESCRIPTION))
+            else:
+                speaker_info.update({
+                    'session_title': '', 'speaking_time': '',
+                    'location': '', 'session_description': ''
+                })
+            cards.append((i, speaker_info))
+        return cards
+
+    def card_names(self):
+        """Speaker name text of every card, by card index (None when a card has no name)"""
+        names = []
+        for card, _ in self._cards:
+            found = _SPEAKER_NAME(card)
+            names.append(element_text(found[0]) if found else None)
+        return names
+
+    def session_speakers(self, known_names=()):
+        """Speakers named in session titles and descriptions, skipping known_names (case-insensitive)"""
+        seen = {name.lower() for name in known_names}
+        speakers = []
+        for tile in self._tiles:
+            session = self.session(tile)
+            full_text = f"{session['session_title']} {session['session_description']}"
+            for pattern in SPEAKER_NAME_PATTERNS:
+                for match in pattern.finditer(full_text):
+                    name = match.group(1).strip()
+                    if name.lower() in seen:
+                        continue
+                    seen.add(name.lower())
+                    speakers.append({
+                        'name': name,
+                        'title': '',
+                        'company': '',
+                        'session_title': session['session_title'],
+                        'speaking_time': session['speaking_time'],
+                        'location': session['location'],
+                        'session_description': truncate(session['session_description'], 300),
+                        'extraction_method': 'session_content',
+                        'image_url': '',
+                        'detailed_bio': ''
+                    })
+        return speakers
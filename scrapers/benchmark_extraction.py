@@ -0,0 +1,204 @@
+#!/usr/bin/env python3
+"""
+Compare the old and new ways of extracting speakers from the rendered agenda HTML.
+
+    python benchmark_extraction.py --sessions 200 2000 --speakers-per-session 4
+    python benchmark_extraction.py --check-fixtures
+
+"before" is the BeautifulSoup html.parser code the scraper used to run. It calls
+find_all for the cards, find_parent and the four session finds for every card,
+rescans every session tile for speakers named in session text, and checks each
+match with an any() scan over the speakers found so far. "after" is
+agenda_extract.AgendaPage: one lxml parse and one walk. Both are timed from raw
+HTML to speaker records (parse + extract), on a synthetic agenda page of the given
+size. The outputs must match exactly.
+
+--check-fixtures runs both extractors on every saved page in fixtures/agenda/*.html.
+It compares their output with the matching .expected.json, and --update-fixtures
+rewrites those files.
+"""
+import argparse
+import glob
+import json
+import os
+import random
+import re
+import time
+
+from bs4 import BeautifulSoup
+
+from agenda_extract import AgendaPage
+
+FIXTURE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'fixtures', 'agenda')
+
+RANKS = ['Mr.', 'Ms.', 'Dr.', 'Colonel', 'Admiral', 'General', 'The Honorable', 'Command Sergeant Major']
+FIRST_NAMES = ['James', 'Maria', 'Robert', 'Linda', 'Michael', 'Carlos', 'Aisha', 'Olga', 'Thomas', 'Nadia']
+LAST_NAMES = ['Smith', 'Garcia', 'Johnson', 'Nguyen', 'Okafor', 'Miller', 'Kowalski', 'Hernandez', 'Patel']
+TOPICS = ['Unmanned Systems', 'Cyber Operations', 'Logistics', 'Acquisition Reform', 'Veteran Transition',
+          'Irregular Warfare', 'Space Capabilities', 'Human Performance', 'Maritime Operations']
+
+
+def synthetic_agenda_html(sessions, speakers_per_session, seed=0):
+    """A rendered agenda page shaped like the Cvent one: wrapper divs, hashed class names, inline scripts"""
+    rng = random.Random(seed)
+    tiles = []
+    for s in range(sessions):
+        topic = rng.choice(TOPICS)
+        moderator = f"{rng.choice(RANKS)} {rng.choice(FIRST_NAMES)} {rng.choice(LAST_NAMES)}"
+        cards = []
+        for p in range(speakers_per_session):
+            name = f"{rng.choice(RANKS)} {rng.choice(FIRST_NAMES)} {rng.choice(LAST_NAMES)} {s}-{p}"
+            cards.append(f"""
+        <div class="AgendaV2Styles__speakerCard___1x7Qs css-{rng.randrange(10 ** 6)}">
+          <div class="AgendaV2Styles__speakerImage"><div data-cvent-id="speaker-card-speaker-profile-image">
+            <img data-cvent-id="speaker-card-user-profile-image" src="https://example.com/p/{s}-{p}.png" alt=""></div></div>
+          <div class="AgendaV2Styles__speakerInfo">
+            <div data-cvent-id="speaker-name"><span>{name}</span></div>
+            <div data-cvent-id="speaker-card-speaker-info-speaker-title">{rng.choice(['Director', 'Program Manager', 'CTO'])}</div>
+            <div data-cvent-id="speaker-card-speaker-info-speaker-company">Company {rng.randrange(500)}</div>
+          </div>
+        </div>""")
+        description = ' '.join(f"Sentence {i} about {topic.lower()} and the joint force." for i in range(rng.randint(5, 60)))
+        tiles.append(f"""
+  <div class="AgendaV2Styles__sessionTile"><div data-cvent-id="agenda-v2-widget-session-tile-card" class="css-tile">
+    <div class="AgendaV2Styles__header">
+      <div data-cvent-id="session-tile-card-session-name">{topic} Panel {s} with {moderator}</div>
+      <div data-cvent-id="session-tile-card-session-time">{rng.randint(8, 11)}:00 AM-{rng.randint(1, 5)}:00 PM</div>
+      <div data-cvent-id="session-list-card-session-location">Tampa Convention Center: Room {100 + s % 40}</div>
+    </div>
+    <div data-cvent-id="session-tile-card-session-description"><p>{description}</p><p>Moderated by {moderator}.</p></div>
+    <div class="AgendaV2Styles__speakers">{''.join(cards)}
+    </div>
+    <script>window.__tile = {s};</script>
+  </div></div>""")
+    return f"""<!DOCTYPE html>
+<html><head><title>Agenda</title><style>.css-tile {{ display: block; }}</style></head>
+<body><div id="root"><div class="AgendaV2Styles__agenda">{''.join(tiles)}
+</div></div></body></html>"""
+
+
+def extract_before(html):
+    """The scraper's former extraction, kept verbatim in behaviour for comparison"""
+    soup = BeautifulSoup(html, 'html.parser')
+
+    def text(container, data_id, max_length=None):
+        elem = container.find('div', {'data-cvent-id': data_id})
+        if not elem:
+            return ""
+        value = elem.get_text(strip=True)
+        if max_length and len(value) > max_length:
+            value = value[:max_length] + "..."
+        return value
+
+    speakers = []
+    for card in soup.find_all('div', {'class': re.compile(r'.*speakerCard.*')}):
+        name_elem = card.find('div', {'data-cvent-id': 'speaker-name'})
+        if not name_elem:
+            continue
+        speaker_name = name_elem.get_text(strip=True)
+        if not speaker_name or speaker_name in ['&nbsp; &nbsp;', '', '&nbsp;']:
+            continue
+        img_elem = card.find('img', {'data-cvent-id': 'speaker-card-user-profile-image'})
+        speaker_info = {
+            'name': speaker_name,
+            'title': text(card, 'speaker-card-speaker-info-speaker-title'),
+            'company': text(card, 'speaker-card-speaker-info-speaker-company'),
+            'image_url': img_elem.get('src') if img_elem and img_elem.get('src') else "",
+            'detailed_bio': '',
+            'extraction_method': 'speaker_card_with_fixed_bio'
+        }
+        session_container = card.find_parent('div', {'data-cvent-id': 'agenda-v2-widget-session-tile-card'})
+        speaker_info.update({
+            'session_title': text(session_container, 'session-tile-card-session-name'),
+            'speaking_time': text(session_container, 'session-tile-card-session-time'),
+            'location': text(session_container, 'session-list-card-session-location'),
+            'session_description': text(session_container, 'session-tile-card-session-description', max_length=500)
+        } if session_container else {
+            'session_title': '', 'speaking_time': '', 'location': '', 'session_description': ''
+        })
+        speakers.append(speaker_info)
+
+    for session in soup.find_all('div', {'data-cvent-id': 'agenda-v2-widget-session-tile-card'}):
+        session_title = text(session, 'session-tile-card-session-name')
+        description = text(session, 'session-tile-card-session-description')
+        full_text = f"{session_title} {description}"
+        for pattern in [
+            r'((?:Mr\.|Ms\.|Dr\.|General|Admiral|Colonel|Lieutenant|The Honorable|Mayor|Command Sergeant Major)\s+[A-Z][a-z]+(?:\s+[A-Z]\.?)?\s+[A-Z][a-z]+)',
+            r'(Jeff\s+Pottinger|Matt\s+Stevens)',
+        ]:
+            for match in re.finditer(pattern, full_text, re.IGNORECASE):
+                name = match.group(1).strip()
+                if any(existing['name'].lower() == name.lower() for existing in speakers):
+                    continue
+                speakers.append({
+                    'name': name, 'title': '', 'company': '',
+                    'session_title': session_title,
+                    'speaking_time': text(session, 'session-tile-card-session-time'),
+                    'location': text(session, 'session-list-card-session-location'),
+                    'session_description': description[:300] + "..." if len(description) > 300 else description,
+                    'extraction_method': 'session_content', 'image_url': '', 'detailed_bio': ''
+                })
+    return speakers
+
+
+def extract_after(html):
+    agenda = AgendaPage(html)
+    speakers = [speaker for _, speaker in agenda.speaker_cards()]
+    return speakers + agenda.session_speakers(speaker['name'] for speaker in speakers)
+
+
+def best_of(fn, html, repeat):
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        result = fn(html)
+        timings.append(time.perf_counter() - started)
+    return min(timings), result
+
+
+def check_fixtures(update):
+    paths = sorted(glob.glob(os.path.join(FIXTURE_DIR, '*.html')))
+    failures = 0
+    for path in paths:
+        with open(path, encoding='utf-8') as f:
+            html = f.read()
+        expected_path = os.path.splitext(path)[0] + '.expected.json'
+        after = extract_after(html)
+        if update:
+            with open(expected_path, 'w', encoding='utf-8') as f:
+                json.dump(after, f, indent=2, ensure_ascii=False)
+                f.write('\n')
+        with open(expected_path, encoding='utf-8') as f:
+            expected = json.load(f)
+        ok = after == expected and extract_before(html) == expected
+        failures += not ok
+        print(f"{'ok  ' if ok else 'FAIL'} {os.path.basename(path)} ({len(after)} speakers)")
+    return failures
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--sessions', type=int, nargs='+', default=[200, 2000])
+    parser.add_argument('--speakers-per-session', type=int, default=4)
+    parser.add_argument('--repeat', type=int, default=3, help='Best of this many runs per extractor')
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--check-fixtures', action='store_true', help='Verify both extractors against fixtures/agenda')
+    parser.add_argument('--update-fixtures', action='store_true', help='Rewrite the .expected.json files first')
+    args = parser.parse_args()
+
+    if args.check_fixtures or args.update_fixtures:
+        raise SystemExit(1 if check_fixtures(args.update_fixtures) else 0)
+
+    print(f"{'sessions':>8} {'cards':>7} {'html MB':>8} {'before ms':>10} {'after ms':>9} {'speedup':>8}")
+    for sessions in args.sessions:
+        html = synthetic_agenda_html(sessions, args.speakers_per_session, args.seed)
+        before_seconds, before = best_of(extract_before, html, args.repeat)
+        after_seconds, after = best_of(extract_after, html, args.repeat)
+        if before != after:
+            raise SystemExit(f"Outputs differ for {sessions} sessions")
+        print(f"{sessions:>8} {sessions * args.speakers_per_session:>7} {len(html) / 2 ** 20:>8.1f} "
+              f"{before_seconds * 1000:>10.1f} {after_seconds * 1000:>9.1f} {before_seconds / after_seconds:>7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,193 @@
+#!/usr/bin/env python3
+"""
+Parse the agenda JSON that the embedded Cvent agenda fetches over XHR into the
+speaker schema written by scraper.py.
+
+Speakers and sessions are nested at different depths in different responses, and
+the field names vary between endpoints. The parser therefore walks every captured
+payload and picks out the objects that look like speakers or sessions, instead of
+depending on one URL or response shape.
+"""
+import re
+from datetime import datetime
+from bs4 import BeautifulSoup
+
+from agenda_extract import MAX_BIO, MAX_SESSION_DESCRIPTION, truncate
+
+EXTRACTION_METHOD = 'cvent_network_capture'
+
+TITLE_KEYS = ('designation', 'title', 'jobTitle')
+COMPANY_KEYS = ('company', 'companyName', 'organization')
+IMAGE_KEYS = ('profileImageUri', 'profileImageUrl', 'imageUrl', 'photoUrl')
+BIO_KEYS = ('biography', 'bio', 'description')
+SESSION_NAME_KEYS = ('name', 'title')
+SESSION_START_KEYS = ('start', 'startDateTime', 'startTime')
+SESSION_END_KEYS = ('end', 'endDateTime', 'endTime')
+
+
+def first_value(obj, keys):
+    """First non-empty string among obj[key] for keys, or ''"""
+    for key in keys:
+        value = obj.get(key)
+        if isinstance(value, str) and value.strip():
+            return value.strip()
+    return ''
+
+
+def html_to_text(html):
+    """Plain text from a rich-text field, with whitespace normalized"""
+    if not html:
+        return ''
+    text = BeautifulSoup(html, 'html.parser').get_text(' ', strip=True)
+    return re.sub(r'\s+', ' ', text).strip()
+
+
+def iter_objects(value):
+    """Every dict nested anywhere in a decoded JSON value"""
+    if isinstance(value, dict):
+        yield value
+        for child in value.values():
+            yield from iter_objects(child)
+    elif isinstance(value, list):
+        for child in value:
+            yield from iter_objects(child)
+
+
+def looks_like_speaker(obj):
+    return 'firstName' in obj and 'lastName' in obj
+
+
+def looks_like_session(obj):
+    return (('speakerIds' in obj or 'speakers' in obj) and
+            bool(first_value(obj, SESSION_NAME_KEYS)) and
+            bool(first_value(obj, SESSION_START_KEYS)))
+
+
+def session_speaker_ids(session):
+    ids = list(session.get('speakerIds') or [])
+    for speaker in session.get('speakers') or []:
+        ids.append(speaker.get('id') if isinstance(speaker, dict) else speaker)
+    return [speaker_id for speaker_id in ids if speaker_id]
+
+
+def parse_time(value):
+    try:
+        return datetime.fromisoformat(value.replace('Z', '+00:00'))
+    except (AttributeError, ValueError):
+        return None
+
+
+def clock(moment):
+    return moment.strftime('%I:%M %p').lstrip('0')
+
+
+def format_speaking_time(start, end):
+    """Session time as shown on the agenda, e.g. "Tuesday, May 6 9:00 AM-4:00 PM" (in the payload's own offset)"""
+    start_time, end_time = parse_time(start), parse_time(end)
+    if not start_time:
+        return ''
+    day = f"{start_time.strftime('%A, %B')} {start_time.day}"
+    if not end_time:
+        return f"{day} {clock(start_time)}"
+    return f"{day} {clock(start_time)}-{clock(end_time)}"
+
+
+def session_location(session):
+    location = session.get('location')
+    if isinstance(location, dict):
+        location = location.get('name')
+    if isinstance(location, str) and location.strip():
+        return location.strip()
+    return first_value(session, ('locationName', 'roomName'))
+
+
+def speaker_name(obj):
+    parts = [obj.get('prefix'), obj.get('firstName'), obj.get('lastName')]
+    return ' '.join(part.strip() for part in parts if isinstance(part, str) and part.strip())
+
+
+def payload_problems(payloads):
+    """
+    Reasons the captured payloads do not have the shape this parser expects, or [].
+
+    Network mode relies on the speaker objects (id, firstName, lastName) and on the
+    sessions that reference them. When any of these is missing the agenda's JSON has
+    probably changed, and the scraper falls back to reading the DOM.
+    """
+    speaker_ids = set()
+    speakers_without_id = 0
+    referenced = set()
+    session_count = 0
+    for payload in payloads:
+        for obj in iter_objects(payload):
+            if looks_like_speaker(obj):
+                if obj.get('id'):
+                    speaker_ids.add(obj['id'])
+                else:
+                    speakers_without_id += 1
+            elif looks_like_session(obj):
+                session_count += 1
+                referenced.update(session_speaker_ids(obj))
+
+    problems = []
+    if not speaker_ids:
+        problems.append("no speaker objects with id, firstName and lastName")
+    if speakers_without_id:
+        problems.append(f"{speakers_without_id} speaker objects without an id")
+    if not session_count:
+        problems.append("no session objects with speakerIds or speakers, a name and a start time")
+    elif speaker_ids and not referenced & speaker_ids:
+        problems.append("no session references a captured speaker id")
+    return problems
+
+
+def speakers_from_payloads(payloads):
+    """
+    Speaker records in the scraper's schema from captured agenda payloads.
+
+    The same speaker can appear in several payloads (a speaker list, and again inside
+    a session). Fields are merged, keeping the first non-empty value. Each speaker gets
+    the details of their earliest session. Speakers come out in the order they were
+    first seen. Bios and session descriptions are truncated like the DOM path's.
+    """
+    speakers = {}
+    sessions = []
+    for payload in payloads:
+        for obj in iter_objects(payload):
+            if looks_like_speaker(obj) and obj.get('id'):
+                record = speakers.setdefault(obj['id'], {
+                    'name': '', 'title': '', 'company': '', 'image_url': '', 'detailed_bio': ''
+                })
+                fields = {
+                    'name': speaker_name(obj),
+                    'title': first_value(obj, TITLE_KEYS),
+                    'company': first_value(obj, COMPANY_KEYS),
+                    'image_url': first_value(obj, IMAGE_KEYS),
+                    'detailed_bio': truncate(html_to_text(first_value(obj, BIO_KEYS)), MAX_BIO),
+                }
+                for key, value in fields.items():
+                    if value and not record[key]:
+                        record[key] = value
+            elif looks_like_session(obj):
+                sessions.append(obj)
+
+    session_by_speaker = {}
+    for session in sorted(sessions, key=lambda s: first_value(s, SESSION_START_KEYS)):
+        for speaker_id in session_speaker_ids(session):
+            session_by_speaker.setdefault(speaker_id, session)
+
+    results = []
+    for speaker_id, record in speakers.items():
+        if not record['name']:
+            continue
+        session = session_by_speaker.get(speaker_id, {})
+        results.append({
+            **record,
+            'extraction_method': EXTRACTION_METHOD,
+            'session_title': first_value(session, SESSION_NAME_KEYS),
+            'speaking_time': format_speaking_time(first_value(session, SESSION_START_KEYS),
+                                                  first_value(session, SESSION_END_KEYS)),
+            'location': session_location(session) if session else '',
+            'session_description': truncate(html_to_text(session.get('description', '')), MAX_SESSION_DESCRIPTION),
+        })
+    return results
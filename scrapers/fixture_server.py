@@ -0,0 +1,55 @@
+#!/usr/bin/env python3
+"""
+Serve the agenda fixtures as a local stand-in for the embedded Cvent agenda.
+
+    python fixture_server.py --port 8765
+    python scraper.py --mode network --agenda-url http://127.0.0.1:8765/embedded-agenda/ --output fixture_speakers.json
+
+Any /embedded-agenda/... path returns fixtures/cvent/agenda.html, which fetches the
+speaker and session payloads from /api/<name>.json (fixtures/cvent/<name>.json).
+The payloads are hand-written in the shape cvent_payloads.py expects, not a
+recorded capture. To replace them with real data, record live payloads with
+`scraper.py --mode network --record-payloads DIR` and copy the speaker and session
+files over fixtures/cvent/speakers.json and sessions.json.
+"""
+import argparse
+import os
+from http.server import SimpleHTTPRequestHandler, ThreadingHTTPServer
+
+FIXTURE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'fixtures', 'cvent')
+
+
+class FixtureHandler(SimpleHTTPRequestHandler):
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, directory=FIXTURE_DIR, **kwargs)
+
+    def translate_path(self, path):
+        path = path.split('?', 1)[0]
+        if path.startswith('/embedded-agenda'):
+            return os.path.join(FIXTURE_DIR, 'agenda.html')
+        if path.startswith('/api/'):
+            return os.path.join(FIXTURE_DIR, os.path.basename(path))
+        return super().translate_path(path)
+
+    def guess_type(self, path):
+        if path.endswith('.json'):
+            return 'application/json'
+        return super().guess_type(path)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8765)
+    args = parser.parse_args()
+
+    server = ThreadingHTTPServer((args.host, args.port), FixtureHandler)
+    print(f"Serving {FIXTURE_DIR} at http://{args.host}:{args.port}/embedded-agenda/")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
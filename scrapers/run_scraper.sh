@@ -17,7 +17,7 @@ cd scrapers
 > scraper.log
 
 # Run the production scraper in background
-nohup python3 scraper.py > scraper_output.log 2>&1 &
+nohup python3 scraper.py "$@" > scraper_output.log 2>&1 &
 
 # Get the process ID
 SCRAPER_PID=$!
@@ -1,14 +1,22 @@
 #!/usr/bin/env python3
+import argparse
 import asyncio
+import hashlib
 import json
 import re
 import sys
 import os
+import time
+from collections import defaultdict
+from contextlib import contextmanager
 from datetime import datetime
-from playwright.async_api import async_playwright
+from playwright.async_api import async_playwright, TimeoutError as PlaywrightTimeoutError
 from bs4 import BeautifulSoup
 import logging
 
+from agenda_extract import MAX_BIO, AgendaPage, truncate
+from cvent_payloads import payload_problems, speakers_from_payloads
+
 # Set up logging
 logging.basicConfig(
     level=logging.INFO,
@@ -20,13 +28,193 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
-class FixedBackgroundSOFScraper:
+USER_AGENT = 'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36'
+
+# Upper bounds (ms) for the condition-based waits; each returns as soon as its condition holds
+AGENDA_TIMEOUT_MS = 30000   # first speaker card rendered
+NETWORK_IDLE_TIMEOUT_MS = 10000
+STABLE_TIMEOUT_MS = 5000    # card count / modal text stops changing
+MODAL_OPEN_TIMEOUT_MS = 5000
+MODAL_CLOSE_TIMEOUT_MS = 2000
+STABLE_POLL_MS = 150
+
+SPEAKER_CARD_SELECTOR = '[data-cvent-id="speaker-name"]'
+# Dialogs that count as an open speaker modal
+OPEN_MODAL_SELECTOR = ', '.join(f'{selector}:visible' for selector in [
+    '[data-cvent-id="speaker-detail-modal"]', '[role="dialog"]', '[aria-modal="true"]', '.modal'
+])
+
+
+class StepTimer:
+    """Wall-clock durations of named scrape steps, reported at the end of a run"""
+
     def __init__(self):
+        self.durations = defaultdict(list)
+
+    @contextmanager
+    def step(self, name):
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.durations[name].append(time.perf_counter() - started)
+
+    def summary(self):
+        """Per-step count, total, mean, median and max in milliseconds"""
+        summary = {}
+        for name, durations in self.durations.items():
+            ordered = sorted(durations)
+            summary[name] = {
+                'count': len(ordered),
+                'total_ms': round(sum(ordered) * 1000, 1),
+                'mean_ms': round(sum(ordered) / len(ordered) * 1000, 1),
+                'p50_ms': round(ordered[len(ordered) // 2] * 1000, 1),
+                'max_ms': round(ordered[-1] * 1000, 1)
+            }
+        return summary
+
+    def report(self):
+        logger.info("⏱️ Step timings:")
+        for name, stats in self.summary().items():
+            logger.info(f"  {name:<14} n={stats['count']:<4} total {stats['total_ms'] / 1000:7.1f}s  "
+                        f"mean {stats['mean_ms']:7.0f}ms  p50 {stats['p50_ms']:7.0f}ms  max {stats['max_ms']:7.0f}ms")
+
+
+def name_key(name):
+    """Speaker name normalized for matching and deduplication"""
+    return re.sub(r'[^\w\s]', '', name.lower()).strip()
+
+
+# Speaker card and session tile fields; a bio is re-extracted only when one of these changes
+CARD_FIELDS = ('name', 'title', 'company', 'image_url', 'session_title', 'speaking_time', 'location',
+               'session_description')
+
+
+def card_fingerprint(speaker):
+    """Hash of a speaker's card and session fields, comparable across runs"""
+    fields = [speaker.get(field) or '' for field in CARD_FIELDS]
+    return hashlib.sha256(json.dumps(fields, ensure_ascii=False).encode('utf-8')).hexdigest()
+
+
+def output_path(filename):
+    """Output files are written to the repository root"""
+    return os.path.join('..', filename)
+
+
+def load_previous_speakers(path):
+    """Speakers from an earlier output file keyed by name key, or None if there is none"""
+    try:
+        with open(path, encoding='utf-8') as f:
+            speakers = json.load(f)['speakers']
+    except FileNotFoundError:
+        logger.info(f"📂 No previous output at {path}, extracting every bio")
+        return None
+    except (ValueError, KeyError) as e:
+        logger.warning(f"⚠️ Ignoring unreadable previous output {path}: {e}")
+        return None
+    logger.info(f"📂 Comparing against {len(speakers)} speakers in {path}")
+    return {name_key(speaker['name']): speaker for speaker in speakers}
+
+
+async def wait_until_stable(read, timeout_ms=STABLE_TIMEOUT_MS, poll_ms=STABLE_POLL_MS):
+    """Poll the async callable read until two consecutive results match (or timeout); return the last"""
+    deadline = time.perf_counter() + timeout_ms / 1000
+    previous = await read()
+    while time.perf_counter() < deadline:
+        await asyncio.sleep(poll_ms / 1000)
+        current = await read()
+        if current == previous:
+            return current
+        previous = current
+    return previous
+
+
+class SpeakerCheckpoint:
+    """Append-only JSONL log of completed speakers, so an interrupted run can resume"""
+
+    def __init__(self, path, resume=False, fresh=False):
+        """Open the checkpoint; an existing non-empty one is only discarded when fresh is set"""
+        self.path = path
+        if not resume and not fresh and os.path.exists(path) and os.path.getsize(path) > 0:
+            raise FileExistsError(f"Checkpoint {path} already holds completed speakers; "
+                                  f"pass --resume to continue from it or --fresh to discard it")
+        # Name key -> speaker record, in the order they were first completed
+        self.records = {}
+        if resume and os.path.exists(path):
+            with open(path, encoding='utf-8') as f:
+                for line_number, line in enumerate(f, 1):
+                    if not line.strip():
+                        continue
+                    try:
+                        record = json.loads(line)
+                    except json.JSONDecodeError:
+                        # A line cut short by a crash; that speaker is simply redone
+                        logger.warning(f"⚠️ Skipping unreadable checkpoint line {line_number} in {path}")
+                        continue
+                    self.records[name_key(record['name'])] = record
+            logger.info(f"♻️ Resuming with {len(self.records)} speakers from {path}")
+        self._file = open(path, 'a' if resume else 'w', encoding='utf-8')
+        if resume and self._file.tell() > 0:
+            with open(path, 'rb') as f:
+                f.seek(-1, os.SEEK_END)
+                if f.read(1) != b'\n':
+                    # Start after the torn line rather than appending to it
+                    self._file.write('\n')
+
+    def __contains__(self, name):
+        return name_key(name) in self.records
+
+    def get(self, name):
+        return self.records.get(name_key(name))
+
+    def add(self, speaker):
+        """Record a completed speaker, durably, before moving on"""
+        self.records[name_key(speaker['name'])] = speaker
+        self._file.write(json.dumps(speaker, ensure_ascii=False) + '\n')
+        self._file.flush()
+        os.fsync(self._file.fileno())
+
+    def assemble(self, ordered):
+        """Checkpointed records in the order of ordered, then any others from earlier runs"""
+        speakers = [self.records.get(name_key(speaker['name']), speaker) for speaker in ordered]
+        seen = {name_key(speaker['name']) for speaker in ordered}
+        speakers.extend(record for key, record in self.records.items() if key not in seen)
+        return speakers
+
+    def close(self):
+        self._file.close()
+
+    def clear(self):
+        """Close and delete the checkpoint once its speakers are safely in the final output"""
+        self.close()
+        if os.path.exists(self.path):
+            os.remove(self.path)
+        self.records = {}
+
+
+class FixedBackgroundSOFScraper:
+    def __init__(self, workers=4, mode='dom', agenda_url=None, record_dir=None, checkpoint=None, previous=None):
         self.base_url = "https://sofweek.org/agenda/"
-        self.cvent_url = "https://event-guestside-app-pr50.cvent-production.cvent.cloud/embedded-agenda/461ba942-5adb-45cf-a9e5-e8e40dd9305c"
+        self.cvent_url = agenda_url or "https://event-guestside-app-pr50.cvent-production.cvent.cloud/embedded-agenda/461ba942-5adb-45cf-a9e5-e8e40dd9305c"
+        # 'dom' reads every bio from its modal; 'network' parses the agenda's own JSON
+        # responses and opens modals only for speakers whose payload has no bio
+        self.mode = mode
+        # Where network mode saves the captured payloads (e.g. to refresh the fixtures)
+        self.record_dir = record_dir
         self.speakers_data = []
         self.successful_bios = 0
         self.processed_speakers = 0
+        # Number of independent browser pages extracting bios in parallel
+        self.workers = max(1, workers)
+        self.timer = StepTimer()
+        # SpeakerCheckpoint that completed speakers are appended to, and resumed from
+        self.checkpoint = checkpoint
+        # Speakers from the previous output by name key; unchanged cards keep their bios
+        self.previous = previous
+        # 'retried': unchanged cards whose previous bio was empty, so their modal is read again
+        self.changes = {'added': 0, 'changed': 0, 'unchanged': 0, 'retried': 0, 'removed': 0}
+        # Whether the last scrape_speakers call got through the whole agenda without an error
+        self.completed = False
 
     async def scrape_speakers(self):
         browser = None
@@ -38,31 +226,37 @@ class FixedBackgroundSOFScraper:
                     headless=True,
                     args=['--no-sandbox', '--disable-dev-shm-usage', '--disable-web-security']
                 )
-                page = await browser.new_page()
-                
-                await page.set_extra_http_headers({
-                    'User-Agent': 'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36'
-                })
-                
                 logger.info("🌐 Loading SOF Week agenda...")
-                await page.goto(self.cvent_url, wait_until="domcontentloaded", timeout=60000)
-                await page.wait_for_timeout(15000)  # Wait for dynamic content
+                captured = []
+                page = await self.open_agenda_page(browser, capture=captured if self.mode == 'network' else None)
                 
                 content = await page.content()
                 logger.info(f"📄 Loaded {len(content)} characters of content")
                 
-                soup = BeautifulSoup(content, 'html.parser')
+                agenda = AgendaPage(content)
                 
-                # Extract speakers with PROPER modal handling
-                await self.extract_speakers_with_proper_modal_handling(soup, page)
+                network_speakers = []
+                if self.mode == 'network':
+                    problems = payload_problems(captured)
+                    if problems:
+                        logger.warning(f"⚠️ {len(captured)} captured payloads lack the expected keys "
+                                       f"({'; '.join(problems)}), falling back to modal scraping")
+                    else:
+                        network_speakers = speakers_from_payloads(captured)
+                        if not network_speakers:
+                            logger.warning(f"⚠️ No named speakers in {len(captured)} captured payloads, "
+                                           f"falling back to modal scraping")
+                if network_speakers:
+                    await self.extract_missing_bios(network_speakers, agenda, browser, page)
+                else:
+                    # Extract speakers with PROPER modal handling
+                    await self.extract_speakers_with_proper_modal_handling(agenda, browser, page)
                 
                 # Extract additional speakers from session descriptions
-                await self.extract_speakers_from_sessions(soup)
+                self.extract_speakers_from_sessions(agenda)
                 
-                # Remove duplicates
-                self.remove_duplicates()
-                
-                logger.info(f"🎯 Scraping completed! Found {len(self.speakers_data)} speakers, {self.successful_bios} with detailed bios")
+                self.timer.report()
+                self.completed = True
                 
         except Exception as e:
             logger.error(f"❌ Error during scraping: {e}")
@@ -74,83 +268,246 @@ class FixedBackgroundSOFScraper:
                 except:
                     pass
         
+        # The checkpoint also holds speakers from earlier runs and those finished before an error
+        if self.checkpoint is not None:
+            self.speakers_data = self.checkpoint.assemble(self.speakers_data)
+        
+        if self.previous is not None:
+            current = {name_key(speaker['name']) for speaker in self.speakers_data}
+            self.changes['removed'] = sum(1 for key in self.previous if key not in current)
+            logger.info(f"🧮 Since the previous output: {self.changes['added']} added, {self.changes['changed']} changed, "
+                        f"{self.changes['unchanged']} unchanged, {self.changes['retried']} retried for a missing bio, "
+                        f"{self.changes['removed']} removed")
+        
+        # Remove duplicates
+        self.remove_duplicates()
+        
+        logger.info(f"🎯 Scraping completed! Found {len(self.speakers_data)} speakers, {self.successful_bios} with detailed bios")
         return self.speakers_data
 
-    async def extract_speakers_with_proper_modal_handling(self, soup, page):
-        """Extract speakers with PROPER modal closing to prevent interference"""
-        speaker_cards = soup.find_all('div', {'class': re.compile(r'.*speakerCard.*')})
-        logger.info(f"🔍 Found {len(speaker_cards)} speaker cards to process")
-        
-        for i, card in enumerate(speaker_cards):
+    def resume_speaker(self, speaker_info):
+        """Whether speaker_info was completed by an earlier run, counting its bio if so"""
+        if self.checkpoint is None or speaker_info['name'] not in self.checkpoint:
+            return False
+        if self.checkpoint.get(speaker_info['name']).get('detailed_bio'):
+            self.successful_bios += 1
+        return True
+
+    def carry_over_bio(self, speaker_info):
+        """Whether the speaker's card is unchanged since the previous output with a bio, reusing that bio if so"""
+        if self.previous is None:
+            return False
+        previous = self.previous.get(name_key(speaker_info['name']))
+        if previous is None:
+            self.changes['added'] += 1
+            return False
+        if card_fingerprint(previous) != card_fingerprint(speaker_info):
+            self.changes['changed'] += 1
+            return False
+        if not previous.get('detailed_bio'):
+            # The earlier run found no bio; queue the card so the modal is tried again
+            self.changes['retried'] += 1
+            return False
+        self.changes['unchanged'] += 1
+        if not speaker_info.get('detailed_bio'):
+            speaker_info['detailed_bio'] = previous['detailed_bio']
+        return True
+
+    def complete_speaker(self, speaker_info):
+        if self.checkpoint is not None:
+            self.checkpoint.add(speaker_info)
+
+    async def open_agenda_page(self, browser, capture=None):
+        """Open the agenda in its own browser context and wait for it to render
+
+        If capture is a list, every JSON response the agenda receives while loading is
+        decoded and appended to it.
+        """
+        # A separate context per page keeps cookies, storage and modals isolated between workers
+        context = await browser.new_context(user_agent=USER_AGENT)
+        page = await context.new_page()
+        pending = []
+        if capture is not None:
+            page.on('response', lambda response: pending.append(
+                asyncio.ensure_future(self.capture_json(response, capture))))
+        with self.timer.step('page_load'):
+            await page.goto(self.cvent_url, wait_until="domcontentloaded", timeout=60000)
+            # The agenda is rendered client-side: wait for the first card, then for the
+            # network to settle and the card count to stop growing
+            await page.wait_for_selector(SPEAKER_CARD_SELECTOR, timeout=AGENDA_TIMEOUT_MS)
             try:
-                # Extract basic info
-                name_elem = card.find('div', {'data-cvent-id': 'speaker-name'})
-                if not name_elem:
-                    continue
-                    
-                speaker_name = name_elem.get_text(strip=True)
-                if not speaker_name or speaker_name in ['&nbsp; &nbsp;', '', '&nbsp;']:
-                    continue
-                
-                speaker_info = {
-                    'name': speaker_name,
-                    'title': self.safe_extract_text(card, 'speaker-card-speaker-info-speaker-title'),
-                    'company': self.safe_extract_text(card, 'speaker-card-speaker-info-speaker-company'),
-                    'image_url': self.safe_extract_image(card),
-                    'detailed_bio': '',
-                    'extraction_method': 'speaker_card_with_fixed_bio'
-                }
-                
-                # Add session info
-                session_info = self.find_associated_session(card, soup)
-                speaker_info.update(session_info or {
-                    'session_title': '', 'speaking_time': '', 
-                    'location': '', 'session_description': ''
-                })
-                
-                # CRITICAL: Ensure no modals are open before attempting bio extraction
-                logger.info(f"🖱️ [{i+1}/{len(speaker_cards)}] Attempting bio extraction for: {speaker_name}")
-                
-                # Force close any existing modals FIRST
-                await self.force_close_all_modals(page)
-                await page.wait_for_timeout(1000)  # Wait for modals to close
-                
+                await page.wait_for_load_state('networkidle', timeout=NETWORK_IDLE_TIMEOUT_MS)
+            except PlaywrightTimeoutError:
+                logger.debug("    Network not idle, continuing once cards are stable")
+            cards = await wait_until_stable(lambda: page.locator(SPEAKER_CARD_SELECTOR).count())
+            await asyncio.gather(*pending)
+        logger.info(f"📄 Agenda ready with {cards} speaker cards")
+        if capture is not None:
+            logger.info(f"📡 Captured {len(capture)} JSON payloads")
+        return page
+
+    async def capture_json(self, response, captured):
+        """Decode a JSON response into captured, saving it to record_dir if set"""
+        if 'json' not in response.headers.get('content-type', ''):
+            return
+        try:
+            payload = await response.json()
+        except Exception as e:
+            logger.debug(f"    Could not decode {response.url}: {e}")
+            return
+        captured.append(payload)
+        
+        if self.record_dir:
+            os.makedirs(self.record_dir, exist_ok=True)
+            endpoint = os.path.splitext(response.url.split('?')[0].rstrip('/').rsplit('/', 1)[-1])[0]
+            endpoint = re.sub(r'[^\w-]+', '_', endpoint)
+            path = os.path.join(self.record_dir, f"{len(captured):03d}-{endpoint or 'payload'}.json")
+            with open(path, 'w', encoding='utf-8') as f:
+                json.dump(payload, f, indent=2, ensure_ascii=False)
+
+    async def extract_missing_bios(self, speakers, agenda, browser, first_page):
+        """Keep the speakers parsed from the payloads, reading bios they lack from the matching cards' modals"""
+        card_index = {}
+        for i, name in enumerate(agenda.card_names()):
+            if name is not None:
+                card_index.setdefault(name_key(name), i)
+        
+        pending = [speaker for speaker in speakers if not self.resume_speaker(speaker)]
+        unchanged = {id(speaker) for speaker in pending if self.carry_over_bio(speaker)}
+        with_bio = [speaker for speaker in pending if speaker['detailed_bio']]
+        jobs = [(card_index[name_key(speaker['name'])], speaker) for speaker in pending
+                if not speaker['detailed_bio'] and id(speaker) not in unchanged and name_key(speaker['name']) in card_index]
+        logger.info(f"📡 {len(speakers)} speakers from captured payloads ({len(speakers) - len(pending)} resumed), "
+                    f"{len(with_bio)} with bios; reading {len(jobs)} missing bios from modals")
+        
+        self.successful_bios += len(with_bio)
+        queued = {id(speaker) for _, speaker in jobs}
+        for speaker in pending:
+            # Everything not waiting on a modal is as complete as it will get
+            if id(speaker) not in queued:
+                self.complete_speaker(speaker)
+        if jobs:
+            await self.extract_bios_in_pool(browser, first_page, jobs, agenda.card_count)
+        
+        self.speakers_data.extend(speakers)
+        self.processed_speakers += len(speakers)
+
+    async def extract_speakers_with_proper_modal_handling(self, agenda, browser, first_page):
+        """Extract speakers, spreading bio extraction over a pool of independent pages"""
+        logger.info(f"🔍 Found {agenda.card_count} speaker cards to process")
+        
+        # Card details come from the static HTML; only bios need a live page
+        cards = agenda.speaker_cards()
+        
+        pending = [(i, speaker_info) for i, speaker_info in cards if not self.resume_speaker(speaker_info)]
+        if len(pending) < len(cards):
+            logger.info(f"♻️ Skipping {len(cards) - len(pending)} speakers already in the checkpoint")
+        
+        # Only new and changed cards need the modal; unchanged ones keep their previous bio
+        jobs = []
+        for i, speaker_info in pending:
+            if self.carry_over_bio(speaker_info):
+                self.successful_bios += 1
+                self.complete_speaker(speaker_info)
+            else:
+                jobs.append((i, speaker_info))
+        if self.previous is not None:
+            logger.info(f"🧮 Extracting bios for {len(jobs)} new, changed or bio-less speakers, "
+                        f"keeping {len(pending) - len(jobs)} unchanged")
+        await self.extract_bios_in_pool(browser, first_page, jobs, agenda.card_count)
+        
+        # Merge results in card order
+        for _, speaker_info in cards:
+            self.speakers_data.append(speaker_info)
+            self.processed_speakers += 1
+
+    async def extract_bios_in_pool(self, browser, first_page, jobs, total_cards):
+        """Fill in bios for (card index, speaker info) jobs using up to self.workers agenda pages"""
+        pages = [first_page]
+        worker_count = min(self.workers, len(jobs))
+        if worker_count > 1:
+            logger.info(f"🌐 Opening {worker_count - 1} more agenda pages for parallel bio extraction...")
+            opened = await asyncio.gather(
+                *(self.open_agenda_page(browser) for _ in range(worker_count - 1)),
+                return_exceptions=True
+            )
+            for result in opened:
+                if isinstance(result, Exception):
+                    logger.warning(f"⚠️ Could not open worker page: {result}")
+                else:
+                    pages.append(result)
+        
+        try:
+            # Each worker owns every Nth card on its own page, so modals never cross workers
+            await asyncio.gather(*(
+                self.extract_bios_on_page(page, jobs[worker::len(pages)], total_cards, worker)
+                for worker, page in enumerate(pages)
+            ))
+        finally:
+            for page in pages[1:]:
                 try:
-                    bio = await asyncio.wait_for(
-                        self.click_and_extract_bio_fixed(page, speaker_name, i),
-                        timeout=25  # Reduced timeout
-                    )
-                    if bio and len(bio.strip()) > 50:
-                        speaker_info['detailed_bio'] = bio
-                        self.successful_bios += 1
-                        logger.info(f"  ✅ Got bio ({len(bio)} chars)")
-                    else:
-                        logger.info(f"  ⚠️ No bio found")
-                        
-                except asyncio.TimeoutError:
-                    logger.warning(f"  ⏰ Bio extraction timeout for {speaker_name}")
-                except Exception as bio_error:
-                    logger.warning(f"  ⚠️ Bio extraction error for {speaker_name}: {bio_error}")
-                
-                # CRITICAL: Force close modals after each attempt
-                await self.force_close_all_modals(page)
-                await page.wait_for_timeout(500)  # Brief pause
-                
-                self.speakers_data.append(speaker_info)
-                self.processed_speakers += 1
-                
+                    await page.context.close()
+                except:
+                    pass
+
+    async def extract_bios_on_page(self, page, jobs, total_cards, worker):
+        """Extract bios for one worker's slice of (card index, speaker info) pairs"""
+        for i, speaker_info in jobs:
+            try:
+                await self.extract_bio_for_speaker(page, speaker_info, i, total_cards, worker)
+                self.complete_speaker(speaker_info)
             except Exception as e:
-                logger.error(f"⚠️ Error processing speaker {i}: {e}")
-                continue
+                logger.error(f"⚠️ [w{worker}] Error processing speaker {i}: {e}")
 
-    async def force_close_all_modals(self, page):
-        """Aggressively close ALL modals to prevent interference"""
+    async def extract_bio_for_speaker(self, page, speaker_info, card_index, total_cards, worker=0):
+        """Open one speaker's modal on page and store the bio in speaker_info"""
+        speaker_name = speaker_info['name']
+        
+        # CRITICAL: Ensure no modals are open before attempting bio extraction
+        logger.info(f"🖱️ [w{worker}] [{card_index+1}/{total_cards}] Attempting bio extraction for: {speaker_name}")
+        
+        # Force close any existing modals FIRST
+        await self.force_close_all_modals(page)
+        
         try:
-            # Strategy 1: Press Escape multiple times
-            for _ in range(3):
+            with self.timer.step('bio_total'):
+                bio = await asyncio.wait_for(
+                    self.click_and_extract_bio_fixed(page, speaker_name, card_index),
+                    timeout=25  # Reduced timeout
+                )
+            if bio and len(bio.strip()) > 50:
+                speaker_info['detailed_bio'] = bio
+                self.successful_bios += 1
+                logger.info(f"  ✅ Got bio ({len(bio)} chars)")
+            else:
+                logger.info(f"  ⚠️ No bio found")
+                
+        except asyncio.TimeoutError:
+            logger.warning(f"  ⏰ Bio extraction timeout for {speaker_name}")
+        except Exception as bio_error:
+            logger.warning(f"  ⚠️ Bio extraction error for {speaker_name}: {bio_error}")
+        
+        # CRITICAL: Force close modals after each attempt
+        await self.force_close_all_modals(page)
+
+    async def force_close_all_modals(self, page):
+        """Close ALL modals to prevent interference, escalating only while one is still open"""
+        with self.timer.step('close_modals'):
+            # Strategy 1: Escape, which closes the speaker modal in the normal case
+            try:
+                if await page.locator(OPEN_MODAL_SELECTOR).count() == 0:
+                    return
                 await page.keyboard.press('Escape')
-                await page.wait_for_timeout(200)
+                await page.wait_for_selector(OPEN_MODAL_SELECTOR, state='hidden', timeout=MODAL_CLOSE_TIMEOUT_MS)
+                return
+            except Exception as e:
+                logger.debug(f"    Modal still open after Escape: {e}")
             
+            await self.close_modals_aggressively(page)
+
+    async def close_modals_aggressively(self, page):
+        """Close buttons, outside clicks and finally hiding modal elements via JavaScript"""
+        try:
             # Strategy 2: Click all possible close buttons
             close_selectors = [
                 'button:has-text("Close")',
@@ -209,9 +566,6 @@ class FixedBackgroundSOFScraper:
     async def click_and_extract_bio_fixed(self, page, speaker_name, card_index):
         """Fixed bio extraction with aggressive modal management"""
         try:
-            # Wait and ensure clean state
-            await page.wait_for_timeout(1000)
-            
             # Try clicking profile image
             profile_images = page.locator('[data-cvent-id="speaker-card-speaker-profile-image"]')
             if card_index < await profile_images.count():
@@ -219,17 +573,14 @@ class FixedBackgroundSOFScraper:
                 
                 try:
                     # Scroll element into view first
-                    await profile_image.scroll_into_view_if_needed()
-                    await page.wait_for_timeout(500)
-                    
-                    # Click with force if needed
-                    await profile_image.click(force=True, timeout=5000)
+                    with self.timer.step('click'):
+                        await profile_image.scroll_into_view_if_needed()
+                        
+                        # Click with force if needed
+                        await profile_image.click(force=True, timeout=5000)
                     logger.info(f"    🖱️ Clicked profile image")
                     
-                    # Wait for modal to appear
-                    await page.wait_for_timeout(3000)
-                    
-                    # Extract bio
+                    # Extract bio (waits for the modal to appear)
                     bio = await self.extract_bio_from_modal_improved(page)
                     if bio:
                         logger.info(f"    📖 Extracted bio from modal")
@@ -244,12 +595,11 @@ class FixedBackgroundSOFScraper:
                 speaker_name_elem = speaker_names.nth(card_index)
                 
                 try:
-                    await speaker_name_elem.scroll_into_view_if_needed()
-                    await page.wait_for_timeout(500)
-                    await speaker_name_elem.click(force=True, timeout=5000)
+                    with self.timer.step('click'):
+                        await speaker_name_elem.scroll_into_view_if_needed()
+                        await speaker_name_elem.click(force=True, timeout=5000)
                     logger.info(f"    🖱️ Clicked speaker name")
                     
-                    await page.wait_for_timeout(3000)
                     bio = await self.extract_bio_from_modal_improved(page)
                     if bio:
                         logger.info(f"    📖 Extracted bio from name click")
@@ -266,8 +616,14 @@ class FixedBackgroundSOFScraper:
     async def extract_bio_from_modal_improved(self, page):
         """Improved modal bio extraction with multiple strategies"""
         try:
-            # Wait for modal content to load
-            await page.wait_for_timeout(2000)
+            # Wait for a modal to open and its content to finish rendering
+            with self.timer.step('modal_ready'):
+                try:
+                    modal = page.locator(OPEN_MODAL_SELECTOR).first
+                    await modal.wait_for(state='visible', timeout=MODAL_OPEN_TIMEOUT_MS)
+                    await wait_until_stable(lambda: modal.text_content())
+                except PlaywrightTimeoutError:
+                    logger.debug("    No modal appeared, falling back to page search")
             
             # Strategy 1: Look for speaker detail modal specifically
             modal_selectors = [
@@ -352,105 +708,17 @@ class FixedBackgroundSOFScraper:
         text = re.sub(r'^.*?(Speaker|Profile|Biography|Bio)\s*:?\s*', '', text, flags=re.IGNORECASE)
         
         # Trim and limit
-        text = text.strip()
-        if len(text) > 1500:
-            text = text[:1500] + "..."
-            
-        return text
+        return truncate(text.strip(), MAX_BIO)
 
-    def safe_extract_text(self, card, data_id):
-        """Safely extract text from card element"""
-        try:
-            elem = card.find('div', {'data-cvent-id': data_id})
-            return elem.get_text(strip=True) if elem else ""
-        except:
-            return ""
-
-    def safe_extract_image(self, card):
-        """Safely extract image URL from card"""
-        try:
-            img_elem = card.find('img', {'data-cvent-id': 'speaker-card-user-profile-image'})
-            return img_elem.get('src') if img_elem and img_elem.get('src') else ""
-        except:
-            return ""
-
-    def find_associated_session(self, speaker_card, soup):
-        """Find session information for a speaker"""
-        try:
-            session_container = speaker_card.find_parent('div', {'data-cvent-id': 'agenda-v2-widget-session-tile-card'})
-            
-            if session_container:
-                return {
-                    'session_title': self.safe_extract_session_text(session_container, 'session-tile-card-session-name'),
-                    'speaking_time': self.safe_extract_session_text(session_container, 'session-tile-card-session-time'),
-                    'location': self.safe_extract_session_text(session_container, 'session-list-card-session-location'),
-                    'session_description': self.safe_extract_session_text(session_container, 'session-tile-card-session-description', max_length=500)
-                }
-        except:
-            pass
-        return None
-
-    def safe_extract_session_text(self, container, data_id, max_length=None):
-        """Safely extract session text"""
-        try:
-            elem = container.find('div', {'data-cvent-id': data_id})
-            if elem:
-                text = elem.get_text(strip=True)
-                if max_length and len(text) > max_length:
-                    text = text[:max_length] + "..."
-                return text
-        except:
-            pass
-        return ""
-
-    async def extract_speakers_from_sessions(self, soup):
+    def extract_speakers_from_sessions(self, agenda):
         """Extract additional speakers from session content"""
         logger.info("🔍 Looking for additional speakers in session content...")
         
-        sessions = soup.find_all('div', {'data-cvent-id': 'agenda-v2-widget-session-tile-card'})
-        
-        for session in sessions:
-            try:
-                session_title = self.safe_extract_session_text(session, 'session-tile-card-session-name')
-                session_time = self.safe_extract_session_text(session, 'session-tile-card-session-time')
-                location = self.safe_extract_session_text(session, 'session-list-card-session-location')
-                description = self.safe_extract_session_text(session, 'session-tile-card-session-description')
-                
-                full_text = f"{session_title} {description}"
-                
-                # Look for speaker patterns
-                patterns = [
-                    r'((?:Mr\.|Ms\.|Dr\.|General|Admiral|Colonel|Lieutenant|The Honorable|Mayor|Command Sergeant Major)\s+[A-Z][a-z]+(?:\s+[A-Z]\.?)?\s+[A-Z][a-z]+)',
-                    r'(Jeff\s+Pottinger|Matt\s+Stevens)',
-                ]
-                
-                for pattern in patterns:
-                    matches = re.finditer(pattern, full_text, re.IGNORECASE)
-                    for match in matches:
-                        name = match.group(1).strip()
-                        
-                        # Skip if already exists
-                        if any(existing['name'].lower() == name.lower() for existing in self.speakers_data):
-                            continue
-                            
-                        speaker_info = {
-                            'name': name,
-                            'title': '',
-                            'company': '',
-                            'session_title': session_title,
-                            'speaking_time': session_time,
-                            'location': location,
-                            'session_description': description[:300] + "..." if len(description) > 300 else description,
-                            'extraction_method': 'session_content',
-                            'image_url': '',
-                            'detailed_bio': ''
-                        }
-                        
-                        self.speakers_data.append(speaker_info)
-                        logger.info(f"  ✅ Found additional speaker: {name}")
-                        
-            except Exception as e:
-                continue
+        for speaker_info in agenda.session_speakers(speaker['name'] for speaker in self.speakers_data):
+            self.speakers_data.append(speaker_info)
+            if not self.resume_speaker(speaker_info):
+                self.complete_speaker(speaker_info)
+            logger.info(f"  ✅ Found additional speaker: {speaker_info['name']}")
 
     def remove_duplicates(self):
         """Remove duplicate speakers"""
@@ -458,16 +726,16 @@ class FixedBackgroundSOFScraper:
         seen_names = set()
         
         for speaker in self.speakers_data:
-            name_key = re.sub(r'[^\w\s]', '', speaker['name'].lower()).strip()
-            if name_key not in seen_names:
-                seen_names.add(name_key)
+            key = name_key(speaker['name'])
+            if key not in seen_names:
+                seen_names.add(key)
                 unique_speakers.append(speaker)
         
         self.speakers_data = unique_speakers
         logger.info(f"🔄 After deduplication: {len(self.speakers_data)} unique speakers")
 
     def save_to_json(self, filename="sof_week_speakers_complete.json"):
-        """Save speakers data to JSON file"""
+        """Save speakers data to JSON file, returning whether it was written"""
         try:
             output_data = {
                 'scraped_at': datetime.now().isoformat(),
@@ -476,23 +744,30 @@ class FixedBackgroundSOFScraper:
                 'processed_speakers': self.processed_speakers,
                 'source_url': self.base_url,
                 'cvent_url': self.cvent_url,
+                'extraction_mode': self.mode,
+                'changes_since_previous': self.changes if self.previous is not None else None,
                 'description': 'SOF Week 2025 Complete Speaker List with FIXED Bio Extraction',
                 'speakers': self.speakers_data
             }
             
             # Save to parent directory
-            scraper_file = os.path.join('..', filename)
+            scraper_file = output_path(filename)
             
             with open(scraper_file, 'w', encoding='utf-8') as f:
                 json.dump(output_data, f, indent=2, ensure_ascii=False)
             
             logger.info(f"💾 Saved {len(self.speakers_data)} speakers to {scraper_file}")
+            return True
             
         except Exception as e:
             logger.error(f"❌ Error saving to JSON: {e}")
+            return False
 
-async def main():
-    scraper = FixedBackgroundSOFScraper()
+async def main(args):
+    checkpoint = SpeakerCheckpoint(args.checkpoint, resume=args.resume, fresh=args.fresh)
+    previous = None if args.full else load_previous_speakers(args.previous or output_path(args.output))
+    scraper = FixedBackgroundSOFScraper(workers=args.workers, mode=args.mode, agenda_url=args.agenda_url,
+                                        record_dir=args.record_payloads, checkpoint=checkpoint, previous=previous)
     
     try:
         speakers = await scraper.scrape_speakers()
@@ -501,7 +776,15 @@ async def main():
         logger.info(f"📊 Total speakers found: {len(speakers)}")
         logger.info(f"📝 Speakers with detailed bios: {scraper.successful_bios}")
         
-        scraper.save_to_json()
+        if scraper.save_to_json(args.output) and scraper.completed:
+            # Every speaker is in the output now, so the next run starts from an empty checkpoint
+            checkpoint.clear()
+        else:
+            logger.info(f"♻️ Keeping {args.checkpoint}; continue with --resume")
+        if args.timings:
+            with open(args.timings, 'w', encoding='utf-8') as f:
+                json.dump(scraper.timer.summary(), f, indent=2)
+            logger.info(f"⏱️ Saved step timings to {args.timings}")
         
         # Print summary of speakers with bios
         bio_speakers = [s for s in speakers if s.get('detailed_bio') and len(s['detailed_bio']) > 50]
@@ -516,6 +799,37 @@ async def main():
         logger.info("🛑 Scraping interrupted by user")
     except Exception as e:
         logger.error(f"❌ Fatal error: {e}")
+    finally:
+        checkpoint.close()
 
 if __name__ == "__main__":
-    asyncio.run(main())
+    parser = argparse.ArgumentParser(description="Scrape SOF Week speakers and their bios")
+    parser.add_argument('--workers', type=int, default=int(os.environ.get('SCRAPER_WORKERS', '4')),
+                        help='Browser pages extracting bios in parallel (default 4, or $SCRAPER_WORKERS)')
+    parser.add_argument('--timings', default=None, help='Also write the per-step timing report as JSON to this file')
+    parser.add_argument('--mode', choices=['dom', 'network'], default=os.environ.get('SCRAPER_MODE', 'dom'),
+                        help="'network' parses the agenda's JSON responses and only opens modals for missing bios")
+    parser.add_argument('--agenda-url', default=None,
+                        help='Agenda to scrape instead of the SOF Week one (e.g. the fixture_server.py stand-in)')
+    parser.add_argument('--record-payloads', default=None, metavar='DIR',
+                        help='In network mode, save every captured JSON payload to DIR')
+    parser.add_argument('--output', default="sof_week_speakers_complete.json",
+                        help='Output file, relative to the repository root')
+    parser.add_argument('--checkpoint', default='scrape_checkpoint.jsonl',
+                        help='JSONL file each completed speaker is appended to')
+    checkpoint_mode = parser.add_mutually_exclusive_group()
+    checkpoint_mode.add_argument('--resume', action='store_true',
+                                 help='Keep the checkpoint and skip the speakers already in it')
+    checkpoint_mode.add_argument('--fresh', action='store_true',
+                                 help='Discard a non-empty checkpoint and start over (refused otherwise)')
+    parser.add_argument('--previous', default=None,
+                        help='Earlier output to carry unchanged bios over from (default: the --output file)')
+    parser.add_argument('--full', action='store_true',
+                        help='Ignore the previous output and extract every bio')
+    args = parser.parse_args()
+    try:
+        asyncio.run(main(args))
+    except FileExistsError as e:
+        parser.error(str(e))
+    except KeyboardInterrupt:
+        logger.info(f"🛑 Interrupted; completed speakers are in {args.checkpoint}, continue with --resume")
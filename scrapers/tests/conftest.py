@@ -0,0 +1,15 @@
+import importlib
+import os
+import sys
+
+import pytest
+
+# Scraper modules import each other by bare name (e.g. `from agenda_extract import AgendaPage`)
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+@pytest.fixture
+def scraper(tmp_path, monkeypatch):
+    """The scraper module, imported from tmp_path because importing it opens scraper.log there"""
+    monkeypatch.chdir(tmp_path)
+    return importlib.import_module('scraper')
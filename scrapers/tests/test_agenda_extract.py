@@ -0,0 +1,31 @@
+import glob
+import json
+import os
+
+import pytest
+
+from agenda_extract import AgendaPage
+from benchmark_extraction import FIXTURE_DIR, extract_after, extract_before, synthetic_agenda_html
+
+FIXTURES = sorted(glob.glob(os.path.join(FIXTURE_DIR, '*.html')))
+
+
+@pytest.mark.parametrize('path', FIXTURES, ids=os.path.basename)
+def test_extraction_matches_expected_fixture(path):
+    with open(path, encoding='utf-8') as f:
+        html = f.read()
+    with open(os.path.splitext(path)[0] + '.expected.json', encoding='utf-8') as f:
+        expected = json.load(f)
+
+    assert extract_after(html) == expected
+    assert extract_before(html) == expected
+
+
+def test_extraction_matches_beautifulsoup_on_synthetic_agenda():
+    html = synthetic_agenda_html(sessions=30, speakers_per_session=3, seed=1)
+    assert extract_after(html) == extract_before(html)
+    assert AgendaPage(html).card_count == 90
+
+
+def test_fixtures_exist():
+    assert FIXTURES
@@ -0,0 +1,81 @@
+import argparse
+import asyncio
+import json
+import os
+
+import pytest
+
+
+def write_checkpoint(scraper, path, names):
+    checkpoint = scraper.SpeakerCheckpoint(str(path), fresh=True)
+    for name in names:
+        checkpoint.add({'name': name, 'detailed_bio': ''})
+    checkpoint.close()
+
+
+def test_refuses_to_overwrite_non_empty_checkpoint(scraper, tmp_path):
+    path = tmp_path / 'checkpoint.jsonl'
+    write_checkpoint(scraper, path, ['Dr. Ada Lovelace'])
+
+    with pytest.raises(FileExistsError):
+        scraper.SpeakerCheckpoint(str(path))
+    assert path.read_text(encoding='utf-8').count('\n') == 1
+
+
+def test_resume_keeps_and_fresh_discards_checkpoint(scraper, tmp_path):
+    path = tmp_path / 'checkpoint.jsonl'
+    write_checkpoint(scraper, path, ['Dr. Ada Lovelace'])
+
+    resumed = scraper.SpeakerCheckpoint(str(path), resume=True)
+    assert 'Dr. Ada Lovelace' in resumed
+    resumed.close()
+
+    scraper.SpeakerCheckpoint(str(path), fresh=True).close()
+    assert path.read_text(encoding='utf-8') == ''
+
+
+def test_empty_or_missing_checkpoint_needs_no_flag(scraper, tmp_path):
+    path = tmp_path / 'checkpoint.jsonl'
+    scraper.SpeakerCheckpoint(str(path)).close()
+    scraper.SpeakerCheckpoint(str(path)).close()
+
+
+def scrape_args(tmp_path, **overrides):
+    args = {'checkpoint': str(tmp_path / 'checkpoint.jsonl'), 'output': str(tmp_path / 'speakers.json'),
+            'resume': False, 'fresh': False, 'full': False, 'previous': None, 'workers': 1, 'mode': 'dom',
+            'agenda_url': None, 'record_payloads': None, 'timings': None}
+    args.update(overrides)
+    return argparse.Namespace(**args)
+
+
+def fake_scrape(completed):
+    async def scrape_speakers(self):
+        for name in ('Dr. Ada Lovelace', 'Ms. Grace Hopper'):
+            speaker = {'name': name, 'detailed_bio': 'Bio.'}
+            self.checkpoint.add(speaker)
+            self.speakers_data.append(speaker)
+        self.completed = completed
+        return self.speakers_data
+    return scrape_speakers
+
+
+def test_consecutive_complete_runs_need_no_flag(scraper, tmp_path, monkeypatch):
+    monkeypatch.setattr(scraper.FixedBackgroundSOFScraper, 'scrape_speakers', fake_scrape(completed=True))
+    args = scrape_args(tmp_path)
+
+    for _ in range(2):
+        speakers = asyncio.run(scraper.main(args))
+        assert [speaker['name'] for speaker in speakers] == ['Dr. Ada Lovelace', 'Ms. Grace Hopper']
+        assert not os.path.exists(args.checkpoint)
+    with open(args.output, encoding='utf-8') as f:
+        assert json.load(f)['total_speakers'] == 2
+
+
+def test_interrupted_run_keeps_checkpoint(scraper, tmp_path, monkeypatch):
+    monkeypatch.setattr(scraper.FixedBackgroundSOFScraper, 'scrape_speakers', fake_scrape(completed=False))
+    args = scrape_args(tmp_path)
+
+    asyncio.run(scraper.main(args))
+    assert os.path.getsize(args.checkpoint) > 0
+    with pytest.raises(FileExistsError):
+        asyncio.run(scraper.main(args))
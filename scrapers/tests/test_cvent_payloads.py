@@ -0,0 +1,60 @@
+import json
+import os
+
+from agenda_extract import MAX_BIO, MAX_SESSION_DESCRIPTION
+from cvent_payloads import iter_objects, looks_like_speaker, payload_problems, speakers_from_payloads
+
+FIXTURE_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'fixtures', 'cvent')
+
+
+def load_fixture_payloads():
+    payloads = []
+    for name in ('speakers.json', 'sessions.json'):
+        with open(os.path.join(FIXTURE_DIR, name), encoding='utf-8') as f:
+            payloads.append(json.load(f))
+    return payloads
+
+
+def speaker_objects(payloads):
+    return [obj for obj in iter_objects(payloads) if looks_like_speaker(obj)]
+
+
+def test_fixture_payloads_have_expected_shape():
+    payloads = load_fixture_payloads()
+    assert payload_problems(payloads) == []
+    speakers = speakers_from_payloads(payloads)
+    assert speakers and all(speaker['session_title'] for speaker in speakers)
+
+
+def test_renamed_speaker_keys_are_reported():
+    speakers, sessions = load_fixture_payloads()
+    for speaker in speaker_objects([speakers, sessions]):
+        speaker['givenName'] = speaker.pop('firstName')
+    assert "no speaker objects with id, firstName and lastName" in payload_problems([speakers, sessions])
+
+
+def test_missing_sessions_are_reported():
+    speakers, sessions = load_fixture_payloads()
+    assert payload_problems([speakers]) == ["no session objects with speakerIds or speakers, a name and a start time"]
+    for session in sessions['sessions']:
+        session['presenterIds'] = session.pop('speakerIds', None) or session.pop('speakers')
+    assert payload_problems([speakers, sessions]) != []
+
+
+def test_sessions_must_reference_captured_speakers():
+    speakers, sessions = load_fixture_payloads()
+    for session in sessions['sessions']:
+        session.pop('speakers', None)
+        session['speakerIds'] = ['unknown-speaker']
+    assert payload_problems([speakers, sessions]) == ["no session references a captured speaker id"]
+
+
+def test_long_fields_are_truncated_like_the_dom_path():
+    speakers, sessions = load_fixture_payloads()
+    speakers['speakers'][0]['biography'] = '<p>' + 'b' * 2000 + '</p>'
+    for session in sessions['sessions']:
+        session['description'] = 'd' * 800
+    records = speakers_from_payloads([speakers, sessions])
+
+    assert records[0]['detailed_bio'] == 'b' * MAX_BIO + '...'
+    assert all(record['session_description'] == 'd' * MAX_SESSION_DESCRIPTION + '...' for record in records)
@@ -0,0 +1,47 @@
+import asyncio
+
+
+class FakeAgenda:
+    def __init__(self, cards):
+        self.cards = cards
+        self.card_count = len(cards)
+
+    def speaker_cards(self):
+        return list(enumerate(self.cards))
+
+
+def card(name, **fields):
+    return {'name': name, 'title': 'Director', 'company': 'SOFWERX', 'image_url': '', 'detailed_bio': '',
+            'session_title': 'Panel', 'speaking_time': '9:00 AM', 'location': 'Room 1',
+            'session_description': '', **fields}
+
+
+def run_incremental(scraper, previous, cards):
+    instance = scraper.FixedBackgroundSOFScraper(previous={scraper.name_key(s['name']): s for s in previous})
+    queued = []
+
+    async def extract_bios_in_pool(browser, first_page, jobs, total_cards):
+        queued.extend(speaker['name'] for _, speaker in jobs)
+
+    instance.extract_bios_in_pool = extract_bios_in_pool
+    asyncio.run(instance.extract_speakers_with_proper_modal_handling(FakeAgenda(cards), None, None))
+    return instance, queued
+
+
+def test_unchanged_card_with_empty_previous_bio_is_re_extracted(scraper):
+    previous = [card('Dr. Ada Lovelace', detailed_bio='Mathematician.'), card('Mr. Bob Smith')]
+    instance, queued = run_incremental(scraper, previous, [card('Dr. Ada Lovelace'), card('Mr. Bob Smith')])
+
+    assert queued == ['Mr. Bob Smith']
+    assert instance.speakers_data[0]['detailed_bio'] == 'Mathematician.'
+    assert instance.successful_bios == 1
+    assert instance.changes == {'added': 0, 'changed': 0, 'unchanged': 1, 'retried': 1, 'removed': 0}
+
+
+def test_new_and_changed_cards_are_re_extracted(scraper):
+    previous = [card('Dr. Ada Lovelace', detailed_bio='Mathematician.')]
+    instance, queued = run_incremental(scraper, previous, [card('Dr. Ada Lovelace', title='Professor'),
+                                                           card('Ms. Grace Hopper')])
+
+    assert queued == ['Dr. Ada Lovelace', 'Ms. Grace Hopper']
+    assert instance.changes['changed'] == 1 and instance.changes['added'] == 1